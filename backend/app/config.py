@@ -20,5 +20,43 @@ class Settings:
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
 
+    # Pronunciation analysis pool: worker processes (0 = in-process thread)
+    # and how many extra jobs may wait for a free worker before rejecting.
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", str(min(4, os.cpu_count() or 1))))
+    ANALYSIS_QUEUE_DEPTH: int = int(os.getenv("ANALYSIS_QUEUE_DEPTH", "16"))
+    # Longest a queued job may wait for a worker (seconds; 0 = no limit).
+    ANALYSIS_MAX_WAIT_SECONDS: float = float(os.getenv("ANALYSIS_MAX_WAIT_SECONDS", "10"))
+    # Largest accepted request body / streamed recording, in bytes.
+    MAX_UPLOAD_BYTES: int = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+    # Sakoe-Chiba radius (frames) for contour DTW; unset = unconstrained.
+    DTW_BAND: int | None = int(os.environ["DTW_BAND"]) if os.getenv("DTW_BAND") else None
+    # Formant DTW: "per_track" aligns F1/F2/F3 separately, "joint" aligns
+    # the stacked tracks once and scores each formant on the shared path.
+    FORMANT_ALIGNMENT: str = os.getenv("FORMANT_ALIGNMENT", "per_track")
+    # Analysis profile used when a request doesn't pick one: "accurate"
+    # (Praat's automatic time step) or "fast" (20 ms step, shorter contours).
+    ANALYSIS_PROFILE: str = os.getenv("ANALYSIS_PROFILE", "accurate")
+
+    # SQLite connection pool: open connections, how long a request waits
+    # for one before 503, and per-connection mmap / page cache sizes.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "8"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+    DB_MMAP_BYTES: int = int(os.getenv("DB_MMAP_BYTES", str(256 * 1024 * 1024)))
+    DB_CACHE_KIB: int = int(os.getenv("DB_CACHE_KIB", "8192"))
+
+    # How often (seconds) the in-memory catalog checks the DB for changes.
+    CATALOG_CHECK_SECONDS: float = float(os.getenv("CATALOG_CHECK_SECONDS", "1"))
+    # Cache-Control sent with catalog responses and reference audio; both
+    # also carry an ETag, so clients revalidate with a cheap 304.
+    CATALOG_CACHE_CONTROL: str = os.getenv("CATALOG_CACHE_CONTROL", "public, max-age=60")
+    AUDIO_CACHE_CONTROL: str = os.getenv("AUDIO_CACHE_CONTROL", "public, max-age=86400")
+
+    # Memory budget for decoded reference features kept in-process.
+    REFERENCE_CACHE_MAX_BYTES: int = int(os.getenv("REFERENCE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Memoised results of identical uploads (0 entries or TTL = disabled).
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+    RESULT_CACHE_TTL_SECONDS: float = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+
 
 settings = Settings()
@@ -1,28 +1,233 @@
 """SQLite database setup using aiosqlite with a thin wrapper."""
 
-import aiosqlite
+import asyncio
+import logging
+import sqlite3
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, AsyncIterator
+
+import aiosqlite
+
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 DB_PATH = settings.DATABASE_PATH
 
+# Applied to every pooled connection. WAL lets readers run alongside the
+# (rare) writers; with WAL, synchronous=NORMAL is still crash-safe.
+BUSY_TIMEOUT_MS = 5000
 
-async def get_db() -> aiosqlite.Connection:
-    """Dependency – yields an aiosqlite connection with row_factory."""
-    db = await aiosqlite.connect(DB_PATH)
-    db.row_factory = aiosqlite.Row
-    try:
-        yield db
-    finally:
-        await db.close()
+
+class DatabasePoolTimeout(RuntimeError):
+    """Raised when no pooled connection frees up within the pool timeout."""
+
+
+class ConnectionPool:
+    """Bounded pool of reusable, pragma-configured aiosqlite connections.
+
+    Each aiosqlite connection owns a thread, so opening one per request is
+    expensive; here at most ``max_size`` are opened and handed out in turn.
+    A connection idle for longer than ``health_check_after`` seconds is
+    probed with ``SELECT 1`` before reuse and replaced if that fails, and
+    one returned mid-transaction is rolled back.
+    """
+
+    def __init__(self, path: Path, max_size: int, *, timeout: float = 5.0,
+                 health_check_after: float = 30.0):
+        self.path = path
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self._slots: asyncio.Semaphore | None = None
+        self._idle: list[tuple[aiosqlite.Connection, float]] = []
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self.created = 0
+        self.discarded = 0
+        self.timeouts = 0
+
+    async def open(self) -> None:
+        """Bind the pool to the running loop and open a first connection."""
+        self._closed = False
+        self._slots = asyncio.Semaphore(self.max_size)
+        async with self.connection():
+            pass
+
+    async def close(self) -> None:
+        """Close idle connections; busy ones are closed when returned."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            await self._discard(conn)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_size)
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise DatabasePoolTimeout(
+                f"No database connection available within {self.timeout:g}s"
+            ) from None
+        finally:
+            self._waiting -= 1
+
+        conn = None
+        try:
+            conn = await self._checkout()
+            yield conn
+        finally:
+            if conn is not None:
+                await self._checkin(conn)
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self._size,
+            "max_size": self.max_size,
+            "idle": len(self._idle),
+            "in_use": self._size - len(self._idle),
+            "waiting": self._waiting,
+            "created": self.created,
+            "discarded": self.discarded,
+            "timeouts": self.timeouts,
+        }
+
+    async def _checkout(self) -> aiosqlite.Connection:
+        while self._idle:
+            conn, last_used = self._idle.pop()
+            if time.monotonic() - last_used < self.health_check_after or await self._healthy(conn):
+                return conn
+            logger.warning("Replacing unhealthy database connection")
+            await self._discard(conn)
+        return await self._connect()
+
+    async def _checkin(self, conn: aiosqlite.Connection) -> None:
+        if not self._closed:
+            try:
+                if conn.in_transaction:
+                    await conn.rollback()
+                self._idle.append((conn, time.monotonic()))
+                return
+            except Exception:
+                logger.warning("Dropping database connection that failed to roll back", exc_info=True)
+        await self._discard(conn)
+
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.path)
+        try:
+            conn.row_factory = aiosqlite.Row
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            await conn.execute(f"PRAGMA mmap_size={settings.DB_MMAP_BYTES}")
+            await conn.execute(f"PRAGMA cache_size=-{settings.DB_CACHE_KIB}")
+        except BaseException:
+            await conn.close()
+            raise
+        self._size += 1
+        self.created += 1
+        return conn
+
+    async def _discard(self, conn: aiosqlite.Connection) -> None:
+        self._size -= 1
+        self.discarded += 1
+        try:
+            await conn.close()
+        except Exception:
+            logger.debug("Error closing database connection", exc_info=True)
+
+    @staticmethod
+    async def _healthy(conn: aiosqlite.Connection) -> bool:
+        try:
+            await conn.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+
+db_pool = ConnectionPool(DB_PATH, settings.DB_POOL_SIZE, timeout=settings.DB_POOL_TIMEOUT_SECONDS)
 
 
 async def init_db() -> None:
-    """Create tables if they don't exist."""
+    """Create tables if they don't exist and add columns older DBs lack."""
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.executescript(SCHEMA_SQL)
-        await db.commit()
+    await asyncio.to_thread(_ensure_schema_at, DB_PATH)
+
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """Bring *conn*'s database up to the current schema and commit.
+
+    Shared by ``init_db`` and the scripts that open the database directly,
+    so each of them leaves it in the same state: tables and triggers from
+    ``SCHEMA_SQL``, the ``ADDED_COLUMNS`` older databases lack, and a search
+    index that covers every word.
+    """
+    conn.executescript(SCHEMA_SQL)
+    for table in ADDED_COLUMNS:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for stmt in missing_column_sql(columns, table):
+            conn.execute(stmt)
+    if search_index_stale(conn):
+        conn.execute(REBUILD_SEARCH_INDEX_SQL)
+    conn.commit()
+
+
+def search_index_stale(conn: sqlite3.Connection) -> bool:
+    """Whether ``words_fts`` indexes a different number of rows than ``words`` holds.
+
+    The triggers keep the two equal, so a mismatch means words were written
+    without them: before the index existed, or by a tool that dropped them.
+    Judged from the tables themselves, not from whether this call created
+    the index, since any ``SCHEMA_SQL`` caller may have created it empty.
+    """
+    indexed = conn.execute("SELECT COUNT(*) FROM words_fts_docsize").fetchone()[0]
+    words = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+    return indexed != words
+
+
+def _ensure_schema_at(path: Path) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        ensure_schema(conn)
+    finally:
+        conn.close()
+
+
+def missing_column_sql(existing: set[str], table: str = "words") -> list[str]:
+    """ALTER statements for ``ADDED_COLUMNS[table]`` missing from *table*."""
+    return [
+        f"ALTER TABLE {table} ADD COLUMN {name} {decl}"
+        for name, decl in ADDED_COLUMNS[table]
+        if name not in existing
+    ]
+
+
+# Columns added to ``words`` after the initial schema: (name, declaration).
+# Listed in SCHEMA_SQL for new databases; init_db adds them to old ones.
+WORD_COLUMNS = [
+    ("features_rev", "INTEGER NOT NULL DEFAULT 0"),
+    ("praat_features_blob", "BLOB"),
+    ("audio_hash", "TEXT"),
+    ("extractor_version", "INTEGER"),
+]
+
+# The same for ``word_features``.
+WORD_FEATURES_COLUMNS = [
+    ("features_rev", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+ADDED_COLUMNS = {"words": WORD_COLUMNS, "word_features": WORD_FEATURES_COLUMNS}
+
+
+REBUILD_SEARCH_INDEX_SQL = "INSERT INTO words_fts(words_fts) VALUES ('rebuild')"
 
 
 SCHEMA_SQL = """
@@ -43,9 +248,53 @@ CREATE TABLE IF NOT EXISTS words (
     translation_fr      TEXT,
     translation_de      TEXT,
     gender              TEXT,                   -- nullable, for nouns
-    praat_features_json TEXT,                   -- pre-computed Praat features as JSON
+    praat_features_json TEXT,                   -- legacy: pre-computed Praat features as JSON
+    praat_features_blob BLOB,                   -- pre-computed Praat features (encode_features)
+    audio_hash          TEXT,                   -- sha256 of the audio the features came from
+    extractor_version   INTEGER,                -- EXTRACTOR_VERSION that produced them
+    features_rev        INTEGER NOT NULL DEFAULT 0, -- bumped whenever features are rewritten
     created_at          TEXT    DEFAULT (datetime('now'))
 );
 
+-- Word pages are cut from the in-memory catalog, not queried by keyset.
+DROP INDEX IF EXISTS idx_words_category_id;
 CREATE INDEX IF NOT EXISTS idx_words_category ON words(category_id);
+
+CREATE TABLE IF NOT EXISTS word_features (
+    word_id             INTEGER NOT NULL REFERENCES words(id),
+    profile             TEXT    NOT NULL,       -- analysis profile other than the default
+    features_blob       BLOB    NOT NULL,       -- encode_features output for that profile
+    audio_hash          TEXT,                   -- sha256 of the audio it was extracted from
+    extractor_version   INTEGER,
+    features_rev        INTEGER NOT NULL DEFAULT 1, -- bumped whenever this row is rewritten
+    PRIMARY KEY (word_id, profile)
+);
+
+-- Full-text search over the word and its translations. External content:
+-- the index stores only tokens, the triggers keep it in step with words.
+-- remove_diacritics 2 lets "Leiw" find "Léiw".
+CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+    word_lb, translation_en, translation_fr, translation_de,
+    content='words', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+    INSERT INTO words_fts(rowid, word_lb, translation_en, translation_fr, translation_de)
+    VALUES (new.id, new.word_lb, new.translation_en, new.translation_fr, new.translation_de);
+END;
+
+CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+    INSERT INTO words_fts(words_fts, rowid, word_lb, translation_en, translation_fr, translation_de)
+    VALUES ('delete', old.id, old.word_lb, old.translation_en, old.translation_fr, old.translation_de);
+END;
+
+-- Only the indexed columns: rewriting features must not churn the index.
+CREATE TRIGGER IF NOT EXISTS words_fts_update
+AFTER UPDATE OF word_lb, translation_en, translation_fr, translation_de ON words BEGIN
+    INSERT INTO words_fts(words_fts, rowid, word_lb, translation_en, translation_fr, translation_de)
+    VALUES ('delete', old.id, old.word_lb, old.translation_en, old.translation_fr, old.translation_de);
+    INSERT INTO words_fts(rowid, word_lb, translation_en, translation_fr, translation_de)
+    VALUES (new.id, new.word_lb, new.translation_en, new.translation_fr, new.translation_de);
+END;
 """
@@ -0,0 +1,93 @@
+"""HTTP validators shared by the cacheable GET routes.
+
+Catalog responses carry a weak ETag derived from the catalog version (any
+encoding of the same data is equivalent), reference audio a strong ETag
+from the file's content hash. A request whose ``If-None-Match`` lists the
+current tag gets an empty 304 instead of the body.
+
+Bodies that only change with the catalog are encoded once, as an
+:class:`EncodedBody`, together with their gzip form, and served as raw
+bytes without going through ``response_model`` validation again.
+"""
+
+import gzip
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+# Below this the gzip framing outweighs the savings (same cut-off as
+# Starlette's GZipMiddleware).
+GZIP_MIN_BYTES = 500
+
+
+def catalog_etag(version: str) -> str:
+    return f'W/"{version}"'
+
+
+def content_etag(digest: str) -> str:
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether *request*'s If-None-Match covers *etag* (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def cache_headers(etag: str, cache_control: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedBody:
+    """A JSON body encoded once, plus its gzip variant when worth having."""
+
+    body: bytes
+    gzipped: bytes | None
+
+    @classmethod
+    def encode(cls, adapter: TypeAdapter, value: Any, *,
+               fields: frozenset[str] | None = None) -> "EncodedBody":
+        """Encode *value*; *fields* limits each item of a sequence to those keys."""
+        body = adapter.dump_json(value, include={"__all__": fields} if fields else None)
+        gzipped = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+        return cls(body, gzipped)
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether *request*'s Accept-Encoding allows gzip (honours ``q=0``)."""
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def json_response(request: Request, encoded: EncodedBody, etag: str, cache_control: str) -> Response:
+    """Serve *encoded* as JSON, gzipped if the client accepts it."""
+    headers = cache_headers(etag, cache_control)
+    body = encoded.body
+    if encoded.gzipped is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if accepts_gzip(request):
+            headers["Content-Encoding"] = "gzip"
+            body = encoded.gzipped
+    return Response(body, media_type="application/json", headers=headers)
@@ -3,20 +3,34 @@
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
-from app.database import init_db
+from app.database import DatabasePoolTimeout, db_pool, init_db
+from app.middleware import UploadSizeLimitMiddleware
 from app.routes import categories, words, audio, pronunciation
+from app.services.analysis_executor import analysis_executor
+from app.services.catalog import catalog
+from app.services.praat_analyzer import get_profile
+from app.services.reference_features import reference_cache
+from app.services.result_cache import result_cache
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup / shutdown lifecycle."""
+    get_profile(settings.ANALYSIS_PROFILE)  # fail fast on a misconfigured default
     await init_db()
+    await db_pool.open()
+    await catalog.start()
+    await analysis_executor.start()
     yield
+    analysis_executor.shutdown()
+    await catalog.close()
+    await db_pool.close()
 
 
 app = FastAPI(
@@ -34,6 +48,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=settings.MAX_UPLOAD_BYTES)
 
 # ── Routes ──────────────────────────────────────────────────
 app.include_router(categories.router, prefix="/api")
@@ -42,11 +57,32 @@ app.include_router(audio.router, prefix="/api")
 app.include_router(pronunciation.router, prefix="/api")
 
 
+@app.exception_handler(DatabasePoolTimeout)
+async def database_busy(request: Request, exc: DatabasePoolTimeout):
+    return JSONResponse(
+        {"detail": "The server is busy. Please try again in a moment."},
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/api/metrics")
+async def metrics():
+    """In-process cache and pool counters (per worker process of uvicorn)."""
+    return {
+        "analysis": analysis_executor.stats(),
+        "reference_cache": reference_cache.stats(),
+        "result_cache": result_cache.stats(),
+        "database": db_pool.stats(),
+        "catalog": catalog.stats(),
+    }
+
+
 # ── Serve frontend static files ─────────────────────────────
 # Mount AFTER API routes so /api/* takes priority.
 _frontend_dir = Path(__file__).resolve().parent.parent.parent  # repo root
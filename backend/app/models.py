@@ -1,6 +1,6 @@
 """Pydantic models for API request/response schemas."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # ── Categories ──────────────────────────────────────────────
@@ -30,6 +30,19 @@ class WordDetail(WordOut):
     translation_de: str | None = None
 
 
+class AudioMeta(BaseModel):
+    etag: str                         # same ETag GET /api/audio/{id} sends
+    size: int                         # bytes
+
+
+class WordBatchItem(WordDetail):
+    audio: AudioMeta | None = None    # None: no reference file, the route serves a placeholder
+
+
+class WordBatchRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=1000)
+
+
 # ── Pronunciation ───────────────────────────────────────────
 
 class PronunciationBreakdown(BaseModel):
@@ -40,9 +53,15 @@ class PronunciationBreakdown(BaseModel):
     voice_quality: float
 
 
+class PronunciationRejection(BaseModel):
+    reason: str                           # silent | clipped | noise | too_long | too_short
+    metrics: dict[str, float] = {}
+
+
 class PronunciationResult(BaseModel):
     score: float                          # 0-100
     feedback: str
     breakdown: PronunciationBreakdown
     improvements: list[str] = []
     suggestions: list[str] = []
+    rejection: PronunciationRejection | None = None   # set when the upload was unusable
@@ -3,17 +3,28 @@
 If a referenced audio file is missing, return a short silent WAV so the
 frontend doesn't receive a 404. This keeps audio playback UX smooth while
 the project is missing many reference files.
+
+Responses carry a strong ETag from the file's sha256 (see
+``services/audio_files.py``) and ``AUDIO_CACHE_CONTROL``. The word is
+looked up in the in-memory catalog, so a revalidation that ends in 304
+never touches the database.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import FileResponse, Response
-import aiosqlite
 
 from app.config import settings
-from app.database import get_db
+from app.http_cache import cache_headers, content_etag, etag_matches, not_modified
+from app.services.audio_files import reference_audio
+from app.services.catalog import catalog
 
 router = APIRouter(tags=["audio"])
 
+# Placeholders may be replaced by a real file at any time: always revalidate.
+PLACEHOLDER_CACHE_CONTROL = "no-cache"
+
 
 def _generate_silence_wav(duration_s: float = 0.8, rate: int = 16000, bits: int = 16, channels: int = 1) -> bytes:
     """Generate a PCM WAV file (bytes) containing silence.
@@ -55,28 +66,42 @@ def _generate_silence_wav(duration_s: float = 0.8, rate: int = 16000, bits: int
 
 
 @router.get("/audio/{word_id}")
-async def stream_audio(word_id: int, db: aiosqlite.Connection = Depends(get_db)):
-    cur = await db.execute(
-        "SELECT audio_filename FROM words WHERE id = ?", (word_id,)
-    )
-    row = await cur.fetchone()
-    if not row:
+async def stream_audio(word_id: int, request: Request):
+    snapshot = await catalog.snapshot()
+    if word_id not in snapshot.words:
         raise HTTPException(404, f"Word {word_id} not found")
 
-    audio_file = row["audio_filename"]
-    if not audio_file:
-        # Return a short silent WAV placeholder instead of 404
-        data = _generate_silence_wav()
-        return Response(content=data, media_type="audio/wav", headers={"X-Placeholder-Audio": "true"})
-
-    path = settings.AUDIO_DIR / audio_file
-    if not path.is_file():
-        # Missing on disk — return placeholder instead of 404
-        data = _generate_silence_wav()
-        return Response(content=data, media_type="audio/wav", headers={"X-Placeholder-Audio": "true"})
+    audio_file = snapshot.audio_files[word_id]
+    audio = await reference_audio(audio_file)
+    if audio is None:
+        # No file set, or missing on disk — return a short silent WAV placeholder instead of 404
+        return _placeholder(request)
 
+    if etag_matches(request, audio.etag):
+        return not_modified(audio.etag, settings.AUDIO_CACHE_CONTROL)
     return FileResponse(
-        path,
+        audio.path,
         media_type="audio/wav",
         filename=audio_file,
+        headers=cache_headers(audio.etag, settings.AUDIO_CACHE_CONTROL),
     )
+
+
+# ── Internal helpers ────────────────────────────────────────
+
+_SILENCE_WAV = _generate_silence_wav()
+_SILENCE_ETAG = content_etag(hashlib.sha256(_SILENCE_WAV).hexdigest()[:32])
+
+
+def _placeholder(request: Request) -> Response:
+    if etag_matches(request, _SILENCE_ETAG):
+        return not_modified(_SILENCE_ETAG, PLACEHOLDER_CACHE_CONTROL)
+    return Response(
+        content=_SILENCE_WAV,
+        media_type="audio/wav",
+        headers={
+            "X-Placeholder-Audio": "true",
+            **cache_headers(_SILENCE_ETAG, PLACEHOLDER_CACHE_CONTROL),
+        },
+    )
+
@@ -1,34 +1,23 @@
 """GET /api/categories — list all categories with word counts."""
 
-from fastapi import APIRouter, Depends
-import aiosqlite
+from fastapi import APIRouter, Request
+from pydantic import TypeAdapter
 
-from app.database import get_db
+from app.config import settings
+from app.http_cache import EncodedBody, catalog_etag, etag_matches, json_response, not_modified
 from app.models import CategoryOut
+from app.services.catalog import catalog
 
 router = APIRouter(tags=["categories"])
 
+_CATEGORIES = TypeAdapter(tuple[CategoryOut, ...])
+
 
 @router.get("/categories", response_model=list[CategoryOut])
-async def list_categories(db: aiosqlite.Connection = Depends(get_db)):
-    cursor = await db.execute(
-        """
-        SELECT c.id, c.name, c.display_name, c.image_url,
-               COUNT(w.id) AS word_count
-        FROM categories c
-        LEFT JOIN words w ON w.category_id = c.id
-        GROUP BY c.id
-        ORDER BY c.name
-        """
-    )
-    rows = await cursor.fetchall()
-    return [
-        CategoryOut(
-            id=r["id"],
-            name=r["name"],
-            display_name=r["display_name"],
-            image_url=r["image_url"],
-            word_count=r["word_count"],
-        )
-        for r in rows
-    ]
+async def list_categories(request: Request):
+    snapshot = await catalog.snapshot()
+    etag = catalog_etag(snapshot.version)
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.CATALOG_CACHE_CONTROL)
+    body = snapshot.encoded(("categories",), lambda: EncodedBody.encode(_CATEGORIES, snapshot.categories))
+    return json_response(request, body, etag, settings.CATALOG_CACHE_CONTROL)
@@ -1,46 +1,258 @@
-"""POST /api/pronunciation/check — pronunciation evaluation endpoint."""
+"""POST /api/pronunciation/check and WS /api/pronunciation/stream — pronunciation evaluation."""
 
+import asyncio
 import json
 import logging
-from pathlib import Path
+from typing import Awaitable, Callable
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile, HTTPException
+from fastapi import APIRouter, File, Form, UploadFile, HTTPException, WebSocket, WebSocketDisconnect
 import aiosqlite
 import parselmouth
 
-from app.database import get_db
+from app.database import DatabasePoolTimeout, db_pool
 from app.config import settings
 from app.models import PronunciationResult, PronunciationBreakdown
-from app.services.audio_processor import preprocess_upload
-from app.services.praat_analyzer import extract_all_praat_features, extract_mfcc_features
-from app.services.feature_comparator import calculate_weighted_score
-from app.services.feedback_generator import generate_phonetic_feedback
+from app.services.analysis_executor import (
+    AnalysisQueueFull,
+    AnalysisWaitTimeout,
+    analysis_executor,
+    analyze_samples,
+    analyze_upload,
+)
+from app.services.audio_files import audio_sha256
+from app.services.audio_stream import AudioStream
+from app.services.reference_features import (
+    SingleFlight,
+    prepare_reference_features,
+    reference_cache,
+)
+from app.services.result_cache import result_cache, result_key
+from app.services.praat_analyzer import (
+    DEFAULT_PROFILE,
+    EXTRACTOR_VERSION,
+    decode_features,
+    encode_features,
+    extract_all_praat_features,
+    extract_mfcc_features,
+    get_profile,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["pronunciation"])
 
+# In-flight reference extractions keyed by (word id, features_rev, profile), and
+# references to fire-and-forget write-backs so they aren't collected early.
+reference_flights = SingleFlight()
+_background_tasks: set[asyncio.Task] = set()
+
+# A reference lookup yields either the features or, on a miss, the
+# extraction to run once the pooled connection has been released.
+ReferenceLookup = dict | Callable[[], Awaitable[dict]]
+
 
 @router.post("/pronunciation/check", response_model=PronunciationResult)
 async def check_pronunciation(
     word_id: int = Form(...),
     audio: UploadFile = File(...),
-    db: aiosqlite.Connection = Depends(get_db),
+    profile: str | None = Form(None),
 ):
     """Accept user audio and return pronunciation score + feedback.
 
+    *profile* picks the analysis profile (``ANALYSIS_PROFILE`` if omitted);
+    the user recording and the reference are analysed with the same one.
+
     Pipeline:
-      1. Read upload bytes & preprocess (convert, normalise, trim, split)
-      2. Extract Praat features from processed user audio
-      3. Load pre-computed reference features from DB
-      4. Compare with weighted scoring (DTW + Gaussian similarity)
-      5. Generate human-readable feedback
-      6. Clean up temp files
-      7. Return result
+      1. Read upload bytes; an identical earlier submission for the same
+         word and reference features is answered from ``result_cache``
+      2. Load pre-computed reference features from DB
+      3. In the analysis pool, in memory: preprocess (decode, normalise,
+         trim, split), extract Praat features, compare with weighted
+         scoring (DTW + Gaussian similarity) and generate feedback
+      4. Return result
+
+    All CPU-bound work runs in ``analysis_executor`` so the event loop stays
+    responsive for other requests. The pooled DB connection is only held
+    for the row lookups: not while the upload is read, nor while reference
+    features are extracted or the recording analysed.
+    """
+    profile = _resolve_profile(profile)
+
+    # ── 1. Read uploaded audio ──────────────────────────
+    raw_bytes = await audio.read()
+    if not raw_bytes:
+        raise HTTPException(status_code=400, detail="Empty audio file")
+
+    async with db_pool.connection() as db:
+        rev = await _features_rev(db, word_id, profile)
+        key = result_key(raw_bytes, word_id, rev, profile)
+        cached = result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # ── 2. Reference features ───────────────────────────
+        reference = await _lookup_reference_features(db, word_id, rev, profile)
+    ref_features = await _reference_features(reference)
+
+    # ── 3-4. Preprocess, extract, compare, feedback (worker) ─
+    outcome = await _analyze(word_id, analyze_upload, raw_bytes, ref_features, profile)
+    result = _build_result(outcome)
+    result_cache.put(key, result)
+    return result
+
+
+@router.websocket("/pronunciation/stream")
+async def stream_pronunciation(
+    websocket: WebSocket,
+    word_id: int,
+    profile: str | None = None,
+):
+    """Score a recording streamed while the user speaks.
+
+    Protocol (``/api/pronunciation/stream?word_id=N[&profile=fast]``):
+      - client → binary frames: consecutive chunks of one recording
+        (e.g. MediaRecorder timeslices of a WebM/Opus stream)
+      - client → ``{"type": "stop"}``: recording finished (implied once
+        ``MAX_STREAM_SECONDS`` are decoded; the take is then rejected as
+        ``too_long``, as ``/check`` would)
+      - server → ``{"type": "vad", "event": "speech_start"|"speech_end",
+        "at_ms": ...}`` as the decoder reaches them
+      - server → ``{"type": "result", ...PronunciationResult}`` or
+        ``{"type": "error", "status": ..., "detail": ...}``, then closes
+
+    Chunks are decoded and framed as they arrive. As soon as the VAD closes
+    an utterance, the analysis of the audio up to that point starts in the
+    pool, unless this socket's previous one is still running. If nothing
+    was decoded after it by ``stop``, its input is exactly the final take
+    and its result is returned, so the client only waits for what is left
+    of it. Praat needs the whole utterance, so feature extraction itself
+    cannot start any earlier.
+    """
+    await websocket.accept()
+    stream = AudioStream()
+    speculative: asyncio.Task | None = None
+    speculative_samples = 0
+    received = 0
+    try:
+        profile = _resolve_profile(profile)
+        async with db_pool.connection() as db:
+            reference = await _lookup_reference_features(db, word_id, profile=profile)
+        ref_features = await _reference_features(reference)
+        await stream.start()
+
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                received += len(message["bytes"])
+                if received > settings.MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Recording too large.")
+                await stream.feed(message["bytes"])
+            elif _is_stop(message.get("text")):
+                break
+
+            for event in stream.drain_events():
+                await websocket.send_json(event)
+                # One speculative job per socket: a superseded one would
+                # still hold its worker until it finished.
+                if event["event"] == "speech_end" and (speculative is None or speculative.done()):
+                    _discard(speculative)
+                    speculative_samples = stream.n_samples
+                    speculative = asyncio.create_task(_analyze(
+                        word_id, analyze_samples, stream.samples(), ref_features, profile
+                    ))
+            if stream.full:
+                break
+
+        samples = await stream.finish()
+        for event in stream.drain_events():
+            await websocket.send_json(event)
+
+        if speculative is not None and len(samples) == speculative_samples:
+            outcome = await speculative
+        else:
+            _discard(speculative)
+            if not len(samples):
+                raise HTTPException(status_code=400, detail="Empty audio file")
+            outcome = await _analyze(word_id, analyze_samples, samples, ref_features, profile)
+        speculative = None
+
+        await websocket.send_json({"type": "result", **_build_result(outcome).model_dump()})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except HTTPException as exc:
+        await _send_error(websocket, exc.status_code, exc.detail)
+    except DatabasePoolTimeout:
+        await _send_error(websocket, 503, "The server is busy. Please try again in a moment.")
+    except ValueError as exc:
+        await _send_error(websocket, 400, str(exc))
+    except Exception as exc:
+        logger.exception("Pronunciation stream failed for word %d", word_id)
+        await _send_error(websocket, 500, f"Analysis error: {exc}")
+    finally:
+        _discard(speculative)
+        await stream.abort()
+
+
+# ── Internal helpers ────────────────────────────────────────
+
+def _resolve_profile(profile: str | None) -> str:
+    """Name of the requested analysis profile; 400 if there is no such profile."""
+    try:
+        return get_profile(profile or settings.ANALYSIS_PROFILE).name
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+async def _features_rev(
+    db: aiosqlite.Connection, word_id: int, profile: str = DEFAULT_PROFILE
+) -> int:
+    """Current revision of the word's *profile* features; 404 if the word doesn't exist.
+
+    ``words.features_rev`` for the default profile, otherwise that of the
+    ``word_features`` row (0 while there is none), so rewriting one
+    profile leaves the others' cached features and results valid.
     """
-    # ── 0. Validate word exists & has reference features ────
     row = await db.execute(
-        "SELECT audio_filename, praat_features_json FROM words WHERE id = ?",
+        "SELECT w.features_rev, wf.features_rev AS profile_rev"
+        " FROM words w LEFT JOIN word_features wf ON wf.word_id = w.id AND wf.profile = ?"
+        " WHERE w.id = ?",
+        (profile, word_id),
+    )
+    word_row = await row.fetchone()
+    if word_row is None:
+        raise HTTPException(status_code=404, detail=f"Word {word_id} not found")
+    if profile == DEFAULT_PROFILE:
+        return word_row["features_rev"]
+    return word_row["profile_rev"] or 0
+
+
+async def _lookup_reference_features(
+    db: aiosqlite.Connection, word_id: int, rev: int | None = None,
+    profile: str = DEFAULT_PROFILE,
+) -> ReferenceLookup:
+    """Validate the word exists and find its reference features.
+
+    Served from ``reference_cache`` when it holds the current revision of
+    the *profile*'s features (*rev*, looked up if not given). Otherwise uses the
+    pre-computed features when present and caches the decoded result.
+    Failing that, returns the extraction from the reference audio file (in
+    the analysis pool) for the caller to await via
+    :func:`_reference_features` after releasing *db*.
+    Profiles other than ``DEFAULT_PROFILE`` are stored in ``word_features``.
+    """
+    if rev is None:
+        rev = await _features_rev(db, word_id, profile)
+    cached = reference_cache.get(word_id, rev, profile)
+    if cached is not None:
+        return cached
+    if profile != DEFAULT_PROFILE:
+        return await _lookup_profile_features(db, word_id, rev, profile)
+
+    row = await db.execute(
+        "SELECT audio_filename, praat_features_blob, praat_features_json FROM words WHERE id = ?",
         (word_id,),
     )
     word_row = await row.fetchone()
@@ -48,12 +260,19 @@ async def check_pronunciation(
         raise HTTPException(status_code=404, detail=f"Word {word_id} not found")
 
     audio_filename = word_row["audio_filename"]
+    ref_features_blob = word_row["praat_features_blob"]
     ref_features_json = word_row["praat_features_json"]
 
-    # If we have saved precomputed features, use them.
+    # If we have saved precomputed features, use them: the binary blob, or
+    # JSON for rows written before it existed.
     # Otherwise, attempt to compute from the reference audio file if present.
     ref_features = None
-    if ref_features_json and ref_features_json != '{"placeholder": true}':
+    if ref_features_blob:
+        try:
+            ref_features = decode_features(ref_features_blob)
+        except ValueError as exc:
+            logger.warning("Ignoring unreadable feature blob for word %d: %s", word_id, exc)
+    if ref_features is None and ref_features_json and ref_features_json != '{"placeholder": true}':
         try:
             ref_features = json.loads(ref_features_json)
         except Exception:
@@ -62,44 +281,184 @@ async def check_pronunciation(
 
     if ref_features is None:
         # Need a reference audio file to compute features
-        if not audio_filename:
-            raise HTTPException(
-                status_code=400,
-                detail="No reference audio or precomputed features available for this word.",
-            )
+        ref_audio_path = _reference_audio_path(audio_filename)
+    elif "mfcc" not in ref_features and audio_filename:
+        # Backwards-compat: older DB rows may not include newly added features.
         ref_audio_path = settings.AUDIO_DIR / audio_filename
         if not ref_audio_path.exists():
-            raise HTTPException(
-                status_code=400,
-                detail="Reference audio file missing and no pre-computed features.",
-            )
-        logger.info("Computing reference features on-the-fly for word %d", word_id)
-        ref_features = extract_all_praat_features(ref_audio_path)
+            ref_audio_path = None
     else:
-        # Backwards-compat: older DB rows may not include newly added features.
-        if "mfcc" not in ref_features and audio_filename:
-            ref_audio_path = settings.AUDIO_DIR / audio_filename
-            if ref_audio_path.exists():
-                ref_features["mfcc"] = extract_mfcc_features(ref_audio_path)
+        ref_audio_path = None
 
-    # ── 1. Preprocess uploaded audio ────────────────────────
-    raw_bytes = await audio.read()
-    if not raw_bytes:
-        raise HTTPException(status_code=400, detail="Empty audio file")
+    if ref_audio_path is not None:
+        # Concurrent requests for the same word share one extraction.
+        return lambda: reference_flights.run(
+            (word_id, rev, DEFAULT_PROFILE),
+            lambda: _complete_reference_features(word_id, rev, ref_audio_path, ref_features),
+        )
 
-    user_wav_path: Path | None = None
-    try:
-        user_wav_path = preprocess_upload(raw_bytes, audio.filename or "upload.webm")
+    ref_features = prepare_reference_features(ref_features)
+    reference_cache.put(word_id, rev, ref_features)
+    return ref_features
 
-        # ── 2. Extract Praat features from user audio ───────
-        user_features = extract_all_praat_features(user_wav_path)
 
-        # ── 3. Compare features ─────────────────────────────
-        score_result = calculate_weighted_score(user_features, ref_features)
+async def _lookup_profile_features(
+    db: aiosqlite.Connection, word_id: int, rev: int, profile: str
+) -> ReferenceLookup:
+    """Reference features of a non-default *profile*, from ``word_features``.
 
-        # ── 4. Generate feedback ────────────────────────────
-        feedback = generate_phonetic_feedback(score_result, user_features, ref_features)
+    Always a deferred lookup: a stored row is only used once its
+    ``audio_hash`` has been checked against the reference file, and hashing
+    the file should not hold *db*.
+    """
+    row = await db.execute(
+        "SELECT w.audio_filename, wf.features_blob, wf.audio_hash"
+        " FROM words w LEFT JOIN word_features wf ON wf.word_id = w.id AND wf.profile = ?"
+        " WHERE w.id = ?",
+        (profile, word_id),
+    )
+    word_row = await row.fetchone()
+    if word_row is None:
+        raise HTTPException(status_code=404, detail=f"Word {word_id} not found")
+    if not word_row["features_blob"]:
+        _reference_audio_path(word_row["audio_filename"])  # 400 now if there is nothing to extract
+    return lambda: _stored_profile_features(
+        word_id, rev, profile, word_row["audio_filename"],
+        word_row["features_blob"], word_row["audio_hash"],
+    )
+
+
+async def _stored_profile_features(
+    word_id: int, rev: int, profile: str, audio_filename: str | None,
+    blob: bytes | None, audio_hash: str | None,
+) -> dict:
+    """Stored *profile* features if they came from the reference file as it is now.
+
+    The file's hash is compared directly rather than with ``words.audio_hash``,
+    which only tracks the default profile's features. Otherwise the features
+    are extracted from the file (and saved back); with the file gone, stored
+    ones are used as they are.
+    """
+    file_hash = await audio_sha256(settings.AUDIO_DIR / audio_filename) if audio_filename else None
+    ref_features = None
+    if blob and (file_hash is None or audio_hash == file_hash):
+        try:
+            ref_features = decode_features(blob)
+        except ValueError as exc:
+            logger.warning("Ignoring unreadable %s features for word %d: %s", profile, word_id, exc)
+
+    if ref_features is None:
+        ref_audio_path = _reference_audio_path(audio_filename)
+        return await reference_flights.run(
+            (word_id, rev, profile),
+            lambda: _complete_reference_features(word_id, rev, ref_audio_path, None, profile),
+        )
+
+    ref_features = prepare_reference_features(ref_features)
+    reference_cache.put(word_id, rev, ref_features, profile)
+    return ref_features
+
+
+async def _reference_features(reference: ReferenceLookup) -> dict:
+    """Features from a lookup, running its extraction if it needs one."""
+    return await reference() if callable(reference) else reference
+
+
+def _reference_audio_path(audio_filename: str | None):
+    """Path of the word's reference audio; 400 if there is none to extract from."""
+    if not audio_filename:
+        raise HTTPException(
+            status_code=400,
+            detail="No reference audio or precomputed features available for this word.",
+        )
+    ref_audio_path = settings.AUDIO_DIR / audio_filename
+    if not ref_audio_path.exists():
+        raise HTTPException(
+            status_code=400,
+            detail="Reference audio file missing and no pre-computed features.",
+        )
+    return ref_audio_path
+
+
+async def _complete_reference_features(
+    word_id: int, rev: int, ref_audio_path, ref_features: dict | None,
+    profile: str = DEFAULT_PROFILE,
+) -> dict:
+    """Extract what the row is missing, cache it and save it back.
+
+    With no stored features the whole set is extracted; otherwise only the
+    MFCC summary is added. The write-back runs in the background so this
+    request doesn't wait on the DB.
+    """
+    # Hashed before extracting, so the saved hash can't be newer than the features.
+    audio_hash = None if profile == DEFAULT_PROFILE else await audio_sha256(ref_audio_path)
+    if ref_features is None:
+        logger.info("Computing %s reference features on-the-fly for word %d", profile, word_id)
+        ref_features = await _run_analysis(extract_all_praat_features, ref_audio_path, profile)
+    else:
+        logger.info("Backfilling reference MFCC for word %d", word_id)
+        ref_features = dict(ref_features)
+        ref_features["mfcc"] = await _run_analysis(extract_mfcc_features, ref_audio_path)
 
+    prepared = prepare_reference_features(ref_features)
+    reference_cache.put(word_id, rev, prepared, profile)
+
+    task = asyncio.create_task(
+        _write_back_features(word_id, rev, ref_features, prepared, profile, audio_hash)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return prepared
+
+
+async def _write_back_features(
+    word_id: int, rev: int, features: dict, prepared: dict, profile: str = DEFAULT_PROFILE,
+    audio_hash: str | None = None,
+) -> None:
+    """Persist on-the-fly features so later requests take the stored path.
+
+    Only applies if the *profile*'s features are still at *rev*: features written meanwhile
+    (e.g. by precompute_features) win. Non-default profiles are saved with
+    *audio_hash*, the hash of the file they were extracted from.
+    """
+    try:
+        async with db_pool.connection() as db:
+            if profile == DEFAULT_PROFILE:
+                cursor = await db.execute(
+                    "UPDATE words SET praat_features_blob = ?, praat_features_json = NULL,"
+                    " features_rev = features_rev + 1 WHERE id = ? AND features_rev = ?",
+                    (encode_features(features), word_id, rev),
+                )
+            else:
+                cursor = await db.execute(
+                    "INSERT INTO word_features"
+                    " (word_id, profile, features_blob, audio_hash, extractor_version, features_rev)"
+                    " VALUES (?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (word_id, profile) DO UPDATE SET"
+                    " features_blob = excluded.features_blob, audio_hash = excluded.audio_hash,"
+                    " extractor_version = excluded.extractor_version,"
+                    " features_rev = excluded.features_rev WHERE features_rev = ?",
+                    (word_id, profile, encode_features(features), audio_hash, EXTRACTOR_VERSION,
+                     rev + 1, rev),
+                )
+            await db.commit()
+            updated = cursor.rowcount == 1
+    except Exception:
+        logger.exception("Could not save %s reference features for word %d", profile, word_id)
+        return
+    if not updated:
+        return
+    # The row's features_rev moved on.
+    reference_cache.put(word_id, rev + 1, prepared, profile)
+    logger.info("Saved %s reference features for word %d", profile, word_id)
+
+
+async def _analyze(word_id: int, fn, *args) -> dict:
+    """Run a worker entry point, mapping failures to HTTP errors."""
+    try:
+        return await _run_analysis(fn, *args)
+    except HTTPException:
+        raise
     except (ValueError, parselmouth.PraatError) as exc:
         # Common user-facing failures (too-short recording, pitch analysis constraints, etc.)
         logger.warning("Pronunciation analysis rejected for word %d: %s", word_id, exc)
@@ -107,12 +466,11 @@ async def check_pronunciation(
     except Exception as exc:
         logger.exception("Pronunciation analysis failed for word %d", word_id)
         raise HTTPException(status_code=500, detail=f"Analysis error: {exc}")
-    finally:
-        # ── 5. Cleanup temp file ────────────────────────────
-        if user_wav_path and user_wav_path.exists():
-            user_wav_path.unlink(missing_ok=True)
 
-    # ── 6. Build response ───────────────────────────────────
+
+def _build_result(outcome: dict) -> PronunciationResult:
+    score_result = outcome["score_result"]
+    feedback = outcome["feedback"]
     breakdown = score_result["breakdown"]
     return PronunciationResult(
         score=score_result["overall_score"],
@@ -126,4 +484,46 @@ async def check_pronunciation(
         ),
         improvements=feedback["improvements"],
         suggestions=feedback["suggestions"],
+        rejection=score_result.get("rejection"),
     )
+
+
+def _is_stop(text: str | None) -> bool:
+    if not text:
+        return False
+    try:
+        return json.loads(text).get("type") == "stop"
+    except (ValueError, AttributeError):
+        return False
+
+
+def _discard(task: asyncio.Task | None) -> None:
+    """Drop a speculative analysis; a job already in the pool runs to completion."""
+    if task is not None:
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _send_error(websocket: WebSocket, status: int, detail: str) -> None:
+    try:
+        await websocket.send_json({"type": "error", "status": status, "detail": detail})
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+
+
+async def _run_analysis(fn, *args):
+    """Dispatch *fn* to the analysis pool, mapping saturation to 429 / 503.
+
+    A full queue is refused immediately with 429; a job that queued but got
+    no worker within ``ANALYSIS_MAX_WAIT_SECONDS`` gets 503. Both carry a
+    ``Retry-After`` estimate.
+    """
+    try:
+        return await analysis_executor.run(fn, *args)
+    except AnalysisQueueFull as exc:
+        logger.warning("Pronunciation analysis rejected: %s", exc)
+        raise HTTPException(
+            status_code=503 if isinstance(exc, AnalysisWaitTimeout) else 429,
+            detail="Pronunciation analysis is busy. Please try again in a moment.",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
@@ -1,73 +1,160 @@
-"""GET /api/categories/{category}/words and GET /api/words/{word_id}."""
+"""GET /api/categories/{category}/words and /api/words (batch, search, detail)."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-import aiosqlite
+import asyncio
+import re
 
-from app.database import get_db
-from app.models import WordOut, WordDetail
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.database import db_pool
+from app.http_cache import (
+    EncodedBody, cache_headers, catalog_etag, etag_matches, json_response, not_modified,
+)
+from app.models import AudioMeta, WordBatchItem, WordBatchRequest, WordOut, WordDetail
+from app.services.audio_files import reference_audio
+from app.services.catalog import catalog
 
 router = APIRouter(tags=["words"])
 
-LANG_COLUMNS = {"en": "translation_en", "fr": "translation_fr", "de": "translation_de"}
+_WORD_LIST = TypeAdapter(tuple[WordOut, ...])
+
+MAX_PAGE_SIZE = 500
+WORD_FIELDS = frozenset(WordOut.model_fields)
+
+MAX_SEARCH_RESULTS = 50
+MAX_SEARCH_TERMS = 8
+# bm25 weights for (word_lb, translation_en, translation_fr, translation_de):
+# a hit on the Luxembourgish word outranks one on a translation.
+SEARCH_WEIGHTS = (4.0, 1.0, 1.0, 1.0)
+_SEARCH_TERM = re.compile(r"\w+")
+
+# Keeps query strings short; larger sets go through POST /words/batch.
+MAX_BATCH_IDS_GET = 100
+
+
+def _parse_fields(fields: str | None) -> frozenset[str] | None:
+    """``fields=id,word_lb`` → the keys to keep (``id`` always included)."""
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - WORD_FIELDS
+    if unknown:
+        raise HTTPException(400, f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return frozenset(requested | {"id"})
 
 
 @router.get("/categories/{category_name}/words", response_model=list[WordOut])
 async def list_words(
+    request: Request,
     category_name: str,
     lang: str = Query("en", pattern="^(en|fr|de)$"),
-    db: aiosqlite.Connection = Depends(get_db),
+    after_id: int | None = Query(None, ge=0, description="Return words with a larger id"),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    fields: str | None = Query(None, description="Comma-separated subset of word fields"),
 ):
-    # Resolve category
-    cur = await db.execute(
-        "SELECT id FROM categories WHERE name = ?", (category_name,)
-    )
-    cat = await cur.fetchone()
-    if not cat:
+    """Words of a category, in id order.
+
+    Without ``limit`` the whole category is returned, as before. With it, a
+    ``Link: <...>; rel="next"`` header points at the following page.
+    """
+    include = _parse_fields(fields)
+    snapshot = await catalog.snapshot()
+    page = snapshot.word_page(category_name, lang, after_id=after_id, limit=limit)
+    if page is None:
         raise HTTPException(404, f"Category '{category_name}' not found")
+    words, next_after_id = page
+    etag = catalog_etag(snapshot.version)
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.CATALOG_CACHE_CONTROL)
+    if after_id is None and limit is None and include is None:
+        body = snapshot.encoded(("words", category_name, lang), lambda: EncodedBody.encode(_WORD_LIST, words))
+    else:
+        body = EncodedBody.encode(_WORD_LIST, words, fields=include)
+    response = json_response(request, body, etag, settings.CATALOG_CACHE_CONTROL)
+    if next_after_id is not None:
+        next_url = request.url.include_query_params(after_id=next_after_id)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
+
 
-    col = LANG_COLUMNS[lang]
-    cursor = await db.execute(
-        f"""
-        SELECT id, word_lb, {col} AS translation, gender, audio_filename
-        FROM words
-        WHERE category_id = ?
-        ORDER BY id
-        """,
-        (cat["id"],),
-    )
-    rows = await cursor.fetchall()
+async def lookup_words(ids: list[int]) -> list[WordBatchItem]:
+    """Words for *ids* in request order (unknown ids and repeats dropped),
+    each with the ETag and size of its reference audio."""
+    snapshot = await catalog.snapshot()
+    found = [snapshot.words[i] for i in dict.fromkeys(ids) if i in snapshot.words]
+    files = await asyncio.gather(*(
+        reference_audio(snapshot.audio_files[w.id], snapshot.audio_hashes.get(w.id))
+        for w in found
+    ))
     return [
-        WordOut(
-            id=r["id"],
-            word_lb=r["word_lb"],
-            translation=r["translation"],
-            gender=r["gender"],
-            audio_url=f"/api/audio/{r['id']}",
+        WordBatchItem(
+            **word.model_dump(),
+            audio=AudioMeta(etag=audio.etag, size=audio.size) if audio else None,
         )
-        for r in rows
+        for word, audio in zip(found, files)
     ]
 
 
+@router.get("/words", response_model=list[WordBatchItem])
+async def get_words(ids: str = Query(..., pattern=r"^\d+(,\d+)*$", description="e.g. 1,2,3")):
+    """Several words in one request, e.g. to prefetch a practice session."""
+    word_ids = [int(i) for i in ids.split(",")]
+    if len(word_ids) > MAX_BATCH_IDS_GET:
+        raise HTTPException(400, f"At most {MAX_BATCH_IDS_GET} ids per GET; use POST /api/words/batch")
+    return await lookup_words(word_ids)
+
+
+@router.post("/words/batch", response_model=list[WordBatchItem])
+async def post_words_batch(body: WordBatchRequest):
+    """Like ``GET /words?ids=`` for larger sets."""
+    return await lookup_words(body.ids)
+
+
+def search_query(q: str) -> str | None:
+    """FTS5 query for free text: every term must match, as a prefix.
+
+    Terms are quoted, so user input can never be parsed as FTS syntax.
+    """
+    terms = _SEARCH_TERM.findall(q)[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+# Declared before /words/{word_id} so "search" is not taken for an id.
+@router.get("/words/search", response_model=list[WordDetail])
+async def search_words(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+):
+    """Words whose Luxembourgish form or a translation matches *q*, best first."""
+    match = search_query(q)
+    if match is None:
+        return []
+    async with db_pool.connection() as db:
+        cursor = await db.execute(
+            f"""
+            SELECT rowid FROM words_fts
+            WHERE words_fts MATCH ?
+            ORDER BY bm25(words_fts, {", ".join(map(str, SEARCH_WEIGHTS))})
+            LIMIT ?
+            """,
+            (match, limit),
+        )
+        ids = [row[0] for row in await cursor.fetchall()]
+    snapshot = await catalog.snapshot()
+    return [snapshot.words[i] for i in ids if i in snapshot.words]
+
+
 @router.get("/words/{word_id}", response_model=WordDetail)
-async def get_word(word_id: int, db: aiosqlite.Connection = Depends(get_db)):
-    cur = await db.execute(
-        """
-        SELECT id, lod_reference, word_lb, translation_en, translation_fr,
-               translation_de, gender, audio_filename
-        FROM words WHERE id = ?
-        """,
-        (word_id,),
-    )
-    row = await cur.fetchone()
-    if not row:
+async def get_word(word_id: int, request: Request, response: Response):
+    snapshot = await catalog.snapshot()
+    word = snapshot.words.get(word_id)
+    if word is None:
         raise HTTPException(404, f"Word {word_id} not found")
-    return WordDetail(
-        id=row["id"],
-        lod_reference=row["lod_reference"],
-        word_lb=row["word_lb"],
-        translation_en=row["translation_en"],
-        translation_fr=row["translation_fr"],
-        translation_de=row["translation_de"],
-        gender=row["gender"],
-        audio_url=f"/api/audio/{row['id']}",
-    )
+    etag = catalog_etag(snapshot.version)
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.CATALOG_CACHE_CONTROL)
+    response.headers.update(cache_headers(etag, settings.CATALOG_CACHE_CONTROL))
+    return word
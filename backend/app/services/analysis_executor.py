@@ -0,0 +1,250 @@
+"""Process-pool executor for the CPU-bound pronunciation pipeline.
+
+ffmpeg, Praat, MFCC and DTW all run synchronously. Dispatching them to a
+pool of worker processes keeps the uvicorn event loop free to serve the
+catalog and audio endpoints while uploads are being analysed.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+import numpy as np
+
+from app.config import settings
+from app.services.audio_processor import (
+    SAMPLE_RATE,
+    decode_upload,
+    precheck_audio,
+    preprocess_samples,
+)
+from app.services.praat_analyzer import extract_features_from_samples
+from app.services.feature_comparator import calculate_weighted_score, rejected_score
+from app.services.feedback_generator import generate_phonetic_feedback
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisQueueFull(RuntimeError):
+    """Raised when every worker is busy and the wait queue is full.
+
+    ``retry_after`` is a rough estimate, in seconds, of when a slot frees up.
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AnalysisWaitTimeout(AnalysisQueueFull):
+    """Raised when a queued job waited longer than ``max_wait`` for a worker."""
+
+
+# ── Worker entry points ─────────────────────────────────────
+
+def analyze_upload(
+    raw_bytes: bytes, ref_features: dict[str, Any], profile: str | None = None
+) -> dict[str, Any]:
+    """Run preprocessing, extraction, scoring and feedback for one upload.
+
+    Executed inside a worker process, entirely in memory. Returns::
+
+        {"score_result": {...}, "feedback": {...}}
+
+    Uploads that fail :func:`precheck_audio` come back as a zero score with
+    ``score_result["rejection"]`` set, without running Praat. *profile* is
+    the analysis profile *ref_features* were extracted with.
+    """
+    return analyze_samples(decode_upload(raw_bytes), ref_features, profile)
+
+
+def analyze_samples(
+    samples: np.ndarray, ref_features: dict[str, Any], profile: str | None = None
+) -> dict[str, Any]:
+    """Like :func:`analyze_upload` for audio that is already decoded.
+
+    *samples* are mono float32 at ``SAMPLE_RATE``, e.g. from a streamed
+    recording that was decoded while the user spoke.
+    """
+    rejection = precheck_audio(samples, SAMPLE_RATE)
+    if rejection is not None:
+        score_result = rejected_score(rejection)
+        feedback = generate_phonetic_feedback(score_result, {}, ref_features)
+        return {"score_result": score_result, "feedback": feedback}
+
+    samples = preprocess_samples(samples)
+    user_features = extract_features_from_samples(samples, SAMPLE_RATE, profile)
+    score_result = calculate_weighted_score(user_features, ref_features)
+    feedback = generate_phonetic_feedback(score_result, user_features, ref_features)
+    return {"score_result": score_result, "feedback": feedback}
+
+
+def _warm_up() -> None:
+    """Worker initializer: pay import and table-building costs before the first request."""
+    from app.services.praat_analyzer import compute_mfcc
+
+    silence = np.zeros(2048, dtype=np.float32)
+    try:
+        compute_mfcc(silence, 22050, n_mfcc=13)
+    except Exception:
+        logger.debug("MFCC warm-up failed", exc_info=True)
+
+
+def _noop() -> None:
+    return None
+
+
+# ── Executor ────────────────────────────────────────────────
+
+class AnalysisExecutor:
+    """Bounded dispatcher from the event loop to the analysis pool.
+
+    At most ``workers`` jobs run at once; up to ``queue_depth`` more may wait
+    for a free worker, each for at most ``max_wait`` seconds. Anything beyond
+    that is rejected with :class:`AnalysisQueueFull` /
+    :class:`AnalysisWaitTimeout` instead of piling up unbounded CPU work.
+
+    ``workers == 0`` runs jobs on a single background thread instead of a
+    process pool (handy for tests and ``--reload`` development).
+    """
+
+    # Weight of the newest job in the running average of job durations.
+    _DURATION_ALPHA = 0.2
+
+    def __init__(self, workers: int, queue_depth: int, max_wait: float | None = None):
+        self.workers = max(0, workers)
+        self.queue_depth = max(0, queue_depth)
+        self.max_wait = max_wait if max_wait and max_wait > 0 else None
+        self._pool: Executor | None = None
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._running = 0
+        self._waiting = 0
+        self._avg_seconds = 1.0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def concurrency(self) -> int:
+        """Jobs allowed to run at once."""
+        return max(1, self.workers)
+
+    @property
+    def pending(self) -> int:
+        """Jobs currently running or waiting for a worker."""
+        return self._running + self._waiting
+
+    @property
+    def capacity(self) -> int:
+        return self.concurrency + self.queue_depth
+
+    def retry_after(self) -> int:
+        """Seconds until a newly queued job would likely get a worker."""
+        backlog = self._waiting + 1
+        return max(1, math.ceil(self._avg_seconds * backlog / self.concurrency))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "waiting": self._waiting,
+            "queue_depth": self.queue_depth,
+            "max_wait_seconds": self.max_wait,
+            "avg_job_seconds": round(self._avg_seconds, 3),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def _create_pool(self) -> Executor:
+        if self.workers == 0:
+            return ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="analysis", initializer=_warm_up
+            )
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up,
+        )
+
+    async def start(self) -> None:
+        """Create the pool and wait until every worker has warmed up."""
+        if self._pool is not None:
+            return
+        # Bind the semaphore to this (the serving) event loop.
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._pool = self._create_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._pool, _noop)
+            for _ in range(max(1, self.workers))
+        ))
+        logger.info(
+            "Analysis executor ready (workers=%d, queue_depth=%d)",
+            self.workers, self.queue_depth,
+        )
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` in the pool and return its result.
+
+        Exceptions raised by *fn* propagate unchanged, so callers keep their
+        existing error mapping.
+        """
+        if self._slots.locked() and self._waiting >= self.queue_depth:
+            self.rejected += 1
+            raise AnalysisQueueFull(
+                f"Analysis queue full ({self.pending}/{self.capacity} jobs)",
+                self.retry_after(),
+            )
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise AnalysisWaitTimeout(
+                f"No analysis worker free within {self.max_wait:g}s",
+                self.retry_after(),
+            ) from None
+        finally:
+            self._waiting -= 1
+
+        if self._pool is None:
+            self._pool = self._create_pool()
+        self._running += 1
+        started = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool, fn, *args)
+            elapsed = time.monotonic() - started
+            self._avg_seconds += self._DURATION_ALPHA * (elapsed - self._avg_seconds)
+            self.completed += 1
+            return result
+        except BrokenProcessPool:
+            # A worker died (e.g. native crash in Praat). The pool cannot be
+            # reused, so replace it for subsequent requests.
+            logger.error("Analysis worker crashed; recreating pool")
+            broken, self._pool = self._pool, None
+            if broken is not None:
+                broken.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            self._running -= 1
+            self._slots.release()
+
+
+analysis_executor = AnalysisExecutor(
+    workers=settings.ANALYSIS_WORKERS,
+    queue_depth=settings.ANALYSIS_QUEUE_DEPTH,
+    max_wait=settings.ANALYSIS_MAX_WAIT_SECONDS,
+)
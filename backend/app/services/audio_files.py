@@ -0,0 +1,104 @@
+"""Reference audio files on disk: location, size and content ETag.
+
+The ETag is a sha256 of the file, hashed once per file version (keyed by
+mtime and size) off the event loop, at most ``AUDIO_HASH_CONCURRENCY``
+files at a time. Shared by the audio route, which validates requests
+against it, and the batch word lookup, which reports it so clients can
+tell which files they already hold; the lookup takes the hash stored by
+precompute_features rather than reading a file itself. The full digest, as
+``precompute_features`` stores it, also tells the pronunciation route
+whether stored features still match the file.
+"""
+
+import asyncio
+import hashlib
+import os
+import stat
+from pathlib import Path
+from typing import NamedTuple
+
+from app.config import settings
+from app.http_cache import content_etag
+
+# Files hashed at once. A batch lookup over many cold files queues behind
+# these instead of taking every thread of the default executor.
+AUDIO_HASH_CONCURRENCY = 2
+
+# path → ((mtime_ns, size), sha256 hex) of files seen so far
+_audio_digests: dict[Path, tuple[tuple[int, int], str]] = {}
+_hash_slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+
+class AudioFile(NamedTuple):
+    path: Path
+    size: int
+    etag: str
+
+
+async def reference_audio(audio_filename: str | None,
+                          stored_sha256: str | None = None) -> AudioFile | None:
+    """The reference file for a word, or None if none is set or it is missing.
+
+    *stored_sha256* (``words.audio_hash``) stands in for hashing a file
+    this process has not hashed yet. It is not memoised: only the file's
+    own hash may vouch for it elsewhere.
+    """
+    if not audio_filename:
+        return None
+    path = settings.AUDIO_DIR / audio_filename
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    digest = await _audio_digest(path, st, stored_sha256)
+    return AudioFile(path, st.st_size, content_etag(digest[:32]))
+
+
+async def audio_sha256(path: Path) -> str | None:
+    """sha256 hex of the file at *path*, or None if it is not a readable file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return await _audio_digest(path, st)
+
+
+# ── Internal helpers ────────────────────────────────────────
+
+async def _audio_digest(path: Path, st: os.stat_result, stored: str | None = None) -> str:
+    """Content hash of *path*, recomputed only when its mtime or size changes."""
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _audio_digests.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    if stored:
+        return stored
+    async with _hash_slot():
+        cached = _audio_digests.get(path)  # hashed while this call waited?
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        digest = await asyncio.to_thread(file_sha256, path)
+    _audio_digests[path] = (version, digest)
+    return digest
+
+
+def _hash_slot() -> asyncio.Semaphore:
+    """The semaphore bounding concurrent hashes, one per event loop."""
+    global _hash_slots
+    loop = asyncio.get_running_loop()
+    if _hash_slots is None or _hash_slots[0] is not loop:
+        _hash_slots = (loop, asyncio.Semaphore(AUDIO_HASH_CONCURRENCY))
+    return _hash_slots[1]
+
+
+def file_sha256(path: Path) -> str:
+    """sha256 hex of the file at *path*, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -2,15 +2,18 @@
 
 Ported from prototype audio_processor.py — adapted for backend use.
 Removes Streamlit dependencies; pure function API.
+
+Uploads are decoded once into a float32 NumPy buffer (full scale = 1.0) and
+every later step works on that array; no temp files are written.
 """
 
-import tempfile
+import subprocess
 from pathlib import Path
 
 import numpy as np
 import soundfile as sf
-from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
+
+from app.services.segmenter import EnergyEnvelope
 
 # ── Constants (inlined from prototype config) ──────────────────
 SAMPLE_RATE = 22050
@@ -29,123 +32,203 @@ MAX_ANALYSIS_LEN_MS = 3000
 # invalid user attempt instead of crashing the API.
 MIN_UPLOAD_LEN_MS = 120
 
-
-def convert_to_wav(input_path: str | Path, output_path: str | Path | None = None) -> Path:
-    """Convert any audio format to WAV (mono, SAMPLE_RATE).
-
-    If *output_path* is None a temp file is created.
-    Returns the Path of the resulting WAV.
+FFMPEG_BIN = "ffmpeg"
+
+# Pre-check: cheap tests on the decoded signal that reject obviously unusable
+# uploads before normalisation, segmentation and Praat run.
+MAX_UPLOAD_SECONDS = 15          # longer takes are rejected (and never decoded past this)
+MAX_DECODE_SECONDS = MAX_UPLOAD_SECONDS + 0.05  # decoded this far, so they still count as too_long
+PRECHECK_FRAME_MS = 20
+PRECHECK_SILENT_DBFS = -50       # loudest 20 ms frame below this = silence
+PRECHECK_CLIP_LEVEL = 0.999      # |sample| at or above this counts as clipped
+PRECHECK_MAX_CLIPPED = 0.01      # fraction of clipped samples that is rejected
+PRECHECK_NOISE_MIN_SECONDS = 1.0  # only judge "steady noise" on takes this long
+PRECHECK_NOISE_RANGE_DB = 6      # loud (p90) vs quiet (p10) frames closer than this = noise
+
+
+def decode_audio(
+    raw_bytes: bytes,
+    sample_rate: int = SAMPLE_RATE,
+    *,
+    max_seconds: float | None = None,
+) -> np.ndarray:
+    """Decode any container/codec ffmpeg understands to mono float32 samples.
+
+    The bytes are piped through ffmpeg's stdin and raw PCM is read back from
+    its stdout, so nothing touches the disk. With *max_seconds*, decoding
+    stops after that much audio.
     """
-    input_path = Path(input_path)
-    audio = AudioSegment.from_file(str(input_path))
-    audio = audio.set_channels(1).set_frame_rate(SAMPLE_RATE)
-
-    if output_path is None:
-        tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-        output_path = Path(tmp.name)
-        tmp.close()
-    else:
-        output_path = Path(output_path)
+    limit = ["-t", f"{max_seconds:g}"] if max_seconds else []
+    try:
+        proc = subprocess.run(
+            [
+                FFMPEG_BIN, "-hide_banner", "-loglevel", "error",
+                "-i", "pipe:0",
+                *limit,
+                "-f", "f32le", "-acodec", "pcm_f32le",
+                "-ac", "1", "-ar", str(sample_rate),
+                "pipe:1",
+            ],
+            input=raw_bytes,
+            capture_output=True,
+            check=False,
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError("ffmpeg is required to decode uploads but was not found") from exc
+    if proc.returncode != 0:
+        err = proc.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise ValueError(
+            "Could not decode the uploaded audio"
+            + (f": {err[-1]}" if err else ".")
+        )
+    return np.frombuffer(proc.stdout, dtype="<f4")
 
-    audio.export(str(output_path), format="wav")
-    return output_path
 
+def precheck_audio(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> dict | None:
+    """Reject uploads that cannot contain a usable word, in milliseconds.
 
-def normalize_audio(audio: AudioSegment, target_dbfs: float = TARGET_DBFS) -> AudioSegment:
-    """RMS-normalise an AudioSegment to *target_dbfs*."""
-    change_in_dbfs = target_dbfs - audio.dBFS
-    return audio.apply_gain(change_in_dbfs)
+    Looks only at the duration and a coarse 20 ms energy envelope of the raw
+    (un-normalised) signal. Returns None when the take looks usable,
+    otherwise a rejection dict::
 
+        {"reason": "too_long" | "too_short" | "silent" | "clipped" | "noise",
+         "metrics": {...}}
 
-def trim_silence(audio: AudioSegment,
+    which ``generate_phonetic_feedback`` turns into user-facing text.
+    """
+    seconds = len(samples) / sample_rate
+    metrics = {"seconds": round(seconds, 2)}
+    if seconds >= MAX_UPLOAD_SECONDS:
+        return {"reason": "too_long", "metrics": {**metrics, "max_seconds": MAX_UPLOAD_SECONDS}}
+    if seconds * 1000 < MIN_UPLOAD_LEN_MS:
+        return {"reason": "too_short", "metrics": metrics}
+
+    # Longer than MIN_UPLOAD_LEN_MS here, so there is at least one frame.
+    frame = sample_rate * PRECHECK_FRAME_MS // 1000
+    n_frames = len(samples) // frame
+    frames = samples[:n_frames * frame].reshape(n_frames, frame)
+    power = np.mean(np.square(frames, dtype=np.float64), axis=1)
+    levels = 10 * np.log10(power + 1e-12)
+
+    peak_db = float(levels.max())
+    metrics["peak_dbfs"] = round(peak_db, 1)
+    if peak_db < PRECHECK_SILENT_DBFS:
+        return {"reason": "silent", "metrics": metrics}
+
+    clipped = float(np.mean(np.abs(samples) >= PRECHECK_CLIP_LEVEL))
+    if clipped > PRECHECK_MAX_CLIPPED:
+        return {"reason": "clipped", "metrics": {**metrics, "clipped_fraction": round(clipped, 4)}}
+
+    if seconds >= PRECHECK_NOISE_MIN_SECONDS:
+        p10, p90 = np.percentile(levels, [10, 90])
+        if p90 - p10 < PRECHECK_NOISE_RANGE_DB:
+            return {"reason": "noise", "metrics": {**metrics, "dynamic_range_db": round(float(p90 - p10), 1)}}
+    return None
+
+
+def normalize_audio(samples: np.ndarray, target_dbfs: float = TARGET_DBFS) -> np.ndarray:
+    """RMS-normalise *samples* (full scale = 1.0) to *target_dbfs*."""
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64)))) if len(samples) else 0.0
+    if rms == 0.0:
+        return samples  # digital silence — nothing to scale
+    gain = 10 ** ((target_dbfs - 20 * np.log10(rms)) / 20)
+    # Saturate like 16-bit PCM would instead of wrapping around.
+    return np.clip(samples * np.float32(gain), -1.0, 1.0).astype(np.float32, copy=False)
+
+
+def trim_silence(samples: np.ndarray,
+                 sample_rate: int = SAMPLE_RATE,
                  silence_thresh: int = SILENCE_THRESH_DB,
-                 min_silence_len: int = MIN_SILENCE_LEN_MS) -> AudioSegment:
-    """Remove leading / trailing silence from an AudioSegment."""
-    nonsilent_ranges = detect_nonsilent(
-        audio,
-        min_silence_len=min_silence_len,
-        silence_thresh=silence_thresh,
-    )
+                 min_silence_len: int = MIN_SILENCE_LEN_MS) -> np.ndarray:
+    """Remove leading / trailing silence."""
+    envelope = EnergyEnvelope(samples, sample_rate)
+    nonsilent_ranges = envelope.nonsilent_ranges(silence_thresh, min_silence_len)
     if not nonsilent_ranges:
-        return audio  # entirely silent — return as-is
+        return samples  # entirely silent — return as-is
     start = nonsilent_ranges[0][0]
     end = nonsilent_ranges[-1][1]
-    return audio[start:end]
+    return _slice_ms(samples, sample_rate, start, end)
 
 
-def split_first_word(audio: AudioSegment,
+def split_first_word(samples: np.ndarray,
+                     sample_rate: int = SAMPLE_RATE,
                      silence_thresh: int = SILENCE_THRESH_DB,
-                     min_silence_len: int = MIN_SILENCE_LEN_MS) -> AudioSegment:
+                     min_silence_len: int = MIN_SILENCE_LEN_MS) -> np.ndarray:
     """If the user recorded multiple words, keep only the first one.
 
     Falls back to returning the full audio if no internal silence gap is
     detected.
     """
-    nonsilent_ranges = detect_nonsilent(
-        audio,
-        min_silence_len=min_silence_len,
-        silence_thresh=silence_thresh,
-    )
+    envelope = EnergyEnvelope(samples, sample_rate)
+    nonsilent_ranges = envelope.nonsilent_ranges(silence_thresh, min_silence_len)
     if not nonsilent_ranges:
-        return audio
+        return samples
     # keep only the first non-silent segment
     start, end = nonsilent_ranges[0]
-    return audio[start:end]
+    return _slice_ms(samples, sample_rate, start, end)
 
 
-def preprocess_upload(raw_bytes: bytes, original_filename: str = "upload.webm") -> Path:
-    """End-to-end preprocessing of a user upload.
+def preprocess_upload(raw_bytes: bytes) -> np.ndarray:
+    """End-to-end preprocessing of a user upload, entirely in memory.
 
-    1. Write raw bytes to a temp file
-    2. Convert to mono WAV at SAMPLE_RATE
-    3. Normalize loudness
-    4. Trim leading/trailing silence
-    5. Keep only the first word segment
-    6. Export final WAV and return its Path
+    Decodes to mono float32 at SAMPLE_RATE (ffmpeg via pipes), then runs
+    :func:`preprocess_samples`. Returns the processed samples.
+    """
+    return preprocess_samples(decode_audio(raw_bytes))
 
-    The caller is responsible for deleting the returned temp file.
+
+def decode_upload(raw_bytes: bytes) -> np.ndarray:
+    """Decode an upload for :func:`precheck_audio`.
+
+    Stops just past MAX_UPLOAD_SECONDS, so an overlong take costs no more to
+    decode than the longest acceptable one and is still flagged too_long.
     """
-    suffix = Path(original_filename).suffix or ".webm"
-    tmp_raw = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
-    tmp_raw.write(raw_bytes)
-    tmp_raw.close()
+    return decode_audio(raw_bytes, max_seconds=MAX_DECODE_SECONDS)
 
-    try:
-        # Convert to WAV
-        wav_path = convert_to_wav(tmp_raw.name)
-    finally:
-        Path(tmp_raw.name).unlink(missing_ok=True)
 
-    # Load as AudioSegment for processing
-    audio = AudioSegment.from_wav(str(wav_path))
-    audio = normalize_audio(audio)
-    audio = trim_silence(audio)
+def preprocess_samples(samples: np.ndarray) -> np.ndarray:
+    """Isolate the analysed word from decoded mono samples at SAMPLE_RATE.
+
+    1. Normalize loudness
+    2. Trim leading/trailing silence
+    3. Keep only the first word segment
+
+    Steps 2-3 query one energy envelope of the normalised signal and only
+    narrow a millisecond span; the buffer is sliced once at the end.
+    """
+    samples = normalize_audio(samples)
+    envelope = EnergyEnvelope(samples, SAMPLE_RATE)
+    start, end = 0, envelope.duration_ms
+
+    # Trim leading/trailing silence
+    ranges = envelope.nonsilent_ranges(SILENCE_THRESH_DB, MIN_SILENCE_LEN_MS)
+    if ranges:
+        start, end = ranges[0][0], ranges[-1][1]
 
     # First attempt: conservative splitting (avoids chopping inside a word)
-    audio = split_first_word(audio)
+    ranges = envelope.nonsilent_ranges(SILENCE_THRESH_DB, MIN_SILENCE_LEN_MS, start, end)
+    if ranges:
+        start, end = ranges[0]
 
     # If the recording is still long, try a more aggressive split to catch
     # short pauses between words in a sentence.
-    if len(audio) > MAX_ANALYSIS_LEN_MS:
-        audio = split_first_word(
-            audio,
-            silence_thresh=AGGRESSIVE_SILENCE_THRESH_DB,
-            min_silence_len=AGGRESSIVE_MIN_SILENCE_LEN_MS,
+    if end - start > MAX_ANALYSIS_LEN_MS:
+        ranges = envelope.nonsilent_ranges(
+            AGGRESSIVE_SILENCE_THRESH_DB, AGGRESSIVE_MIN_SILENCE_LEN_MS, start, end
         )
+        if ranges:
+            start, end = ranges[0]
 
     # Final safety cap: prevent extremely long utterances from dominating
     # runtime and from being mistaken as a single word.
-    if len(audio) > MAX_ANALYSIS_LEN_MS:
-        audio = audio[:MAX_ANALYSIS_LEN_MS]
+    end = min(end, start + MAX_ANALYSIS_LEN_MS)
 
-    if len(audio) < MIN_UPLOAD_LEN_MS:
+    if end - start < MIN_UPLOAD_LEN_MS:
         raise ValueError(
             "Recording too short. Please record a clear single word (at least ~0.2s) and try again."
         )
 
-    # Overwrite the wav_path with the processed version
-    audio.export(str(wav_path), format="wav")
-    return wav_path
+    return _slice_ms(samples, SAMPLE_RATE, start, end)
 
 
 def load_audio_array(path: str | Path) -> tuple[np.ndarray, int]:
@@ -155,3 +238,10 @@ def load_audio_array(path: str | Path) -> tuple[np.ndarray, int]:
     """
     data, sr = sf.read(str(path), dtype="float32")
     return data, sr
+
+
+# ── Internal helpers ────────────────────────────────────────
+
+def _slice_ms(samples: np.ndarray, sample_rate: int, start_ms: int, end_ms: int) -> np.ndarray:
+    """Slice by milliseconds, with the same frame rounding pydub uses."""
+    return samples[int(start_ms * sample_rate / 1000):int(end_ms * sample_rate / 1000)]
@@ -0,0 +1,214 @@
+"""Incremental decoding and voice activity detection for streamed recordings.
+
+The browser's MediaRecorder emits a WebM/Opus stream in small timesliced
+chunks. :class:`AudioStream` pipes those chunks into one long-lived ffmpeg
+process as they arrive and reads mono float32 PCM back while the user is
+still speaking, so by the time they stop, the recording is already decoded.
+
+:class:`StreamingVAD` frames the decoded samples on the fly and reports
+speech start / end events, which the WebSocket route forwards to the client
+and uses to start scoring as soon as the utterance is over.
+"""
+
+import asyncio
+import math
+from collections import deque
+
+import numpy as np
+
+from app.services.audio_processor import FFMPEG_BIN, MAX_DECODE_SECONDS, SAMPLE_RATE
+
+# ── Constants ─────────────────────────────────────────────────
+# Cap on one streamed recording (decoded audio), in seconds: where
+# decode_upload stops, so an overlong take is cut off while streaming and
+# then rejected as too_long exactly like the same upload.
+MAX_STREAM_SECONDS = MAX_DECODE_SECONDS
+
+# Keep ffmpeg's stream probing short so PCM starts flowing after the first
+# chunks. No "-fflags nobuffer": it drops the packets read while probing,
+# i.e. the start of the recording, and the take would then decode (and
+# score) differently than the same bytes sent to /check.
+_STREAM_INPUT_ARGS = ["-probesize", "4096", "-analyzeduration", "0"]
+_READ_SIZE = 64 * 1024
+
+VAD_FRAME_MS = 20
+VAD_MARGIN_DB = 15            # speech must exceed the noise floor by this much
+VAD_MIN_SPEECH_DBFS = -50     # ... and be at least this loud
+VAD_MAX_FLOOR_DBFS = -45      # noise floor estimate is never above this
+VAD_FLOOR_WINDOW_MS = 1500    # noise floor = quietest frame in this window
+VAD_START_MS = 60             # consecutive speech needed to open an utterance
+VAD_END_MS = 300              # consecutive non-speech needed to close it
+
+
+class StreamingVAD:
+    """Energy-based voice activity detector fed incrementally.
+
+    The threshold adapts to the recording: the noise floor is the quietest
+    frame of the last ``VAD_FLOOR_WINDOW_MS`` (capped at
+    ``VAD_MAX_FLOOR_DBFS`` so a recording that starts mid-word is still
+    detected), and a frame counts as speech when it is ``VAD_MARGIN_DB``
+    above that floor.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = VAD_FRAME_MS):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.in_speech = False
+        self.utterances = 0
+        self._frames = 0
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._levels: deque[float] = deque(maxlen=max(1, VAD_FLOOR_WINDOW_MS // frame_ms))
+        self._run = 0  # consecutive frames disagreeing with ``in_speech``
+        self._start_frames = max(1, VAD_START_MS // frame_ms)
+        self._end_frames = max(1, VAD_END_MS // frame_ms)
+
+    @property
+    def position_ms(self) -> int:
+        return self._frames * self.frame_ms
+
+    def push(self, samples: np.ndarray) -> list[dict]:
+        """Consume decoded samples; return the VAD events they complete."""
+        x = np.concatenate((self._pending, samples)) if len(self._pending) else samples
+        n_frames = len(x) // self.frame_len
+        self._pending = x[n_frames * self.frame_len:]
+        if n_frames == 0:
+            return []
+
+        frames = x[:n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+        power = np.mean(np.square(frames, dtype=np.float64), axis=1)
+        levels = 10 * np.log10(power + 1e-12)
+
+        events = []
+        for level in levels:
+            self._levels.append(float(level))
+            self._frames += 1
+            floor = min(min(self._levels), VAD_MAX_FLOOR_DBFS)
+            is_speech = level >= max(floor + VAD_MARGIN_DB, VAD_MIN_SPEECH_DBFS)
+
+            self._run = self._run + 1 if is_speech != self.in_speech else 0
+            if not self.in_speech and self._run >= self._start_frames:
+                self.in_speech = True
+                self.utterances += 1
+                self._run = 0
+                events.append(self._event("speech_start", self._frames - self._start_frames))
+            elif self.in_speech and self._run >= self._end_frames:
+                self.in_speech = False
+                self._run = 0
+                events.append(self._event("speech_end", self._frames - self._end_frames))
+        return events
+
+    def _event(self, name: str, frame: int) -> dict:
+        return {"type": "vad", "event": name, "at_ms": frame * self.frame_ms}
+
+
+class AudioStream:
+    """One streamed recording: chunked container bytes in, PCM + VAD out.
+
+    Call :meth:`start`, then :meth:`feed` each chunk as it arrives and
+    :meth:`finish` once the client stops. :meth:`abort` is safe to call at
+    any point and should always run (e.g. in a ``finally``).
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, max_seconds: float = MAX_STREAM_SECONDS):
+        self.sample_rate = sample_rate
+        self.max_seconds = max_seconds
+        self.max_samples = math.ceil(max_seconds * sample_rate)  # as ffmpeg -t counts them
+        self.vad = StreamingVAD(sample_rate)
+        self._proc: asyncio.subprocess.Process | None = None
+        self._stdout_task: asyncio.Task | None = None
+        self._stderr_task: asyncio.Task | None = None
+        self._chunks: list[np.ndarray] = []
+        self._n_samples = 0
+        self._events: list[dict] = []
+
+    @property
+    def n_samples(self) -> int:
+        return self._n_samples
+
+    @property
+    def full(self) -> bool:
+        """Whether ``max_seconds`` of audio have been decoded."""
+        return self._n_samples >= self.max_samples
+
+    async def start(self) -> None:
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                FFMPEG_BIN, "-hide_banner", "-loglevel", "error",
+                *_STREAM_INPUT_ARGS,
+                "-i", "pipe:0",
+                "-f", "f32le", "-acodec", "pcm_f32le",
+                "-ac", "1", "-ar", str(self.sample_rate),
+                "pipe:1",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError as exc:
+            raise RuntimeError("ffmpeg is required to decode uploads but was not found") from exc
+        self._stdout_task = asyncio.create_task(self._read_pcm())
+        self._stderr_task = asyncio.create_task(self._proc.stderr.read())
+
+    async def feed(self, chunk: bytes) -> None:
+        """Forward one chunk of the recording to the decoder; dropped once :attr:`full`."""
+        if self.full:
+            return
+        try:
+            self._proc.stdin.write(chunk)
+            await self._proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            raise ValueError(await self._decode_error())
+
+    def drain_events(self) -> list[dict]:
+        """VAD events produced since the last call."""
+        events, self._events = self._events, []
+        return events
+
+    def samples(self) -> np.ndarray:
+        """Everything decoded so far, as one contiguous array."""
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0] if self._chunks else np.zeros(0, dtype=np.float32)
+
+    async def finish(self) -> np.ndarray:
+        """Close the input, wait for the decoder to flush and return the samples.
+
+        At most ``max_seconds`` of them, as :func:`decode_upload` would give.
+        """
+        if self._proc.stdin.can_write_eof():
+            self._proc.stdin.close()
+        await self._stdout_task
+        returncode = await self._proc.wait()
+        if returncode != 0 and self._n_samples == 0:
+            raise ValueError(await self._decode_error())
+        return self.samples()[:self.max_samples]
+
+    async def abort(self) -> None:
+        if self._proc is not None and self._proc.returncode is None:
+            self._proc.kill()
+            await self._proc.wait()
+        for task in (self._stdout_task, self._stderr_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+    # ── Internal helpers ────────────────────────────────────
+
+    async def _read_pcm(self) -> None:
+        leftover = b""
+        while True:
+            data = await self._proc.stdout.read(_READ_SIZE)
+            if not data:
+                break
+            data = leftover + data
+            usable = len(data) - len(data) % 4
+            leftover = data[usable:]
+            if not usable:
+                continue
+            samples = np.frombuffer(data[:usable], dtype="<f4")
+            self._chunks.append(samples)
+            self._n_samples += len(samples)
+            self._events.extend(self.vad.push(samples))
+
+    async def _decode_error(self) -> str:
+        err = (await self._stderr_task).decode("utf-8", "replace").strip().splitlines()
+        return "Could not decode the uploaded audio" + (f": {err[-1]}" if err else ".")
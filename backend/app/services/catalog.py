@@ -0,0 +1,240 @@
+"""In-memory snapshot of the category / word catalog.
+
+The catalog only changes when the import pipeline runs, yet listing
+categories used to run a ``COUNT ... GROUP BY`` over all words and listing
+words two queries, on every call. Instead the whole catalog is loaded into
+an immutable :class:`CatalogSnapshot` at startup, with the word lists
+already resolved per category and language, and the routes read from it.
+
+Freshness: at most every ``CATALOG_CHECK_SECONDS`` the database file (and
+its WAL) is ``stat``-ed; only if that signature moved is ``PRAGMA
+data_version`` asked on the catalog's own connection, and only if that
+moved too is the snapshot rebuilt. In steady state a request touches
+neither the disk nor the database.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from bisect import bisect_right
+from operator import attrgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+import aiosqlite
+
+from app.config import settings
+from app.database import DB_PATH
+from app.http_cache import EncodedBody
+from app.models import CategoryOut, WordDetail, WordOut
+
+logger = logging.getLogger(__name__)
+
+LANG_COLUMNS = {"en": "translation_en", "fr": "translation_fr", "de": "translation_de"}
+
+_word_id = attrgetter("id")
+
+
+class CatalogSnapshot:
+    """Immutable view of the catalog at one point in time.
+
+    ``version`` is a hash of the content, so a reload that finds the same
+    rows (e.g. after features were rewritten) keeps the same version.
+    """
+
+    __slots__ = ("version", "categories", "words", "audio_files", "audio_hashes", "_lists",
+                 "_encoded")
+
+    def __init__(self, categories: list[CategoryOut],
+                 words: list[tuple[str, str | None, WordDetail]],
+                 audio_hashes: Mapping[int, str | None] | None = None):
+        """*words* are ``(category name, audio filename, word)`` rows.
+
+        *audio_hashes* are the ``words.audio_hash`` values stored by
+        precompute_features; they are not part of ``version``.
+        """
+        by_category: dict[str, list[WordDetail]] = {c.name: [] for c in categories}
+        for category_name, _, word in words:
+            by_category.setdefault(category_name, []).append(word)
+
+        self.categories: tuple[CategoryOut, ...] = tuple(categories)
+        self.words: Mapping[int, WordDetail] = MappingProxyType({w.id: w for _, _, w in words})
+        self.audio_files: Mapping[int, str | None] = MappingProxyType(
+            {w.id: audio_filename for _, audio_filename, w in words}
+        )
+        self.audio_hashes: Mapping[int, str | None] = MappingProxyType(dict(audio_hashes or {}))
+        self._lists: Mapping[tuple[str, str], tuple[WordOut, ...]] = MappingProxyType({
+            (c.name, lang): tuple(
+                WordOut(id=w.id, word_lb=w.word_lb, translation=getattr(w, column),
+                        gender=w.gender, audio_url=w.audio_url)
+                for w in by_category[c.name]
+            )
+            for c in categories
+            for lang, column in LANG_COLUMNS.items()
+        })
+        digest = hashlib.sha256()
+        for c in self.categories:
+            digest.update(c.model_dump_json().encode())
+        for _, audio_filename, w in words:
+            digest.update(f"{audio_filename}\0".encode())
+            digest.update(w.model_dump_json().encode())
+        self.version = digest.hexdigest()[:16]
+        self._encoded: dict[tuple, EncodedBody] = {}
+
+    def word_list(self, category_name: str, lang: str) -> tuple[WordOut, ...] | None:
+        """Words of a category with translations in *lang*; None if no such category."""
+        return self._lists.get((category_name, lang))
+
+    def word_page(self, category_name: str, lang: str, *, after_id: int | None = None,
+                  limit: int | None = None) -> tuple[tuple[WordOut, ...], int | None] | None:
+        """Keyset page of :meth:`word_list`: words with ``id > after_id``, at most *limit*.
+
+        Returns ``(words, next_after_id)``, where ``next_after_id`` is None on
+        the last page, or None if there is no such category. Lists are in id
+        order, so the page start is a binary search and stays stable while
+        words are added.
+        """
+        words = self._lists.get((category_name, lang))
+        if words is None:
+            return None
+        start = 0 if after_id is None else bisect_right(words, after_id, key=_word_id)
+        if limit is None:
+            return words[start:], None
+        page = words[start:start + limit]
+        return page, (page[-1].id if start + limit < len(words) else None)
+
+    def encoded(self, key: tuple, build: Callable[[], EncodedBody]) -> EncodedBody:
+        """The response body for *key*, built on first use for this version."""
+        body = self._encoded.get(key)
+        if body is None:
+            body = self._encoded[key] = build()
+        return body
+
+
+class Catalog:
+    """Holds the current :class:`CatalogSnapshot` and swaps it when the DB changes."""
+
+    def __init__(self, path: Path, *, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._snapshot: CatalogSnapshot | None = None
+        self._conn: aiosqlite.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._signature: tuple | None = None
+        self._data_version: int | None = None
+        self._checked_at = float("-inf")
+        self.reloads = 0
+
+    async def start(self) -> None:
+        """Open the catalog's connection and load the first snapshot."""
+        self._lock = asyncio.Lock()
+        await self.snapshot()
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+        self._snapshot = None
+        self._signature = None
+        self._data_version = None
+
+    async def snapshot(self) -> CatalogSnapshot:
+        """The current snapshot, reloaded first if the database changed."""
+        if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._snapshot
+        async with self._lock:
+            if self._snapshot is None or time.monotonic() - self._checked_at >= self.check_interval:
+                await self._refresh()
+            return self._snapshot
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "categories": len(snapshot.categories) if snapshot else 0,
+            "words": len(snapshot.words) if snapshot else 0,
+            "reloads": self.reloads,
+        }
+
+    async def _refresh(self) -> None:
+        self._checked_at = time.monotonic()
+        signature = self._file_signature()
+        if self._snapshot is not None and signature == self._signature:
+            return
+        if self._conn is None:
+            self._conn = await aiosqlite.connect(self.path)
+            self._conn.row_factory = aiosqlite.Row
+        cursor = await self._conn.execute("PRAGMA data_version")
+        data_version = (await cursor.fetchone())[0]
+        self._signature = signature
+        if self._snapshot is not None and data_version == self._data_version:
+            return
+
+        snapshot = await self._load()
+        self._data_version = data_version
+        if self._snapshot is None or snapshot.version != self._snapshot.version:
+            logger.info("Catalog loaded: %d categories, %d words (version %s)",
+                        len(snapshot.categories), len(snapshot.words), snapshot.version)
+        self._snapshot = snapshot
+        self.reloads += 1
+
+    async def _load(self) -> CatalogSnapshot:
+        cursor = await self._conn.execute(
+            """
+            SELECT c.id, c.name, c.display_name, c.image_url,
+                   COUNT(w.id) AS word_count
+            FROM categories c
+            LEFT JOIN words w ON w.category_id = c.id
+            GROUP BY c.id
+            ORDER BY c.name
+            """
+        )
+        categories = [
+            CategoryOut(
+                id=r["id"],
+                name=r["name"],
+                display_name=r["display_name"],
+                image_url=r["image_url"],
+                word_count=r["word_count"],
+            )
+            for r in await cursor.fetchall()
+        ]
+        cursor = await self._conn.execute(
+            """
+            SELECT c.name AS category_name, w.audio_filename, w.audio_hash, w.id, w.lod_reference,
+                   w.word_lb, w.translation_en, w.translation_fr, w.translation_de, w.gender
+            FROM words w JOIN categories c ON c.id = w.category_id
+            ORDER BY w.id
+            """
+        )
+        rows = await cursor.fetchall()
+        words = [
+            (r["category_name"], r["audio_filename"], WordDetail(
+                id=r["id"],
+                lod_reference=r["lod_reference"],
+                word_lb=r["word_lb"],
+                translation_en=r["translation_en"],
+                translation_fr=r["translation_fr"],
+                translation_de=r["translation_de"],
+                gender=r["gender"],
+                audio_url=f"/api/audio/{r['id']}",
+            ))
+            for r in rows
+        ]
+        return CatalogSnapshot(categories, words, {r["id"]: r["audio_hash"] for r in rows})
+
+    def _file_signature(self) -> tuple:
+        signature = []
+        for suffix in ("", "-wal"):
+            try:
+                st = os.stat(f"{self.path}{suffix}")
+                signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+
+catalog = Catalog(DB_PATH, check_interval=settings.CATALOG_CHECK_SECONDS)
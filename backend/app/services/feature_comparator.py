@@ -4,10 +4,20 @@ Ported from prototype feature_comparator.py — adapted for backend use.
 Uses DTW for time-series alignment and Gaussian similarity for scalars.
 """
 
+import logging
 from typing import Any
 
 import numpy as np
 
+from app.config import settings
+from app.services.dtw import dtw_distance, dtw_multivariate
+
+# Bump whenever scoring or feedback output changes for the same inputs, so
+# memoised results from the old code are not served.
+SCORING_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
 # ── Weights (must sum to 1.0) ───────────────────────────────
 
 WEIGHTS = {
@@ -130,6 +140,20 @@ def calculate_weighted_score(
     }
 
 
+def rejected_score(rejection: dict[str, Any]) -> dict[str, Any]:
+    """Score result for an upload rejected before analysis (see precheck_audio).
+
+    Same shape as :func:`calculate_weighted_score`, all zeros, with the
+    rejection attached for the feedback generator and the API response.
+    """
+    return {
+        "overall_score": 0.0,
+        "breakdown": {k: 0.0 for k in ("pitch", "formants", "intensity", "duration", "voice_quality")},
+        "details": {},
+        "rejection": rejection,
+    }
+
+
 def _compute_utterance_gate(user_duration: dict, ref_duration: dict) -> tuple[float, dict[str, Any]]:
     """Compute a 0..1 multiplier based on utterance length mismatch.
 
@@ -184,23 +208,12 @@ def _compute_utterance_gate(user_duration: dict, ref_duration: dict) -> tuple[fl
 # ── DTW helper ──────────────────────────────────────────────
 
 def _dtw_distance(seq_a: list[float], seq_b: list[float]) -> float:
-    """Simple DTW distance (Euclidean cost) between two 1-D sequences.
+    """DTW distance (absolute-difference cost) between two 1-D sequences.
 
-    Uses O(n·m) DP; fine for short utterances.
+    Normalised by the longer sequence length. Vectorised in
+    ``app.services.dtw``; ``DTW_BAND`` optionally limits the warp.
     """
-    n, m = len(seq_a), len(seq_b)
-    if n == 0 or m == 0:
-        # No alignment possible; treat as maximally different.
-        return 1e6
-    a = np.array(seq_a, dtype=np.float64)
-    b = np.array(seq_b, dtype=np.float64)
-    dtw = np.full((n + 1, m + 1), np.inf)
-    dtw[0, 0] = 0.0
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            cost = abs(a[i - 1] - b[j - 1])
-            dtw[i, j] = cost + min(dtw[i - 1, j], dtw[i, j - 1], dtw[i - 1, j - 1])
-    return float(dtw[n, m] / max(n, m))
+    return dtw_distance(seq_a, seq_b, band=settings.DTW_BAND)
 
 
 def _gaussian_similarity(diff: float, sigma: float) -> float:
@@ -215,7 +228,7 @@ def _compare_pitch(user: dict, ref: dict) -> tuple[float, dict]:
     r_vals = ref.get("values", [])
     detail: dict[str, Any] = {}
 
-    if not u_vals or not r_vals:
+    if len(u_vals) == 0 or len(r_vals) == 0:
         return 50.0, {"note": "insufficient pitch data"}
 
     dtw_dist = _dtw_distance(u_vals, r_vals)
@@ -245,10 +258,20 @@ def _compare_formants(user: dict, ref: dict) -> tuple[float, dict]:
     detail: dict[str, Any] = {}
     missing = False
 
-    for fi in ("f1", "f2", "f3"):
+    joint_dists = None
+    if settings.FORMANT_ALIGNMENT == "joint":
+        joint_dists = _joint_formant_distances(user, ref)
+        if joint_dists is None:
+            logger.info("Joint formant alignment unavailable; aligning tracks separately")
+            detail["alignment_fallback"] = True
+    detail["alignment"] = "joint" if joint_dists is not None else "per_track"
+
+    for k, fi in enumerate(("f1", "f2", "f3")):
         u_vals = user.get(f"{fi}_values", [])
         r_vals = ref.get(f"{fi}_values", [])
-        if u_vals and r_vals:
+        if joint_dists is not None:
+            s = _gaussian_similarity(joint_dists[k], sigma=100)
+        elif len(u_vals) and len(r_vals):
             dtw_dist = _dtw_distance(u_vals, r_vals)
             s = _gaussian_similarity(dtw_dist, sigma=100)
         else:
@@ -272,12 +295,37 @@ def _compare_formants(user: dict, ref: dict) -> tuple[float, dict]:
     return score, detail
 
 
+def _joint_formant_distances(user: dict, ref: dict) -> list[float] | None:
+    """Per-formant DTW distances read off one joint F1/F2/F3 alignment.
+
+    Aligns the stacked (F1, F2, F3) frame vectors once, then measures each
+    track along that shared path (normalised like ``_dtw_distance``). The
+    rows come from the frame-aligned ``f*_joint`` tracks (frames where all
+    three formants are defined). Returns None when a side has no such
+    frames, or predates those tracks (legacy JSON features; older blobs
+    fail to decode and are re-extracted), so the caller falls back to
+    per-track alignment.
+    """
+    stacks = []
+    for side in (user, ref):
+        tracks = [side.get(f"{fi}_joint") for fi in ("f1", "f2", "f3")]
+        if any(t is None or not len(t) for t in tracks) or len({len(t) for t in tracks}) != 1:
+            return None
+        stacks.append(np.column_stack(tracks).astype(np.float64))
+
+    u, r = stacks
+    _, path_u, path_r = dtw_multivariate(u, r, band=settings.DTW_BAND)
+    norm = max(len(u), len(r))
+    per_track = np.abs(u[path_u] - r[path_r]).sum(axis=0) / norm
+    return [float(d) for d in per_track]
+
+
 def _compare_intensity(user: dict, ref: dict) -> tuple[float, dict]:
     u_vals = user.get("values", [])
     r_vals = ref.get("values", [])
     detail: dict[str, Any] = {}
 
-    if u_vals and r_vals:
+    if len(u_vals) and len(r_vals):
         dtw_dist = _dtw_distance(u_vals, r_vals)
         contour_score = _gaussian_similarity(dtw_dist, sigma=10)
     else:
@@ -394,7 +442,7 @@ def _compute_mfcc_penalty(user_mfcc: dict, ref_mfcc: dict) -> tuple[float, dict[
     """
     u = user_mfcc.get("mean", None)
     r = ref_mfcc.get("mean", None)
-    if not u or not r:
+    if u is None or r is None or len(u) == 0 or len(r) == 0:
         return 1.0, {"gate": 1.0, "reason": "missing_mfcc"}
 
     u_vec = np.array(u, dtype=np.float64)
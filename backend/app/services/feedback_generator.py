@@ -25,6 +25,10 @@ def generate_phonetic_feedback(
             "suggestions": [str, ...],
         }
     """
+    rejection = score_result.get("rejection")
+    if rejection:
+        return _rejection_feedback(rejection)
+
     overall = score_result.get("overall_score", 0)
     breakdown = score_result.get("breakdown", {})
     details = score_result.get("details", {})
@@ -191,3 +195,37 @@ def generate_phonetic_feedback(
         "improvements": improvements,
         "suggestions": suggestions,
     }
+
+
+def _rejection_feedback(rejection: dict[str, Any]) -> dict[str, Any]:
+    """Feedback for an upload rejected before analysis (see precheck_audio)."""
+    reason = rejection.get("reason")
+    metrics = rejection.get("metrics", {})
+    suggestions: list[str] = []
+
+    if reason == "silent":
+        overall_text = "We couldn't hear anything in your recording."
+        improvements = ["Check that your microphone is connected and not muted, then try again."]
+    elif reason == "clipped":
+        overall_text = "Your recording is distorted because it was too loud."
+        improvements = ["Move a little further from the microphone or speak a bit more softly."]
+    elif reason == "noise":
+        overall_text = "We only picked up background noise, not a spoken word."
+        improvements = ["Find a quieter spot and say the word clearly, close to the microphone."]
+    elif reason == "too_long":
+        overall_text = "Your recording is too long to analyse."
+        improvements = ["Record just the target word once, then stop the recording."]
+        if "max_seconds" in metrics:
+            suggestions.append(f"Keep recordings under {metrics['max_seconds']} seconds.")
+    elif reason == "too_short":
+        overall_text = "Your recording is too short to analyse."
+        improvements = ["Start recording, say the whole word, then stop."]
+    else:
+        overall_text = "We couldn't analyse this recording."
+        improvements = ["Please try recording again."]
+
+    return {
+        "overall_text": overall_text,
+        "improvements": improvements,
+        "suggestions": suggestions,
+    }
@@ -4,45 +4,222 @@ Ported from prototype praat_analyzer.py — adapted for backend use.
 Removes Streamlit dependencies; pure function API.
 """
 
+import json
+import struct
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Any
 
 import numpy as np
-import librosa
 import parselmouth
+import soundfile as sf
 from parselmouth.praat import call
 
+PITCH_FLOOR = 75    # Hz
+PITCH_CEILING = 600  # Hz
+
+# Speaker-adaptive pitch range (two-pass method): a first pass over
+# PITCH_FLOOR–PITCH_CEILING gives the speaker's F0 quantiles, and the real
+# analysis uses q35 × 0.72 … q65 × 1.9, kept inside the broad range. With
+# too few voiced frames the broad range is used as is.
+PITCH_RANGE_QUANTILES = (0.35, 0.65)
+PITCH_RANGE_FACTORS = (0.72, 1.9)
+PITCH_RANGE_MIN_VOICED = 5
+# Time step of the first pass for user recordings; references use Praat's
+# automatic step, as they are analysed offline.
+QUICK_PITCH_STEP = 0.05  # s
+
+# Layout of the dict returned by extract_all_praat_features. Bump when keys
+# or their meaning change so cached / stored features are not misread, and
+# bump EXTRACTOR_VERSION with it so precompute_features rewrites stored rows.
+# 2: formant f*_joint tracks, pitch floor / ceiling.
+FEATURE_SCHEMA_VERSION = 2
+
+# Bump when extraction itself changes (analysis parameters, MFCC settings,
+# ...) so precompute_features re-extracts rows whose audio is unchanged.
+EXTRACTOR_VERSION = 4
+
+
+@dataclass(frozen=True)
+class AnalysisProfile:
+    """Named resolution settings for the Praat analyses.
+
+    ``time_step`` is passed to "To Pitch", "To Formant (burg)" and "To
+    Intensity" (0 = Praat's automatic step, roughly 6–10 ms). Contours
+    longer than ``max_contour_points`` are decimated before they are
+    returned; their summary statistics are always taken over every frame.
+    User and reference features must come from the same profile, since
+    the DTW comparisons assume matching frame rates.
+    """
+
+    name: str
+    time_step: float = 0.0
+    max_contour_points: int | None = None
+
+
+PROFILES = {
+    "accurate": AnalysisProfile("accurate"),
+    "fast": AnalysisProfile("fast", time_step=0.02, max_contour_points=60),
+}
+
+# Profile whose reference features are stored in words.praat_features_blob;
+# the others live in the word_features table.
+DEFAULT_PROFILE = "accurate"
+
+
+def get_profile(name: str | None = None) -> AnalysisProfile:
+    """Look up a profile by name (None = :data:`DEFAULT_PROFILE`)."""
+    try:
+        return PROFILES[name or DEFAULT_PROFILE]
+    except KeyError:
+        raise ValueError(
+            f"Unknown analysis profile {name!r} (expected one of: {', '.join(PROFILES)})"
+        ) from None
+
+
+# MFCC analysis, matching librosa.feature.mfcc defaults.
+MFCC_N_FFT = 2048
+MFCC_HOP_LENGTH = 512
+MFCC_N_MELS = 128
+MFCC_TOP_DB = 80.0
+
+# Binary feature blob: magic, format version, header length, JSON header
+# (scalars + array directory), then the float32 arrays back to back.
+FEATURE_BLOB_MAGIC = b"SBF"
+FEATURE_BLOB_VERSION = 1
+_BLOB_PREFIX = struct.Struct("<3sBI")
+
+
+# ── Analysis context ────────────────────────────────────────
+
+class AnalysisContext:
+    """Praat analysis objects for one Sound, computed lazily and memoised.
+
+    Several feature groups need the same analysis (pitch feeds the pitch
+    stats, the voiced fraction and the jitter/shimmer point process), so the
+    ``_extract_*`` helpers share one context and each Praat analysis runs at
+    most once per Sound.
+    """
+
+    def __init__(self, snd: parselmouth.Sound, profile: AnalysisProfile = PROFILES[DEFAULT_PROFILE],
+                 *, first_pass_step: float = QUICK_PITCH_STEP):
+        self.snd = snd
+        self.profile = profile
+        self.first_pass_step = first_pass_step
+
+    @cached_property
+    def pitch_range(self) -> tuple[float, float]:
+        return estimate_pitch_range(self.snd, time_step=self.first_pass_step)
+
+    @cached_property
+    def pitch(self) -> parselmouth.Pitch:
+        # Praat's automatic step depends on the floor; pin it to what the
+        # broad range gives so contours keep the same frame rate.
+        time_step = self.profile.time_step or 0.75 / PITCH_FLOOR
+        floor, ceiling = self.pitch_range
+        return call(self.snd, "To Pitch", time_step, floor, ceiling)
+
+    @cached_property
+    def formant(self) -> parselmouth.Formant:
+        return call(self.snd, "To Formant (burg)", self.profile.time_step, 5, 5500, 0.025, 50)
+
+    @cached_property
+    def intensity(self) -> parselmouth.Intensity:
+        return call(self.snd, "To Intensity", PITCH_FLOOR, self.profile.time_step)
+
+    def contour(self, values: np.ndarray) -> list[float]:
+        """*values* as a list, decimated to the profile's point limit."""
+        limit = self.profile.max_contour_points
+        if limit and len(values) > limit:
+            idx = np.linspace(0, len(values) - 1, limit).round().astype(int)
+            values = values[idx]
+        return values.tolist()
+
+    @cached_property
+    def point_process(self) -> parselmouth.Data:
+        # Glottal pulses from the Pitch above instead of letting
+        # "To PointProcess (periodic, cc)" run its own pitch analysis.
+        return call([self.snd, self.pitch], "To PointProcess (cc)")
+
 
 # ── Public API ──────────────────────────────────────────────
 
-def extract_all_praat_features(audio_path: str | Path) -> dict[str, Any]:
-    """Extract a complete feature dict from a WAV file.
+def extract_all_praat_features(audio_path: str | Path, profile: str | None = None) -> dict[str, Any]:
+    """Extract a complete feature dict from a (reference) WAV file.
+
+    *profile* names an entry of :data:`PROFILES` (default
+    :data:`DEFAULT_PROFILE`). The pitch range is estimated with a
+    full-resolution first pass. Returns a JSON-serialisable dict with keys:
+        pitch, formants, intensity, duration, voice_quality, mfcc
+    """
+    samples, sample_rate = _read_mono(audio_path)
+    return extract_features_from_samples(samples, sample_rate, profile, first_pass_step=0.0)
+
+
+def extract_features_from_samples(
+    samples: np.ndarray, sample_rate: int, profile: str | None = None,
+    *, first_pass_step: float = QUICK_PITCH_STEP,
+) -> dict[str, Any]:
+    """Same as :func:`extract_all_praat_features` for an in-memory mono signal.
 
-    Returns a JSON-serialisable dict with keys:
-        pitch, formants, intensity, duration, voice_quality
+    The Praat Sound and the MFCCs are both built from *samples*, so the audio
+    is never written to or re-read from disk. By default the pitch range
+    comes from a quick, coarse first pass (:data:`QUICK_PITCH_STEP`).
     """
-    snd = parselmouth.Sound(str(audio_path))
+    snd = parselmouth.Sound(samples, sampling_frequency=sample_rate)
+    ctx = AnalysisContext(snd, get_profile(profile), first_pass_step=first_pass_step)
     return {
-        "pitch": _extract_pitch(snd),
-        "formants": _extract_formants(snd),
-        "intensity": _extract_intensity(snd),
-        "duration": _extract_duration(snd),
-        "voice_quality": _extract_voice_quality(snd),
-        "mfcc": extract_mfcc_features(audio_path),
+        "pitch": _extract_pitch(ctx),
+        "formants": _extract_formants(ctx),
+        "intensity": _extract_intensity(ctx),
+        "duration": _extract_duration(ctx),
+        "voice_quality": _extract_voice_quality(ctx),
+        "mfcc": mfcc_from_samples(samples, sample_rate),
     }
 
 
+def estimate_pitch_range(snd: parselmouth.Sound, *, time_step: float = 0.0) -> tuple[float, float]:
+    """First pass of the two-pass pitch range estimate: ``(floor, ceiling)`` in Hz.
+
+    A narrower range lets "To Pitch" use shorter windows and fewer
+    candidates, and makes octave jumps outside the speaker's range
+    impossible. *time_step* 0 = Praat's automatic step.
+    """
+    try:
+        first_pass = call(snd, "To Pitch", time_step, PITCH_FLOOR, PITCH_CEILING)
+    except parselmouth.PraatError:
+        return float(PITCH_FLOOR), float(PITCH_CEILING)
+    f0 = first_pass.selected_array["frequency"]
+    voiced = f0[f0 > 0]
+    if len(voiced) < PITCH_RANGE_MIN_VOICED:
+        return float(PITCH_FLOOR), float(PITCH_CEILING)
+
+    low, high = np.quantile(voiced, PITCH_RANGE_QUANTILES)
+    floor = max(PITCH_FLOOR, low * PITCH_RANGE_FACTORS[0])
+    ceiling = min(PITCH_CEILING, high * PITCH_RANGE_FACTORS[1])
+    return float(floor), float(ceiling)
+
+
 def extract_mfcc_features(audio_path: str | Path, *, n_mfcc: int = 13) -> dict[str, Any]:
-    """Extract MFCC summary features using librosa.
+    """Extract MFCC summary features from a WAV file.
 
     Returns a JSON-serialisable dict:
         {"mean": [...], "std": [...], "n_mfcc": int}
     """
     try:
-        y, sr = librosa.load(str(audio_path), sr=None, mono=True)
-        if y is None or len(y) == 0:
+        samples, sample_rate = _read_mono(audio_path)
+    except Exception:
+        return {"mean": [], "std": [], "n_mfcc": n_mfcc}
+    return mfcc_from_samples(samples, sample_rate, n_mfcc=n_mfcc)
+
+
+def mfcc_from_samples(samples: np.ndarray, sample_rate: int, *, n_mfcc: int = 13) -> dict[str, Any]:
+    """MFCC summary (per-coefficient mean/std) of an in-memory mono signal."""
+    try:
+        if samples is None or len(samples) == 0:
             return {"mean": [], "std": [], "n_mfcc": n_mfcc}
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
+        mfcc = compute_mfcc(samples, sample_rate, n_mfcc=n_mfcc)
         mean = np.mean(mfcc, axis=1)
         std = np.std(mfcc, axis=1)
         return {"mean": mean.astype(float).tolist(), "std": std.astype(float).tolist(), "n_mfcc": n_mfcc}
@@ -50,64 +227,215 @@ def extract_mfcc_features(audio_path: str | Path, *, n_mfcc: int = 13) -> dict[s
         return {"mean": [], "std": [], "n_mfcc": n_mfcc}
 
 
+def compute_mfcc(samples: np.ndarray, sample_rate: int, *, n_mfcc: int = 13) -> np.ndarray:
+    """MFCC matrix (n_mfcc × frames) of a mono signal, in NumPy only.
+
+    Reproduces ``librosa.feature.mfcc(y=samples, sr=sample_rate,
+    n_mfcc=n_mfcc)`` with its defaults: centred zero-padded STFT (2048-point
+    periodic Hann window, hop 512), power spectrum, 128 Slaney-normalised
+    mel bands, dB with an 80 dB floor, orthonormal DCT-II. The filterbank and
+    DCT matrix are built once per (sample rate, n_fft, n_mfcc).
+    """
+    y = np.asarray(samples, dtype=np.float32)
+    pad = MFCC_N_FFT // 2
+    y = np.pad(y, pad, mode="constant")
+    if len(y) < MFCC_N_FFT:
+        y = np.pad(y, (0, MFCC_N_FFT - len(y)), mode="constant")
+
+    frames = np.lib.stride_tricks.sliding_window_view(y, MFCC_N_FFT)[::MFCC_HOP_LENGTH]
+    spectrum = np.fft.rfft(frames * _hann_window(MFCC_N_FFT), axis=1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2           # (frames, 1 + n_fft/2)
+
+    mel = _mel_filterbank(sample_rate, MFCC_N_FFT, MFCC_N_MELS) @ power.T
+    log_mel = 10.0 * np.log10(np.maximum(mel, 1e-10))
+    log_mel = np.maximum(log_mel, log_mel.max() - MFCC_TOP_DB)
+    return _dct_matrix(n_mfcc, MFCC_N_MELS) @ log_mel
+
+
+@lru_cache(maxsize=4)
+def _hann_window(n_fft: int) -> np.ndarray:
+    """Periodic Hann window (``scipy.signal.get_window("hann", n, fftbins=True)``)."""
+    window = 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n_fft) / n_fft)
+    window.setflags(write=False)
+    return window
+
+
+def _hz_to_mel(freqs: np.ndarray) -> np.ndarray:
+    """Slaney mel scale: linear below 1 kHz, logarithmic above."""
+    freqs = np.asarray(freqs, dtype=np.float64)
+    mels = freqs / (200.0 / 3)
+    log_region = freqs >= 1000.0
+    mels[log_region] = 15.0 + np.log(freqs[log_region] / 1000.0) / (np.log(6.4) / 27.0)
+    return mels
+
+
+def _mel_to_hz(mels: np.ndarray) -> np.ndarray:
+    mels = np.asarray(mels, dtype=np.float64)
+    freqs = mels * (200.0 / 3)
+    log_region = mels >= 15.0
+    freqs[log_region] = 1000.0 * np.exp((np.log(6.4) / 27.0) * (mels[log_region] - 15.0))
+    return freqs
+
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Slaney-normalised triangular mel filters, shape (n_mels, 1 + n_fft/2)."""
+    fft_freqs = np.linspace(0.0, sample_rate / 2.0, 1 + n_fft // 2)
+    mel_edges = _mel_to_hz(np.linspace(_hz_to_mel(np.array([0.0]))[0],
+                                       _hz_to_mel(np.array([sample_rate / 2.0]))[0],
+                                       n_mels + 2))
+    widths = np.diff(mel_edges)
+    ramps = mel_edges[:, None] - fft_freqs[None, :]
+    lower = -ramps[:-2] / widths[:-1, None]
+    upper = ramps[2:] / widths[1:, None]
+    weights = np.maximum(0.0, np.minimum(lower, upper))
+    weights *= (2.0 / (mel_edges[2:] - mel_edges[:-2]))[:, None]
+    weights.setflags(write=False)
+    return weights
+
+
+@lru_cache(maxsize=8)
+def _dct_matrix(n_mfcc: int, n_mels: int) -> np.ndarray:
+    """First *n_mfcc* rows of the orthonormal DCT-II over *n_mels* inputs."""
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    basis.setflags(write=False)
+    return basis
+
+
+def _read_mono(audio_path: str | Path) -> tuple[np.ndarray, int]:
+    """Read an audio file once as mono float32 (channels averaged)."""
+    samples, sample_rate = sf.read(str(audio_path), dtype="float32", always_2d=True)
+    return samples.mean(axis=1, dtype=np.float32), sample_rate
+
+
+# ── Binary storage format ───────────────────────────────────
+
+def encode_features(features: dict[str, Any]) -> bytes:
+    """Serialise a feature dict to the compact binary blob format.
+
+    Lists/arrays of numbers (contours, MFCC vectors) are stored as
+    little-endian float32; everything else goes into a small JSON header.
+    """
+    groups: dict[str, Any] = {}
+    arrays: list[list] = []
+    payload: list[bytes] = []
+    for group, values in features.items():
+        if not isinstance(values, dict):
+            groups[group] = values
+            continue
+        scalars = {}
+        for key, value in values.items():
+            if isinstance(value, (list, tuple, np.ndarray)):
+                arr = np.asarray(value, dtype="<f4").ravel()
+                arrays.append([group, key, len(arr)])
+                payload.append(arr.tobytes())
+            else:
+                scalars[key] = value
+        groups[group] = scalars
+
+    header = json.dumps(
+        {"schema": FEATURE_SCHEMA_VERSION, "groups": groups, "arrays": arrays},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    prefix = _BLOB_PREFIX.pack(FEATURE_BLOB_MAGIC, FEATURE_BLOB_VERSION, len(header))
+    return b"".join([prefix, header, *payload])
+
+
+def decode_features(blob: bytes) -> dict[str, Any]:
+    """Inverse of :func:`encode_features`; arrays come back as float32 NumPy.
+
+    Raises ValueError for anything that is not a blob of a supported
+    format and feature schema version.
+    """
+    if len(blob) < _BLOB_PREFIX.size:
+        raise ValueError("Feature blob is truncated")
+    magic, version, header_len = _BLOB_PREFIX.unpack_from(blob)
+    if magic != FEATURE_BLOB_MAGIC:
+        raise ValueError("Not a feature blob")
+    if version != FEATURE_BLOB_VERSION:
+        raise ValueError(f"Unsupported feature blob version {version}")
+
+    offset = _BLOB_PREFIX.size
+    header = json.loads(bytes(blob[offset:offset + header_len]))
+    if header.get("schema") != FEATURE_SCHEMA_VERSION:
+        raise ValueError(f"Feature blob has schema {header.get('schema')}, expected {FEATURE_SCHEMA_VERSION}")
+    offset += header_len
+
+    features = header["groups"]
+    for group, key, length in header["arrays"]:
+        end = offset + 4 * length
+        if end > len(blob):
+            raise ValueError("Feature blob is truncated")
+        features[group][key] = np.frombuffer(blob, dtype="<f4", count=length, offset=offset)
+        offset = end
+    return features
+
+
 # ── Internal helpers ────────────────────────────────────────
 
-def _extract_pitch(snd: parselmouth.Sound) -> dict:
-    """Extract pitch (F0) statistics."""
+def _extract_pitch(ctx: AnalysisContext) -> dict:
+    """Extract pitch (F0) statistics and the analysis range they came from."""
+    floor, ceiling = ctx.pitch_range
+    empty = {
+        "mean": 0.0,
+        "std": 0.0,
+        "min": 0.0,
+        "max": 0.0,
+        "values": [],
+        "floor": floor,
+        "ceiling": ceiling,
+    }
     try:
-        pitch_obj = call(snd, "To Pitch", 0.0, 75, 600)
+        pitch_obj = ctx.pitch
     except parselmouth.PraatError:
-        return {
-            "mean": 0.0,
-            "std": 0.0,
-            "min": 0.0,
-            "max": 0.0,
-            "values": [],
-        }
+        return empty
     pitch_values = pitch_obj.selected_array["frequency"]
     voiced = pitch_values[pitch_values > 0]
 
     if len(voiced) == 0:
-        return {
-            "mean": 0.0,
-            "std": 0.0,
-            "min": 0.0,
-            "max": 0.0,
-            "values": [],
-        }
+        return empty
     return {
         "mean": float(np.mean(voiced)),
         "std": float(np.std(voiced)),
         "min": float(np.min(voiced)),
         "max": float(np.max(voiced)),
-        "values": voiced.tolist(),
+        "values": ctx.contour(voiced),
+        "floor": floor,
+        "ceiling": ceiling,
     }
 
 
-def _extract_formants(snd: parselmouth.Sound) -> dict:
-    """Extract F1–F3 mean values across the signal."""
-    formant_obj = call(snd, "To Formant (burg)", 0.0, 5, 5500, 0.025, 50)
-    duration = snd.duration
-    n_frames = call(formant_obj, "Get number of frames")
+def _extract_formants(ctx: AnalysisContext) -> dict:
+    """Extract F1–F3 tracks and statistics across the signal.
 
-    formants: dict[str, list[float]] = {"f1": [], "f2": [], "f3": []}
+    Each track comes out of Praat in one "To Matrix" call (one value per
+    frame, 0 where the frame has fewer formants) rather than a
+    "Get value at time" round trip per frame and formant.
 
-    for i in range(1, n_frames + 1):
-        t = call(formant_obj, "Get time from frame number", i)
-        if t < 0 or t > duration:
-            continue
-        for fi, key in enumerate(("f1", "f2", "f3"), start=1):
-            val = call(formant_obj, "Get value at time", fi, t, "Hertz", "Linear")
-            if not np.isnan(val):
-                formants[key].append(float(val))
+    ``f*_values`` drop each formant's undefined frames separately, so they
+    can differ in length. ``f*_joint`` keep only the frames where all three
+    are defined, so row *i* of the three tracks is the same frame: the
+    input for joint F1/F2/F3 alignment.
+    """
+    formant_obj = ctx.formant
+    times = formant_obj.ts()
+    in_range = (times >= 0) & (times <= ctx.snd.duration)
+
+    tracks = [call(formant_obj, "To Matrix", fi).values[0][in_range] for fi in (1, 2, 3)]
+    valid = [np.isfinite(track) & (track > 0) for track in tracks]
+    all_defined = valid[0] & valid[1] & valid[2]
 
     result: dict[str, Any] = {}
-    for key in ("f1", "f2", "f3"):
-        vals = formants[key]
-        if vals:
+    for key, track, ok in zip(("f1", "f2", "f3"), tracks, valid):
+        result[f"{key}_joint"] = ctx.contour(track[all_defined])
+        vals = track[ok]
+        if len(vals):
             result[f"{key}_mean"] = float(np.mean(vals))
             result[f"{key}_std"] = float(np.std(vals))
-            result[f"{key}_values"] = vals
+            result[f"{key}_values"] = ctx.contour(vals)
         else:
             result[f"{key}_mean"] = 0.0
             result[f"{key}_std"] = 0.0
@@ -115,10 +443,9 @@ def _extract_formants(snd: parselmouth.Sound) -> dict:
     return result
 
 
-def _extract_intensity(snd: parselmouth.Sound) -> dict:
+def _extract_intensity(ctx: AnalysisContext) -> dict:
     """Extract intensity (dB) statistics."""
-    intensity_obj = call(snd, "To Intensity", 75, 0.0)
-    intensity_values = intensity_obj.values[0]
+    intensity_values = ctx.intensity.values[0]
     valid = intensity_values[~np.isnan(intensity_values)]
 
     if len(valid) == 0:
@@ -128,17 +455,16 @@ def _extract_intensity(snd: parselmouth.Sound) -> dict:
         "std": float(np.std(valid)),
         "min": float(np.min(valid)),
         "max": float(np.max(valid)),
-        "values": valid.tolist(),
+        "values": ctx.contour(valid),
     }
 
 
-def _extract_duration(snd: parselmouth.Sound) -> dict:
+def _extract_duration(ctx: AnalysisContext) -> dict:
     """Extract duration-related features."""
-    total = snd.duration
+    total = ctx.snd.duration
 
-    # Voiced duration via pitch analysis
-    pitch_obj = call(snd, "To Pitch", 0.0, 75, 600)
-    pitch_values = pitch_obj.selected_array["frequency"]
+    # Voiced duration via the shared pitch analysis
+    pitch_values = ctx.pitch.selected_array["frequency"]
     voiced_frames = np.sum(pitch_values > 0)
     total_frames = len(pitch_values)
     voiced_fraction = voiced_frames / total_frames if total_frames > 0 else 0.0
@@ -149,13 +475,13 @@ def _extract_duration(snd: parselmouth.Sound) -> dict:
     }
 
 
-def _extract_voice_quality(snd: parselmouth.Sound) -> dict:
+def _extract_voice_quality(ctx: AnalysisContext) -> dict:
     """Extract jitter and shimmer as voice-quality indicators."""
     try:
-        point_process = call(snd, "To PointProcess (periodic, cc)", 75, 600)
+        point_process = ctx.point_process
         jitter = call(point_process, "Get jitter (local)", 0, 0, 0.0001, 0.02, 1.3)
         shimmer = call(
-            [snd, point_process],
+            [ctx.snd, point_process],
             "Get shimmer (local)",
             0, 0, 0.0001, 0.02, 1.3, 1.6,
         )
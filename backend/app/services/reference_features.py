@@ -0,0 +1,167 @@
+"""In-process cache of decoded reference features.
+
+Every pronunciation check needs the reference word's feature dict. Reading
+and ``json.loads``-ing it from SQLite on each request is wasted work for
+popular words, so decoded dicts — contours already converted to NumPy
+arrays — are kept in a bounded LRU cache.
+
+Entries are keyed by word id, analysis profile and
+:data:`FEATURE_SCHEMA_VERSION`, and carry
+the row's ``features_rev``. ``scripts/precompute_features.py`` bumps that
+column whenever it rewrites a row, so a stale entry is detected (and
+dropped) on the next lookup even though the script runs in another process.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+import numpy as np
+
+from app.config import settings
+from app.services.praat_analyzer import DEFAULT_PROFILE, FEATURE_SCHEMA_VERSION
+
+# Keys holding per-frame contours (or per-coefficient vectors), per group.
+ARRAY_KEYS = {
+    "pitch": ("values",),
+    "formants": ("f1_values", "f2_values", "f3_values", "f1_joint", "f2_joint", "f3_joint"),
+    "intensity": ("values",),
+    "mfcc": ("mean", "std"),
+}
+
+# Rough per-entry overhead of the dicts and scalars around the arrays.
+_ENTRY_OVERHEAD_BYTES = 2048
+
+
+def prepare_reference_features(features: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of *features* with every contour as a read-only array.
+
+    Arrays are float64 so scoring sees exactly the values it would have
+    computed from the JSON lists.
+    """
+    prepared = {}
+    for group, values in features.items():
+        if not isinstance(values, dict):
+            prepared[group] = values
+            continue
+        values = dict(values)
+        for key in ARRAY_KEYS.get(group, ()):
+            if key in values and values[key] is not None:
+                arr = np.array(values[key], dtype=np.float64)
+                arr.setflags(write=False)
+                values[key] = arr
+        prepared[group] = values
+    return prepared
+
+
+def feature_nbytes(features: dict[str, Any]) -> int:
+    """Approximate memory held by a prepared feature dict."""
+    total = _ENTRY_OVERHEAD_BYTES
+    for values in features.values():
+        if isinstance(values, dict):
+            total += sum(v.nbytes for v in values.values() if isinstance(v, np.ndarray))
+    return total
+
+
+class ReferenceFeatureCache:
+    """Bounded LRU of prepared reference features.
+
+    The budget is in bytes (see :func:`feature_nbytes`); least recently used
+    words are evicted first. Only touched from the event loop, so no locking.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(0, max_bytes)
+        self._entries: OrderedDict[tuple[int, str, int], tuple[int, dict, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, word_id: int, rev: int, profile: str = DEFAULT_PROFILE) -> dict[str, Any] | None:
+        """Cached *profile* features for *word_id* at row revision *rev*, or None."""
+        key = (word_id, profile, FEATURE_SCHEMA_VERSION)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != rev:
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, word_id: int, rev: int, features: dict[str, Any],
+            profile: str = DEFAULT_PROFILE) -> None:
+        """Store prepared *features* (see :func:`prepare_reference_features`)."""
+        key = (word_id, profile, FEATURE_SCHEMA_VERSION)
+        if key in self._entries:
+            self._drop(key)
+        size = feature_nbytes(features)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (rev, features, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, word_id: int) -> None:
+        """Forget *word_id* (every profile), e.g. after its row was rewritten in-process."""
+        for key in [k for k in self._entries if k[0] == word_id]:
+            self._drop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _drop(self, key: tuple[int, str, int]) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+class SingleFlight:
+    """Coalesce concurrent computations of the same key.
+
+    The first caller for a key starts ``fn()`` as its own task; callers that
+    arrive while it runs await that same task instead of starting another.
+    The task is shielded, so a caller that disconnects doesn't cancel the
+    work for the others. Once it finishes the key is forgotten, and the
+    result (or exception) is delivered to everyone who was waiting.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+
+reference_cache = ReferenceFeatureCache(settings.REFERENCE_CACHE_MAX_BYTES)
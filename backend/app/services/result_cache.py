@@ -0,0 +1,88 @@
+"""Memoised pronunciation results for repeated identical uploads.
+
+Clients retry on flaky networks and learners resubmit the same take, and
+each time the whole decode + Praat + scoring pipeline would run again. A
+result is fully determined by the uploaded bytes, the word, the reference
+features it was scored against and the scoring code, so those four make the
+cache key (together with the analysis profile); a hit skips decoding
+entirely.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from app.config import settings
+from app.services.feature_comparator import SCORING_VERSION
+from app.services.praat_analyzer import DEFAULT_PROFILE
+
+
+def result_key(raw_bytes: bytes, word_id: int, features_rev: int,
+               profile: str = DEFAULT_PROFILE) -> tuple:
+    """Cache key for scoring *raw_bytes* against word *word_id*."""
+    digest = hashlib.sha256(raw_bytes).hexdigest()
+    return (digest, word_id, features_rev, profile, SCORING_VERSION)
+
+
+class ResultCache:
+    """LRU of results with a time-to-live and an entry limit.
+
+    Expired entries are dropped when looked up; the least recently used
+    entry is evicted once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, *,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple, value: Any) -> None:
+        if self.max_entries == 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+result_cache = ResultCache(settings.RESULT_CACHE_MAX_ENTRIES, settings.RESULT_CACHE_TTL_SECONDS)
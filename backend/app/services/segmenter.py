@@ -0,0 +1,119 @@
+"""Vectorised silence detection on NumPy signals.
+
+Replaces ``pydub.silence.detect_nonsilent``, which slides a window over an
+AudioSegment in 1 ms steps and computes the RMS of every slice in Python.
+Here the energy envelope (a running sum of squared samples) is computed once
+per signal; the RMS of every window for any threshold / minimum-silence query
+then falls out of one vectorised difference.
+
+Results follow pydub's conventions — millisecond ``[start, end]`` ranges,
+1 ms seek step, overlapping silent windows merged — and match it to within a
+frame.
+"""
+
+import numpy as np
+
+
+class EnergyEnvelope:
+    """Energy envelope of one mono signal (full scale = 1.0).
+
+    Build it once, then ask :meth:`nonsilent_ranges` as many times as needed
+    with different thresholds, minimum silence lengths or sub-spans.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int):
+        x = np.asarray(samples, dtype=np.float64)
+        self.sample_rate = sample_rate
+        self.n_samples = len(x)
+        self.duration_ms = round(1000 * self.n_samples / sample_rate)
+        self._energy = np.concatenate(([0.0], np.cumsum(x * x)))
+
+    @classmethod
+    def from_segment(cls, audio) -> "EnergyEnvelope":
+        """Build from a pydub AudioSegment (multi-channel audio is averaged)."""
+        pcm = np.asarray(audio.get_array_of_samples(), dtype=np.float64)
+        if audio.channels > 1:
+            pcm = pcm.reshape(-1, audio.channels).mean(axis=1)
+        return cls(pcm / audio.max_possible_amplitude, audio.frame_rate)
+
+    @property
+    def dbfs(self) -> float:
+        """Overall RMS level in dBFS (``-inf`` for digital silence)."""
+        if self.n_samples == 0 or self._energy[-1] <= 0.0:
+            return float("-inf")
+        return float(10 * np.log10(self._energy[-1] / self.n_samples))
+
+    def nonsilent_ranges(
+        self,
+        silence_thresh: float,
+        min_silence_len: int,
+        start_ms: int = 0,
+        end_ms: int | None = None,
+    ) -> list[list[int]]:
+        """Millisecond ``[start, end]`` ranges of non-silent audio.
+
+        Equivalent to ``detect_nonsilent(audio[start_ms:end_ms],
+        min_silence_len, silence_thresh)``, except that the returned ranges
+        are absolute positions in the full signal.
+        """
+        silent = self._silent_ranges(silence_thresh, min_silence_len, start_ms, end_ms)
+        seg_len = self._span(start_ms, end_ms)[2]
+
+        if not silent:
+            return [[start_ms, start_ms + seg_len]]
+        if silent[0] == [0, seg_len]:
+            return []
+
+        ranges = []
+        prev_end = 0
+        for s, e in silent:
+            ranges.append([prev_end, s])
+            prev_end = e
+        if prev_end != seg_len:
+            ranges.append([prev_end, seg_len])
+        if ranges[0] == [0, 0]:
+            ranges.pop(0)
+        return [[start_ms + s, start_ms + e] for s, e in ranges]
+
+    # ── Internal helpers ────────────────────────────────────
+
+    def _span(self, start_ms: int, end_ms: int | None) -> tuple[int, int, int]:
+        """First sample, last sample (exclusive) and length in ms of a sub-span."""
+        end_ms = self.duration_ms if end_ms is None else min(end_ms, self.duration_ms)
+        start_ms = min(start_ms, end_ms)
+        s0 = min(int(start_ms * self.sample_rate / 1000), self.n_samples)
+        s1 = min(int(end_ms * self.sample_rate / 1000), self.n_samples)
+        return s0, s1, round(1000 * (s1 - s0) / self.sample_rate)
+
+    def _silent_ranges(
+        self,
+        silence_thresh: float,
+        min_silence_len: int,
+        start_ms: int,
+        end_ms: int | None,
+    ) -> list[list[int]]:
+        """Silent ``[start, end]`` ranges in ms, relative to the sub-span."""
+        s0, s1, seg_len = self._span(start_ms, end_ms)
+        if seg_len < min_silence_len:
+            return []
+
+        # Every window [i, i + min_silence_len) ms with a 1 ms step.
+        starts = np.arange(0, seg_len - min_silence_len + 1)
+        lo = s0 + (starts * self.sample_rate / 1000).astype(np.int64)
+        hi = s0 + ((starts + min_silence_len) * self.sample_rate / 1000).astype(np.int64)
+        # Windows running past the data are zero-padded (as pydub does), so
+        # the energy is clipped but the sample count is not.
+        energy = self._energy[np.minimum(hi, s1)] - self._energy[np.minimum(lo, s1)]
+        count = np.maximum(hi - lo, 1)
+        rms = np.sqrt(np.maximum(energy, 0.0) / count)
+
+        threshold = 10 ** (silence_thresh / 20)
+        silence_starts = starts[rms <= threshold]
+        if len(silence_starts) == 0:
+            return []
+
+        # Silent windows closer than min_silence_len overlap: merge them.
+        breaks = np.flatnonzero(np.diff(silence_starts) > min_silence_len)
+        firsts = silence_starts[np.concatenate(([0], breaks + 1))]
+        lasts = silence_starts[np.concatenate((breaks, [len(silence_starts) - 1]))]
+        return [[int(a), int(b) + min_silence_len] for a, b in zip(firsts, lasts)]
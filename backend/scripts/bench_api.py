@@ -0,0 +1,121 @@
+"""Benchmark a pooled route: per-request vs pooled SQLite connections.
+
+Drives the app in-process (httpx ASGI transport, no network) with a fixed
+number of concurrent clients and reports requests/second for word search,
+which still queries the database on every call (the catalog and audio
+routes are served from memory). First every request opens and closes its
+own aiosqlite connection, as before the pool existed, then the same
+requests borrow from the connection pool.
+
+Usage:
+    cd backend
+    python -m scripts.bench_api [--requests 2000] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import aiosqlite
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.database import DB_PATH, db_pool
+from app.main import app
+from app.routes import words as words_routes
+from app.services.catalog import catalog
+
+
+class PerRequestConnections:
+    """Stands in for ``db_pool``: one new connection (and thread) per use."""
+
+    @asynccontextmanager
+    async def connection(self):
+        db = await aiosqlite.connect(DB_PATH)
+        db.row_factory = aiosqlite.Row
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
+def endpoints() -> list[str]:
+    """Search requests built from the first stored words and translations."""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        rows = conn.execute("SELECT word_lb, translation_en FROM words ORDER BY id LIMIT 2").fetchall()
+    finally:
+        conn.close()
+    terms = [term for row in rows for term in row if term]
+    return [f"/api/words/search?q={term[:3]}" for term in terms]
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> float:
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            response = await client.get(path)
+            response.raise_for_status()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - t0)
+
+
+async def run(paths: list[str], requests: int, concurrency: int, pooled: bool) -> dict[str, float]:
+    words_routes.db_pool = db_pool if pooled else PerRequestConnections()
+    if pooled:
+        await db_pool.open()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path in paths:  # warm-up
+                (await client.get(path)).raise_for_status()
+            return {path: await measure(client, path, requests, concurrency) for path in paths}
+    finally:
+        await catalog.close()
+        if pooled:
+            await db_pool.close()
+        words_routes.db_pool = db_pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API requests/second")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    if not DB_PATH.is_file():
+        print(f"[FAIL] Database not found: {DB_PATH} (run scripts.import_csv first)")
+        return
+    paths = endpoints()
+    if not paths:
+        print("[FAIL] No words to search for (run scripts.import_csv first)")
+        return
+
+    legacy = asyncio.run(run(paths, args.requests, args.concurrency, pooled=False))
+    pooled = asyncio.run(run(paths, args.requests, args.concurrency, pooled=True))
+
+    print(f"{args.requests} requests per endpoint, {args.concurrency} concurrent clients\n")
+    print(f"{'Endpoint':<40} {'per-request':>12} {'pooled':>9} {'speedup':>8}")
+    print("-" * 72)
+    for path in paths:
+        print(f"  {path:<38} {legacy[path]:10.0f}/s {pooled[path]:7.0f}/s {pooled[path] / legacy[path]:7.1f}x")
+
+    total_legacy = len(paths) / sum(1 / legacy[p] for p in paths)
+    total_pooled = len(paths) / sum(1 / pooled[p] for p in paths)
+    print(f"\n[OK] Mean throughput: {total_legacy:.0f} req/s per-request connections, "
+          f"{total_pooled:.0f} req/s pooled ({total_pooled / total_legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the vectorised DTW engine against the original Python loop.
+
+Prints per-call latency for increasing contour lengths, for the legacy
+double loop, the unconstrained vectorised DTW and a Sakoe-Chiba banded run,
+plus the largest distance drift versus the legacy result.
+
+Usage:
+    cd backend
+    python -m scripts.bench_dtw [--lengths 50 100 200 400 800] [--band 20]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.dtw import dtw_distance
+
+LEGACY_MAX_LEN = 400  # the Python loop gets painfully slow beyond this
+
+
+def legacy_dtw(seq_a, seq_b) -> float:
+    """The pre-vectorisation implementation, kept here as the baseline."""
+    n, m = len(seq_a), len(seq_b)
+    a = np.array(seq_a, dtype=np.float64)
+    b = np.array(seq_b, dtype=np.float64)
+    dtw = np.full((n + 1, m + 1), np.inf)
+    dtw[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost = abs(a[i - 1] - b[j - 1])
+            dtw[i, j] = cost + min(dtw[i - 1, j], dtw[i, j - 1], dtw[i - 1, j - 1])
+    return float(dtw[n, m] / max(n, m))
+
+
+def _time(fn, *args, repeat: int, **kwargs) -> tuple[float, float]:
+    """Return (best seconds per call, result)."""
+    best = float("inf")
+    result = 0.0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DTW implementations")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[50, 100, 200, 400, 800])
+    parser.add_argument("--band", type=int, default=20, help="Sakoe-Chiba radius for the banded run")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'frames':>8} {'legacy ms':>10} {'numpy ms':>10} {'band ms':>10} {'speedup':>8} {'drift':>10} {'band drift':>11}")
+    print("-" * 72)
+
+    for n in args.lengths:
+        # Pitch-like contours of slightly different lengths (user vs reference).
+        a = 120 + np.cumsum(rng.standard_normal(n))
+        b = 125 + np.cumsum(rng.standard_normal(int(n * 1.2)))
+
+        t_vec, d_vec = _time(dtw_distance, a, b, repeat=args.repeat)
+        t_band, d_band = _time(dtw_distance, a, b, band=args.band, repeat=args.repeat)
+
+        if n <= LEGACY_MAX_LEN:
+            t_old, d_old = _time(legacy_dtw, a, b, repeat=1)
+            legacy = f"{t_old * 1e3:10.1f}"
+            speedup = f"{t_old / t_vec:7.0f}x"
+            drift = f"{abs(d_vec - d_old):10.2e}"
+            band_drift = f"{abs(d_band - d_old):11.3f}"
+        else:
+            legacy, speedup, drift, band_drift = f"{'-':>10}", f"{'-':>8}", f"{'-':>10}", f"{'-':>11}"
+
+        print(f"{n:>8} {legacy} {t_vec * 1e3:10.2f} {t_band * 1e3:10.2f} {speedup} {drift} {band_drift}")
+
+    print(f"\n[OK] Reference length = 1.2 × user length; band radius = {args.band} frames")
+
+
+if __name__ == "__main__":
+    main()
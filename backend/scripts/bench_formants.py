@@ -0,0 +1,94 @@
+"""Benchmark bulk formant extraction against the per-frame Praat loop.
+
+Runs both implementations on every WAV in the reference audio directory,
+checks that they produce identical tracks and reports timings.
+
+Usage:
+    cd backend
+    python -m scripts.bench_formants [--audio-dir reference_audio] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import parselmouth
+from parselmouth.praat import call
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.praat_analyzer import AnalysisContext, _extract_formants
+
+DEFAULT_AUDIO = BACKEND_DIR / "reference_audio"
+
+
+def legacy_formants(snd: parselmouth.Sound) -> dict[str, list[float]]:
+    """The pre-bulk implementation: four call() round trips per frame."""
+    formant_obj = call(snd, "To Formant (burg)", 0.0, 5, 5500, 0.025, 50)
+    duration = snd.duration
+    n_frames = call(formant_obj, "Get number of frames")
+    formants: dict[str, list[float]] = {"f1": [], "f2": [], "f3": []}
+    for i in range(1, n_frames + 1):
+        t = call(formant_obj, "Get time from frame number", i)
+        if t < 0 or t > duration:
+            continue
+        for fi, key in enumerate(("f1", "f2", "f3"), start=1):
+            val = call(formant_obj, "Get value at time", fi, t, "Hertz", "Linear")
+            if not np.isnan(val):
+                formants[key].append(float(val))
+    return formants
+
+
+def _best_of(fn, snd, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(snd)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark formant extraction")
+    parser.add_argument("--audio-dir", type=Path, default=DEFAULT_AUDIO)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    files = sorted(args.audio_dir.glob("*.wav"))
+    if not files:
+        print(f"[FAIL] No .wav files found in {args.audio_dir}")
+        return
+
+    print(f"{'File':<25} {'frames':>7} {'loop ms':>9} {'bulk ms':>9} {'speedup':>8}  match")
+    print("-" * 70)
+
+    total_old = total_new = 0.0
+    mismatches = 0
+    for f in files:
+        snd = parselmouth.Sound(str(f))
+        t_old, old = _best_of(legacy_formants, snd, args.repeat)
+        t_new, new = _best_of(lambda s: _extract_formants(AnalysisContext(s)), snd, args.repeat)
+        total_old += t_old
+        total_new += t_new
+
+        match = all(
+            len(old[k]) == len(new[f"{k}_values"])
+            and np.allclose(old[k], new[f"{k}_values"])
+            for k in ("f1", "f2", "f3")
+        )
+        mismatches += not match
+        print(f"  {f.name:<23} {len(old['f1']):>7} {t_old * 1e3:9.1f} {t_new * 1e3:9.1f} "
+              f"{t_old / t_new:7.1f}x  {'yes' if match else 'NO'}")
+
+    print(f"\n[OK] {len(files)} files: loop {total_old:.2f}s, bulk {total_new:.2f}s "
+          f"({total_old / total_new:.1f}x faster)")
+    if mismatches:
+        print(f"[WARN] {mismatches} file(s) produced different tracks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark the NumPy MFCC engine against librosa.
+
+Measures cold start (a fresh interpreter importing the module and computing
+one MFCC, as a new analysis worker would) and per-call time on every WAV in
+the reference audio directory, and checks that both produce the same
+coefficients. Needs librosa, which is a dev-only dependency.
+
+Usage:
+    cd backend
+    python -m scripts.bench_mfcc [--audio-dir reference_audio] [--repeat 5]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.praat_analyzer import compute_mfcc
+
+DEFAULT_AUDIO = BACKEND_DIR / "reference_audio"
+TOLERANCE = 1e-3
+
+_COLD_START = {
+    "librosa": (
+        "import numpy as np, librosa; "
+        "librosa.feature.mfcc(y=np.zeros(22050, dtype=np.float32), sr=22050, n_mfcc=13)"
+    ),
+    "numpy": (
+        "import numpy as np; from app.services.praat_analyzer import compute_mfcc; "
+        "compute_mfcc(np.zeros(22050, dtype=np.float32), 22050, n_mfcc=13)"
+    ),
+}
+
+
+def legacy_mfcc(samples: np.ndarray, sr: int) -> np.ndarray:
+    """The previous implementation: librosa.feature.mfcc with its defaults."""
+    import librosa
+
+    return librosa.feature.mfcc(y=samples, sr=sr, n_mfcc=13)
+
+
+def cold_start(code: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, check=True)
+    return time.perf_counter() - t0
+
+
+def _best_of(fn, samples, sr, repeat: int) -> tuple[float, np.ndarray]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(samples, sr)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MFCC extraction")
+    parser.add_argument("--audio-dir", type=Path, default=DEFAULT_AUDIO)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        import librosa  # noqa: F401
+    except ImportError:
+        print("[FAIL] librosa is not installed (pip install -r requirements.txt)")
+        return
+
+    files = sorted(args.audio_dir.glob("*.wav"))
+    if not files:
+        print(f"[FAIL] No .wav files found in {args.audio_dir}")
+        return
+
+    print("Cold start (new interpreter: import + first MFCC)")
+    cold = {name: cold_start(code) for name, code in _COLD_START.items()}
+    for name, seconds in cold.items():
+        print(f"  {name:<8} {seconds * 1e3:8.0f} ms")
+
+    print(f"\n{'File':<25} {'frames':>7} {'librosa ms':>11} {'numpy ms':>9} {'speedup':>8}  max diff")
+    print("-" * 75)
+
+    total_old = total_new = 0.0
+    mismatches = 0
+    for f in files:
+        samples, sr = sf.read(f, dtype="float32", always_2d=True)
+        samples = samples.mean(axis=1)
+        t_old, old = _best_of(legacy_mfcc, samples, sr, args.repeat)
+        t_new, new = _best_of(lambda y, s: compute_mfcc(y, s, n_mfcc=13), samples, sr, args.repeat)
+        total_old += t_old
+        total_new += t_new
+
+        diff = float(np.max(np.abs(old - new))) if old.shape == new.shape else float("inf")
+        mismatches += diff > TOLERANCE
+        print(f"  {f.name:<23} {old.shape[1]:>7} {t_old * 1e3:11.2f} {t_new * 1e3:9.2f} "
+              f"{t_old / t_new:7.1f}x  {diff:.1e}")
+
+    print(f"\n[OK] Cold start: librosa {cold['librosa']:.2f}s, numpy {cold['numpy']:.2f}s "
+          f"({cold['librosa'] / cold['numpy']:.1f}x faster)")
+    print(f"[OK] {len(files)} files: librosa {total_old * 1e3:.1f} ms, numpy {total_new * 1e3:.1f} ms "
+          f"({total_old / total_new:.1f}x faster)")
+    if mismatches:
+        print(f"[WARN] {mismatches} file(s) differ by more than {TOLERANCE}")
+
+
+if __name__ == "__main__":
+    main()
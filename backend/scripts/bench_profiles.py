@@ -0,0 +1,107 @@
+"""Compare analysis profiles: latency and score drift.
+
+Every WAV in the audio directory serves both as a reference and as a user
+take, and each take is scored against each reference under every profile
+(user and reference features from the same profile, as in the API). Reports
+the per-take extraction and scoring time, and how far each profile's scores
+drift from the default profile's.
+
+Usage:
+    cd backend
+    python -m scripts.bench_profiles [--audio-dir reference_audio] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.audio_processor import SAMPLE_RATE, decode_upload, preprocess_samples
+from app.services.feature_comparator import calculate_weighted_score
+from app.services.praat_analyzer import (
+    DEFAULT_PROFILE,
+    PROFILES,
+    extract_all_praat_features,
+    extract_features_from_samples,
+)
+from app.services.reference_features import prepare_reference_features
+
+DEFAULT_AUDIO = BACKEND_DIR / "reference_audio"
+
+
+def _best_of(fn, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def run_profile(profile: str, files: list[Path], takes: dict[str, np.ndarray], repeat: int) -> dict:
+    refs = {f.name: prepare_reference_features(extract_all_praat_features(f, profile)) for f in files}
+    extract_times = []
+    score_times = []
+    scores = {}
+    for take_name, samples in takes.items():
+        t_extract, user = _best_of(
+            lambda: extract_features_from_samples(samples, SAMPLE_RATE, profile), repeat
+        )
+        extract_times.append(t_extract)
+        for ref_name, ref in refs.items():
+            t_score, result = _best_of(lambda: calculate_weighted_score(user, ref), repeat)
+            score_times.append(t_score)
+            scores[(take_name, ref_name)] = result["overall_score"]
+    return {
+        "extract_ms": 1e3 * float(np.mean(extract_times)),
+        "score_ms": 1e3 * float(np.mean(score_times)),
+        "scores": scores,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analysis profiles")
+    parser.add_argument("--audio-dir", type=Path, default=DEFAULT_AUDIO)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    files = sorted(args.audio_dir.glob("*.wav"))
+    if not files:
+        print(f"[FAIL] No .wav files found in {args.audio_dir}")
+        return
+
+    takes = {}
+    for f in files:
+        try:
+            takes[f.name] = preprocess_samples(decode_upload(f.read_bytes()))
+        except ValueError as exc:
+            print(f"[WARN] {f.name} skipped as a take: {exc}")
+
+    results = {name: run_profile(name, files, takes, args.repeat) for name in PROFILES}
+    base = results[DEFAULT_PROFILE]
+    pairs = len(base["scores"])
+
+    print(f"{len(takes)} takes x {len(files)} references = {pairs} comparisons per profile\n")
+    print(f"{'Profile':<10} {'extract ms':>11} {'score ms':>9} {'check ms':>9} {'speedup':>8} "
+          f"{'mean |Δ|':>9} {'max |Δ|':>8}")
+    print("-" * 72)
+    base_check = base["extract_ms"] + base["score_ms"]
+    for name, res in results.items():
+        check = res["extract_ms"] + res["score_ms"]
+        drift = np.abs([res["scores"][k] - base["scores"][k] for k in base["scores"]])
+        print(f"  {name:<8} {res['extract_ms']:11.1f} {res['score_ms']:9.2f} "
+              f"{check:9.1f} {base_check / check:7.1f}x "
+              f"{drift.mean():9.2f} {drift.max():8.2f}")
+
+    print(f"\n[OK] Drift is in score points (0–100) against the {DEFAULT_PROFILE!r} profile; "
+          f"check = one take extracted and scored against one reference")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark word listings on a synthetic catalog: full list vs pages.
+
+Builds a throw-away database with ``--words`` words spread over
+``--categories`` categories, serves it through the words router in-process
+(httpx ASGI transport, no network), and reports response size (plain and
+gzip) and median latency for the whole category, a first page, a first page
+limited to ``id,word_lb``, and a page deep in the category. Pages are cut
+from the in-memory catalog snapshot, so no SQL runs per request.
+
+Usage:
+    cd backend
+    python -m scripts.bench_words [--words 50000] [--categories 5] [--repeat 50]
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.database import SCHEMA_SQL
+from app.routes import words as words_routes
+from app.services.catalog import Catalog
+
+
+def build_db(path: Path, n_words: int, n_categories: int) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA_SQL)
+        conn.executemany(
+            "INSERT INTO categories (name, display_name) VALUES (?, ?)",
+            [(f"cat{c}", f"Category {c}") for c in range(n_categories)],
+        )
+        conn.executemany(
+            "INSERT INTO words (category_id, word_lb, translation_en, translation_fr, translation_de,"
+            " gender, audio_filename) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (i % n_categories + 1, f"Wuert{i}", f"word {i}", f"mot {i}", f"Wort {i}",
+                 "m" if i % 2 else None, f"w{i}.ogg")
+                for i in range(n_words)
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def measure(client: httpx.AsyncClient, url: str, repeat: int) -> tuple[float, int, int]:
+    """Median latency in ms, plain and gzip body sizes."""
+    plain = await client.get(url, headers={"Accept-Encoding": "identity"})
+    plain.raise_for_status()
+    zipped = await client.get(url, headers={"Accept-Encoding": "gzip"})
+    gzip_size = int(zipped.headers["content-length"])  # on the wire, before httpx decodes
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        (await client.get(url, headers={"Accept-Encoding": "gzip"})).raise_for_status()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1000, len(plain.content), gzip_size
+
+
+async def run(db_path: Path, n_words: int, n_categories: int, repeat: int) -> None:
+    catalog = Catalog(db_path, check_interval=3600)
+    words_routes.catalog = catalog
+    app = FastAPI()
+    app.include_router(words_routes.router, prefix="/api")
+
+    per_category = n_words // n_categories
+    base = "/api/categories/cat0/words"
+    snapshot = await catalog.snapshot()
+    deep_after = snapshot.word_list("cat0", "en")[per_category * 9 // 10].id
+    cases = [
+        ("whole category", base),
+        ("page of 50", f"{base}?limit=50"),
+        ("page of 50, id+word_lb", f"{base}?limit=50&fields=id,word_lb"),
+        ("page of 50 at 90%", f"{base}?limit=50&after_id={deep_after}"),
+    ]
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            t0 = time.perf_counter()
+            (await client.get(base)).raise_for_status()
+            first = (time.perf_counter() - t0) * 1000
+
+            print(f"{n_words} words, {per_category} per category; median of {repeat} requests\n")
+            print(f"{'Request':<26} {'latency':>10} {'plain':>11} {'gzip':>10}")
+            print("-" * 60)
+            for label, url in cases:
+                latency, plain, zipped = await measure(client, url, repeat)
+                print(f"  {label:<24} {latency:7.2f} ms {plain / 1024:8.1f} KB {zipped / 1024:7.1f} KB")
+            print(f"\n[OK] First (uncached) whole-category request: {first:.1f} ms")
+    finally:
+        await catalog.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark paginated word listings")
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--categories", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50, help="Requests per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        build_db(db_path, args.words, args.categories)
+        asyncio.run(run(db_path, args.words, args.categories, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
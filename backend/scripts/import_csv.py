@@ -39,10 +39,49 @@ CREATE TABLE IF NOT EXISTS words (
     translation_de      TEXT,
     gender              TEXT,
     praat_features_json TEXT,
+    praat_features_blob BLOB,
+    audio_hash          TEXT,
+    extractor_version   INTEGER,
+    features_rev        INTEGER NOT NULL DEFAULT 0,
     created_at          TEXT    DEFAULT (datetime('now'))
 );
 
+DROP INDEX IF EXISTS idx_words_category_id;
 CREATE INDEX IF NOT EXISTS idx_words_category ON words(category_id);
+
+CREATE TABLE IF NOT EXISTS word_features (
+    word_id             INTEGER NOT NULL REFERENCES words(id),
+    profile             TEXT    NOT NULL,
+    features_blob       BLOB    NOT NULL,
+    audio_hash          TEXT,
+    extractor_version   INTEGER,
+    features_rev        INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (word_id, profile)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+    word_lb, translation_en, translation_fr, translation_de,
+    content='words', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+    INSERT INTO words_fts(rowid, word_lb, translation_en, translation_fr, translation_de)
+    VALUES (new.id, new.word_lb, new.translation_en, new.translation_fr, new.translation_de);
+END;
+
+CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+    INSERT INTO words_fts(words_fts, rowid, word_lb, translation_en, translation_fr, translation_de)
+    VALUES ('delete', old.id, old.word_lb, old.translation_en, old.translation_fr, old.translation_de);
+END;
+
+CREATE TRIGGER IF NOT EXISTS words_fts_update
+AFTER UPDATE OF word_lb, translation_en, translation_fr, translation_de ON words BEGIN
+    INSERT INTO words_fts(words_fts, rowid, word_lb, translation_en, translation_fr, translation_de)
+    VALUES ('delete', old.id, old.word_lb, old.translation_en, old.translation_fr, old.translation_de);
+    INSERT INTO words_fts(rowid, word_lb, translation_en, translation_fr, translation_de)
+    VALUES (new.id, new.word_lb, new.translation_en, new.translation_fr, new.translation_de);
+END;
 """
 
 
@@ -58,6 +97,7 @@ def import_csv(csv_path: Path, db_path: Path, audio_dir: Path, *, clean: bool =
     conn.executescript(SCHEMA_SQL)
 
     if clean:
+        conn.execute("DELETE FROM word_features")
         conn.execute("DELETE FROM words")
         conn.execute("DELETE FROM categories")
         conn.execute("DELETE FROM sqlite_sequence WHERE name IN ('words', 'categories')")
@@ -131,6 +171,9 @@ def import_csv(csv_path: Path, db_path: Path, audio_dir: Path, *, clean: bool =
             )
             inserted += 1
 
+    # The triggers index each insert; rebuilding also covers databases that
+    # were filled before the search index existed.
+    conn.execute("INSERT INTO words_fts(words_fts) VALUES ('rebuild')")
     conn.commit()
 
     # Report
@@ -0,0 +1,109 @@
+"""Convert stored JSON reference features to the binary blob format.
+
+Rows written before ``praat_features_blob`` existed keep their features in
+``praat_features_json``. This encodes each of them with
+``encode_features`` into the blob column, clears the JSON and bumps
+``features_rev`` so a running API drops its cached copy.
+
+Usage:
+    cd backend
+    python -m scripts.migrate_features              # convert all JSON rows
+    python -m scripts.migrate_features --dry-run    # report sizes only
+    python -m scripts.migrate_features --vacuum     # reclaim space afterwards
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.database import missing_column_sql
+from app.services.praat_analyzer import decode_features, encode_features
+
+DEFAULT_DB = BACKEND_DIR / "data" / "speakingbuddy.db"
+
+
+def migrate(db_path: Path, *, dry_run: bool = False, vacuum: bool = False) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    columns = {r["name"] for r in conn.execute("PRAGMA table_info(words)")}
+    # DDL commits implicitly, so a dry run only reports the columns it lacks.
+    for stmt in missing_column_sql(columns):
+        if dry_run:
+            print(f"  [DRY RUN] would run: {stmt}")
+        else:
+            conn.execute(stmt)
+
+    # Without the blob column (dry run on an old DB) no row has a blob yet.
+    has_blob_column = "praat_features_blob" in columns or not dry_run
+    rows = conn.execute(
+        "SELECT id, word_lb, praat_features_json FROM words"
+        " WHERE praat_features_json IS NOT NULL"
+        + (" AND praat_features_blob IS NULL" if has_blob_column else "")
+    ).fetchall()
+
+    converted = 0
+    skipped = 0
+    json_bytes = 0
+    blob_bytes = 0
+    for row in rows:
+        text = row["praat_features_json"]
+        try:
+            features = json.loads(text)
+        except ValueError as exc:
+            print(f"  SKIP  id={row['id']} {row['word_lb']!r} — invalid JSON: {exc}")
+            skipped += 1
+            continue
+        if features.get("placeholder"):
+            skipped += 1
+            continue
+
+        blob = encode_features(features)
+        decode_features(blob)  # fail loudly rather than store something unreadable
+        json_bytes += len(text.encode("utf-8"))
+        blob_bytes += len(blob)
+        converted += 1
+
+        if not dry_run:
+            conn.execute(
+                "UPDATE words SET praat_features_blob = ?, praat_features_json = NULL,"
+                " features_rev = features_rev + 1 WHERE id = ?",
+                (blob, row["id"]),
+            )
+
+    if dry_run:
+        conn.rollback()
+    else:
+        conn.commit()
+        if vacuum:
+            conn.execute("VACUUM")
+    conn.close()
+
+    verb = "Would convert" if dry_run else "Converted"
+    print(f"\n[OK] {verb} {converted} rows")
+    if converted:
+        print(f"  JSON {json_bytes / 1024:.1f} KiB -> blob {blob_bytes / 1024:.1f} KiB"
+              f" ({json_bytes / max(blob_bytes, 1):.1f}x smaller)")
+    if skipped:
+        print(f"  {skipped} skipped (placeholder or invalid JSON)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert JSON reference features to binary blobs")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--dry-run", action="store_true", help="Report only, don't modify the DB")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the DB after converting")
+    args = parser.parse_args()
+
+    if not args.db.is_file():
+        print(f"[FAIL] Database not found: {args.db}")
+        sys.exit(1)
+    migrate(args.db, dry_run=args.dry_run, vacuum=args.vacuum)
+
+
+if __name__ == "__main__":
+    main()
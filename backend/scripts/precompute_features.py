@@ -1,69 +1,204 @@
 """Pre-compute Praat features for all reference audio and store in DB.
 
+Features are extracted once per analysis profile: the default profile's go
+into ``words.praat_features_blob``, the others into ``word_features``.
+
+Incremental: each row records the sha256 of its audio file and the
+EXTRACTOR_VERSION that produced its features, and rows whose audio and
+extractor are unchanged are skipped. Extraction fans out over a process
+pool and results are committed in batches, so an interrupted run keeps
+everything finished so far.
+
 Usage:
     cd backend
-    python -m scripts.precompute_features
+    python -m scripts.precompute_features                 # new / changed audio only
+    python -m scripts.precompute_features --force         # re-extract everything
+    python -m scripts.precompute_features --profile fast  # one profile only
+    python -m scripts.precompute_features --workers 8 --batch-size 100
 """
 
-import json
+import argparse
+import os
 import sqlite3
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # Allow imports from the backend package
 BACKEND_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BACKEND_DIR))
 
-from app.services.praat_analyzer import extract_all_praat_features
+from app.database import ensure_schema
+from app.services.audio_files import file_sha256
+from app.services.praat_analyzer import (
+    DEFAULT_PROFILE,
+    EXTRACTOR_VERSION,
+    PROFILES,
+    encode_features,
+    extract_all_praat_features,
+)
 
 DB_PATH = BACKEND_DIR / "data" / "speakingbuddy.db"
 AUDIO_DIR = BACKEND_DIR / "reference_audio"
 
 
-def precompute():
-    conn = sqlite3.connect(DB_PATH)
+def extract_blob(audio_path: str, profile: str = DEFAULT_PROFILE) -> bytes:
+    """Worker: extract and encode one file (encoded here to keep IPC small)."""
+    return encode_features(extract_all_praat_features(audio_path, profile))
+
+
+def precompute(
+    db_path: Path = DB_PATH,
+    audio_dir: Path = AUDIO_DIR,
+    *,
+    workers: int = 1,
+    batch_size: int = 50,
+    force: bool = False,
+    profiles: list[str] | None = None,
+):
+    profiles = profiles or list(PROFILES)
+    conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    ensure_schema(conn)
 
     rows = conn.execute(
-        "SELECT id, word_lb, audio_filename FROM words WHERE audio_filename IS NOT NULL"
+        "SELECT id, word_lb, audio_filename, audio_hash, extractor_version,"
+        " praat_features_blob IS NOT NULL AS has_blob"
+        " FROM words WHERE audio_filename IS NOT NULL"
     ).fetchall()
+    # Per non-default profile: word id → (audio_hash, extractor_version)
+    stored = {
+        profile: {
+            r["word_id"]: (r["audio_hash"], r["extractor_version"])
+            for r in conn.execute(
+                "SELECT word_id, audio_hash, extractor_version FROM word_features WHERE profile = ?",
+                (profile,),
+            )
+        }
+        for profile in profiles if profile != DEFAULT_PROFILE
+    }
 
     updated = 0
+    unchanged = 0
     skipped = 0
     errors = 0
     t0 = time.time()
 
+    # ── Decide what needs extracting ────────────────────────
+    todo: list[tuple[sqlite3.Row, Path, str, str]] = []
     for row in rows:
-        audio_path = AUDIO_DIR / row["audio_filename"]
+        audio_path = audio_dir / row["audio_filename"]
         if not audio_path.is_file():
             print(f"  SKIP  id={row['id']} {row['word_lb']!r} — file not found: {audio_path.name}")
             skipped += 1
             continue
+        audio_hash = file_sha256(audio_path)
+        for profile in profiles:
+            if profile == DEFAULT_PROFILE:
+                current = row["has_blob"] and (row["audio_hash"], row["extractor_version"])
+            else:
+                current = stored[profile].get(row["id"])
+            if not force and current == (audio_hash, EXTRACTOR_VERSION):
+                unchanged += 1
+                continue
+            todo.append((row, audio_path, audio_hash, profile))
 
-        try:
-            features = extract_all_praat_features(str(audio_path))
-        except Exception as exc:
-            print(f"  ERROR id={row['id']} {row['word_lb']!r} — {exc}")
-            errors += 1
-            continue
-
-        conn.execute(
-            "UPDATE words SET praat_features_json = ? WHERE id = ?",
-            (json.dumps(features), row["id"]),
-        )
+    # ── Extract (in parallel) and commit in batches ─────────
+    def store(row: sqlite3.Row, audio_hash: str, profile: str, blob: bytes) -> None:
+        nonlocal updated
+        if profile == DEFAULT_PROFILE:
+            conn.execute(
+                # Bumping features_rev invalidates the API's cached copy.
+                "UPDATE words SET praat_features_blob = ?, praat_features_json = NULL,"
+                " audio_hash = ?, extractor_version = ?,"
+                " features_rev = features_rev + 1 WHERE id = ?",
+                (blob, audio_hash, EXTRACTOR_VERSION, row["id"]),
+            )
+        else:
+            # The row's own features_rev; the default profile's cache and
+            # results keyed by words.features_rev stay valid.
+            conn.execute(
+                "INSERT INTO word_features"
+                " (word_id, profile, features_blob, audio_hash, extractor_version)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (word_id, profile) DO UPDATE SET"
+                " features_blob = excluded.features_blob, audio_hash = excluded.audio_hash,"
+                " extractor_version = excluded.extractor_version, features_rev = features_rev + 1",
+                (row["id"], profile, blob, audio_hash, EXTRACTOR_VERSION),
+            )
         updated += 1
-        print(f"  OK    id={row['id']} {row['word_lb']!r}")
+        print(f"  OK    id={row['id']} {row['word_lb']!r} [{profile}]")
+        if updated % batch_size == 0:
+            conn.commit()
+
+    def failed(row: sqlite3.Row, profile: str, exc: Exception) -> None:
+        nonlocal errors
+        print(f"  ERROR id={row['id']} {row['word_lb']!r} [{profile}] — {exc}")
+        errors += 1
+
+    try:
+        if workers <= 1 or len(todo) <= 1:
+            for row, audio_path, audio_hash, profile in todo:
+                try:
+                    blob = extract_blob(str(audio_path), profile)
+                except Exception as exc:
+                    failed(row, profile, exc)
+                    continue
+                store(row, audio_hash, profile, blob)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(extract_blob, str(audio_path), profile): (row, audio_hash, profile)
+                    for row, audio_path, audio_hash, profile in todo
+                }
+                for future in as_completed(futures):
+                    row, audio_hash, profile = futures[future]
+                    try:
+                        blob = future.result()
+                    except Exception as exc:
+                        failed(row, profile, exc)
+                        continue
+                    store(row, audio_hash, profile, blob)
+    finally:
+        conn.commit()
+        conn.close()
 
-    conn.commit()
-    conn.close()
     elapsed = time.time() - t0
-    print(f"\n[OK] Pre-computed features for {updated} words in {elapsed:.1f}s")
+    rate = updated / elapsed if elapsed > 0 else 0.0
+    print(f"\n[OK] Pre-computed {updated} feature sets ({', '.join(profiles)})"
+          f" in {elapsed:.1f}s ({rate:.1f} files/s)")
+    if unchanged:
+        print(f"  {unchanged} unchanged (same audio hash and extractor version)")
     if skipped:
         print(f"  {skipped} skipped (missing audio)")
     if errors:
         print(f"  {errors} errors")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Pre-compute reference Praat features")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--audio-dir", type=Path, default=AUDIO_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Extraction processes (default: CPU count; 1 = serial)")
+    parser.add_argument("--batch-size", type=int, default=50,
+                        help="Commit after this many updated rows")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-extract every row, even if its audio is unchanged")
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES), dest="profiles",
+                        help="Analysis profile to extract (repeatable; default: all)")
+    args = parser.parse_args()
+
+    precompute(
+        args.db,
+        args.audio_dir,
+        workers=args.workers,
+        batch_size=max(1, args.batch_size),
+        force=args.force,
+        profiles=args.profiles,
+    )
+
+
 if __name__ == "__main__":
-    precompute()
+    main()
@@ -15,10 +15,10 @@ With --backup, originals are copied to reference_audio_raw/ first.
 
 import argparse
 import shutil
+import sys
 from pathlib import Path
 
 from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
 
 # Match constants from app/services/audio_processor.py
 SAMPLE_RATE = 22050
@@ -27,6 +27,10 @@ SILENCE_THRESH_DB = -40
 MIN_SILENCE_LEN_MS = 200
 
 BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.segmenter import EnergyEnvelope
+
 DEFAULT_AUDIO = BACKEND_DIR / "reference_audio"
 BACKUP_DIR = BACKEND_DIR / "reference_audio_raw"
 
@@ -64,10 +68,8 @@ def preprocess_file(path: Path, *, dry_run: bool = False) -> dict:
         stats["changes"].append(f"gain {gain:+.1f}dB")
 
     # 4. Trim silence
-    nonsilent = detect_nonsilent(
-        audio,
-        min_silence_len=MIN_SILENCE_LEN_MS,
-        silence_thresh=SILENCE_THRESH_DB,
+    nonsilent = EnergyEnvelope.from_segment(audio).nonsilent_ranges(
+        SILENCE_THRESH_DB, MIN_SILENCE_LEN_MS
     )
     if nonsilent:
         start = max(0, nonsilent[0][0] - 50)  # keep 50ms padding
@@ -4,7 +4,7 @@ Checks:
   - All CSV-referenced audio files exist
   - Audio files are valid WAV/audio (loadable by pydub)
   - Duration is within acceptable range (0.1s – 5.0s for single words)
-  - Audio is not silent (dBFS > -50)
+  - Audio is not silent (dBFS > -50) and contains a non-silent segment
   - No orphan audio files (WAV files not referenced by CSV)
 
 Usage:
@@ -20,6 +20,11 @@ from pathlib import Path
 from pydub import AudioSegment
 
 BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.audio_processor import MIN_SILENCE_LEN_MS, SILENCE_THRESH_DB
+from app.services.segmenter import EnergyEnvelope
+
 DEFAULT_CSV = BACKEND_DIR / "data" / "words.csv"
 DEFAULT_AUDIO = BACKEND_DIR / "reference_audio"
 
@@ -97,8 +102,13 @@ def validate(csv_path: Path, audio_dir: Path) -> bool:
         elif dur > MAX_DURATION:
             warnings.append(f"Row {i} ({word}): {filename} unusually long ({dur:.2f}s)")
 
-        if audio.dBFS < MIN_DBFS:
-            errors.append(f"Row {i} ({word}): {filename} is near-silent (dBFS={audio.dBFS:.1f})")
+        envelope = EnergyEnvelope.from_segment(audio)
+        if envelope.dbfs < MIN_DBFS:
+            errors.append(f"Row {i} ({word}): {filename} is near-silent (dBFS={envelope.dbfs:.1f})")
+        elif not envelope.nonsilent_ranges(SILENCE_THRESH_DB, MIN_SILENCE_LEN_MS):
+            warnings.append(
+                f"Row {i} ({word}): {filename} has no segment above {SILENCE_THRESH_DB} dBFS"
+            )
 
     # ── 4. Check for orphan audio files ─────────────────────
     if audio_dir.is_dir():
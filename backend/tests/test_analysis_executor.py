@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware import UploadSizeLimitMiddleware
+from app.services.analysis_executor import (
+    AnalysisExecutor,
+    AnalysisQueueFull,
+    AnalysisWaitTimeout,
+)
+
+
+def test_executor_rejects_when_saturated():
+    async def scenario():
+        executor = AnalysisExecutor(workers=0, queue_depth=1, max_wait=0.1)
+        await executor.start()
+        try:
+            running = asyncio.create_task(executor.run(time.sleep, 0.4))
+            await asyncio.sleep(0.05)
+            queued = asyncio.create_task(executor.run(time.sleep, 0))
+            await asyncio.sleep(0.01)
+            assert executor.stats()["running"] == 1
+            assert executor.stats()["waiting"] == 1
+
+            with pytest.raises(AnalysisQueueFull) as full:
+                await executor.run(time.sleep, 0)
+            assert not isinstance(full.value, AnalysisWaitTimeout)
+            assert full.value.retry_after >= 1
+
+            with pytest.raises(AnalysisWaitTimeout):
+                await queued
+            await running
+            # Slots are released: the next job runs normally.
+            assert await executor.run(sum, [1, 2]) == 3
+            return executor.stats()
+        finally:
+            executor.shutdown()
+
+    stats = asyncio.run(scenario())
+    assert (stats["rejected"], stats["timed_out"], stats["running"], stats["waiting"]) == (1, 1, 0, 0)
+
+
+def _echo_app(max_bytes: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=max_bytes)
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    return app
+
+
+def test_upload_limit_checks_declared_and_streamed_size():
+    client = TestClient(_echo_app(max_bytes=1000))
+
+    assert client.post("/echo", content=b"x" * 1000).json() == {"size": 1000}
+    assert client.post("/echo", content=b"x" * 1001).status_code == 413
+
+    # No Content-Length (chunked): rejected while the body is being read.
+    chunks = (b"x" * 300 for _ in range(5))
+    assert client.post("/echo", content=chunks).status_code == 413
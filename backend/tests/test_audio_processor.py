@@ -0,0 +1,44 @@
+import numpy as np
+
+from app.services.audio_processor import MAX_UPLOAD_SECONDS, SAMPLE_RATE, precheck_audio
+from app.services.feature_comparator import rejected_score
+from app.services.feedback_generator import generate_phonetic_feedback
+
+
+def _word(seconds: float = 1.5) -> np.ndarray:
+    # Silence, a 0.5 s "word" and silence again.
+    n = int(seconds * SAMPLE_RATE)
+    x = np.zeros(n, dtype=np.float32)
+    t = np.arange(SAMPLE_RATE // 2) / SAMPLE_RATE
+    start = n // 3
+    x[start:start + len(t)] = 0.3 * np.sin(2 * np.pi * 200 * t)
+    return x
+
+
+def _reason(samples: np.ndarray) -> str | None:
+    rejection = precheck_audio(samples, SAMPLE_RATE)
+    return rejection and rejection["reason"]
+
+
+def test_precheck_accepts_a_normal_take():
+    assert precheck_audio(_word(), SAMPLE_RATE) is None
+
+
+def test_precheck_rejects_unusable_takes():
+    rng = np.random.default_rng(0)
+    assert _reason(np.zeros(SAMPLE_RATE, dtype=np.float32)) == "silent"
+    assert _reason(_word() * 1e-3) == "silent"
+    assert _reason(np.clip(_word() * 10, -1, 1)) == "clipped"
+    assert _reason((0.05 * rng.standard_normal(2 * SAMPLE_RATE)).astype(np.float32)) == "noise"
+    assert _reason(_word(MAX_UPLOAD_SECONDS + 1)) == "too_long"
+    assert _reason(_word()[:SAMPLE_RATE // 20]) == "too_short"
+
+
+def test_rejection_feedback_is_user_facing_text():
+    rejection = precheck_audio(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+    score_result = rejected_score(rejection)
+    feedback = generate_phonetic_feedback(score_result, {}, {})
+
+    assert score_result["overall_score"] == 0.0
+    assert "couldn't hear" in feedback["overall_text"]
+    assert feedback["improvements"]
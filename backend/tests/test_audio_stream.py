@@ -0,0 +1,95 @@
+import asyncio
+import subprocess
+
+import numpy as np
+import pytest
+
+from app.services.audio_processor import FFMPEG_BIN, SAMPLE_RATE, decode_upload, precheck_audio
+from app.services.audio_stream import AudioStream, StreamingVAD
+
+SR = 22050
+
+
+def _tone(seconds: float, amplitude: float) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _noise(seconds: float, amplitude: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (amplitude * rng.standard_normal(int(seconds * SR))).astype(np.float32)
+
+
+def test_vad_reports_one_utterance_across_chunk_boundaries():
+    signal = np.concatenate([_noise(0.5, 0.001), _tone(0.8, 0.3), _noise(0.6, 0.001, seed=1)])
+    vad = StreamingVAD(SR)
+    events = []
+    for i in range(0, len(signal), 1234):  # deliberately not frame-aligned
+        events.extend(vad.push(signal[i:i + 1234]))
+
+    assert [e["event"] for e in events] == ["speech_start", "speech_end"]
+    assert abs(events[0]["at_ms"] - 500) <= 40
+    assert abs(events[1]["at_ms"] - 1300) <= 40
+    assert not vad.in_speech
+    assert vad.utterances == 1
+
+
+def test_vad_ignores_steady_background_noise():
+    vad = StreamingVAD(SR)
+    assert vad.push(_noise(2.0, 0.02)) == []
+    assert vad.utterances == 0
+
+
+def test_vad_detects_speech_at_the_very_start():
+    vad = StreamingVAD(SR)
+    events = vad.push(np.concatenate([_tone(0.5, 0.3), np.zeros(SR // 2, dtype=np.float32)]))
+    assert [e["event"] for e in events] == ["speech_start", "speech_end"]
+    assert events[0]["at_ms"] == 0
+
+
+def _encode(samples: np.ndarray, *codec_args: str) -> bytes:
+    proc = subprocess.run(
+        [FFMPEG_BIN, "-hide_banner", "-loglevel", "error",
+         "-f", "f32le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "pipe:0",
+         *codec_args, "pipe:1"],
+        input=samples.astype("<f4").tobytes(), capture_output=True, check=True,
+    )
+    return proc.stdout
+
+
+def _stream_decode(data: bytes, chunk: int) -> np.ndarray:
+    async def scenario():
+        stream = AudioStream()
+        await stream.start()
+        try:
+            for i in range(0, len(data), chunk):
+                await stream.feed(data[i:i + chunk])
+            return await stream.finish()
+        finally:
+            await stream.abort()
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("codec_args", [
+    ("-f", "wav"),
+    ("-c:a", "libopus", "-f", "webm"),
+], ids=["wav", "webm"])
+def test_streamed_decode_matches_upload_decode(codec_args):
+    t = np.arange(int(1.2 * SAMPLE_RATE)) / SAMPLE_RATE
+    take = (0.3 * np.sin(2 * np.pi * 220 * t) * np.minimum(1, t * 5)).astype(np.float32)
+    data = _encode(take, *codec_args)
+
+    streamed = _stream_decode(data, chunk=1024)
+    np.testing.assert_array_equal(streamed, decode_upload(data))
+
+
+def test_overlong_stream_is_cut_where_uploads_are_and_rejected_the_same():
+    t = np.arange(16 * SAMPLE_RATE) / SAMPLE_RATE
+    data = _encode((0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), "-f", "wav")
+
+    streamed = _stream_decode(data, chunk=16384)
+    uploaded = decode_upload(data)
+    np.testing.assert_array_equal(streamed, uploaded)
+    assert precheck_audio(streamed) == precheck_audio(uploaded)
+    assert precheck_audio(streamed)["reason"] == "too_long"
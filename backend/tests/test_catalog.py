@@ -0,0 +1,89 @@
+import asyncio
+import sqlite3
+
+from app.database import SCHEMA_SQL
+from app.services.catalog import Catalog
+
+
+def _make_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_SQL)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("INSERT INTO categories (name, display_name) VALUES ('animals', 'Animals'), ('food', 'Food')")
+    conn.executemany(
+        "INSERT INTO words (category_id, word_lb, translation_en, translation_fr) VALUES (?, ?, ?, ?)",
+        [(1, "Léiw", "lion", "lion"), (1, "Hond", "dog", "chien"), (2, "Brout", "bread", "pain")],
+    )
+    conn.commit()
+    return conn
+
+
+def test_snapshot_lists_words_per_category_and_language(tmp_path):
+    _make_db(tmp_path / "t.db").close()
+
+    async def scenario():
+        catalog = Catalog(tmp_path / "t.db", check_interval=0)
+        try:
+            return await catalog.snapshot()
+        finally:
+            await catalog.close()
+
+    snapshot = asyncio.run(scenario())
+    assert [(c.name, c.word_count) for c in snapshot.categories] == [("animals", 2), ("food", 1)]
+    assert [(w.word_lb, w.translation) for w in snapshot.word_list("animals", "fr")] == [
+        ("Léiw", "lion"), ("Hond", "chien"),
+    ]
+    assert snapshot.word_list("animals", "de")[0].translation is None
+    assert snapshot.word_list("plants", "en") is None
+    assert snapshot.words[3].translation_en == "bread"
+    assert snapshot.words[3].audio_url == "/api/audio/3"
+
+
+def test_catalog_reloads_only_when_database_changes(tmp_path):
+    writer = _make_db(tmp_path / "t.db")
+
+    async def scenario():
+        catalog = Catalog(tmp_path / "t.db", check_interval=0)
+        try:
+            first = await catalog.snapshot()
+            unchanged = await catalog.snapshot()
+
+            # A write that leaves the catalog rows alone keeps the version.
+            writer.execute("UPDATE words SET features_rev = features_rev + 1")
+            writer.commit()
+            rewritten = await catalog.snapshot()
+
+            writer.execute("INSERT INTO words (category_id, word_lb) VALUES (2, 'Kéis')")
+            writer.commit()
+            grown = await catalog.snapshot()
+            return first, unchanged, rewritten, grown, catalog.reloads
+        finally:
+            await catalog.close()
+            writer.close()
+
+    first, unchanged, rewritten, grown, reloads = asyncio.run(scenario())
+    assert unchanged is first
+    assert rewritten.version == first.version
+    assert grown.version != first.version
+    assert [w.word_lb for w in grown.word_list("food", "en")] == ["Brout", "Kéis"]
+    assert reloads == 3
+
+
+def test_word_page_is_keyset_paginated(tmp_path):
+    _make_db(tmp_path / "t.db").close()
+
+    async def scenario():
+        catalog = Catalog(tmp_path / "t.db", check_interval=0)
+        try:
+            return await catalog.snapshot()
+        finally:
+            await catalog.close()
+
+    snapshot = asyncio.run(scenario())
+    page, next_after = snapshot.word_page("animals", "en", limit=1)
+    assert [w.word_lb for w in page] == ["Léiw"] and next_after == 1
+    page, next_after = snapshot.word_page("animals", "en", after_id=next_after, limit=1)
+    assert [w.word_lb for w in page] == ["Hond"] and next_after is None
+    assert snapshot.word_page("animals", "en", after_id=2) == ((), None)
+    assert snapshot.word_page("animals", "en")[0] == snapshot.word_list("animals", "en")
+    assert snapshot.word_page("plants", "en", limit=5) is None
@@ -0,0 +1,135 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app import database
+from app.database import ConnectionPool, DatabasePoolTimeout
+from scripts.migrate_features import migrate
+from scripts.precompute_features import precompute
+
+
+def test_pool_reuses_configured_connections(tmp_path):
+    async def scenario():
+        pool = ConnectionPool(tmp_path / "t.db", max_size=2)
+        await pool.open()
+        try:
+            async with pool.connection() as first:
+                cur = await first.execute("PRAGMA journal_mode")
+                journal = (await cur.fetchone())[0]
+                cur = await first.execute("PRAGMA synchronous")
+                synchronous = (await cur.fetchone())[0]
+                await first.execute("CREATE TABLE t (x INTEGER)")
+                await first.execute("INSERT INTO t VALUES (1)")  # left uncommitted
+            async with pool.connection() as second:
+                cur = await second.execute("SELECT COUNT(*) FROM t")
+                count = (await cur.fetchone())[0]
+            return journal, synchronous, first is second, count, pool.stats()
+        finally:
+            await pool.close()
+
+    journal, synchronous, reused, count, stats = asyncio.run(scenario())
+    assert (journal, synchronous) == ("wal", 1)  # 1 = NORMAL
+    assert reused
+    assert count == 0  # the open transaction was rolled back on return
+    assert (stats["created"], stats["size"], stats["idle"]) == (1, 1, 1)
+
+
+def test_pool_enforces_size_limit(tmp_path):
+    async def scenario():
+        pool = ConnectionPool(tmp_path / "t.db", max_size=1, timeout=0.05)
+        try:
+            async with pool.connection():
+                with pytest.raises(DatabasePoolTimeout):
+                    async with pool.connection():
+                        pass
+            async with pool.connection():
+                pass
+            return pool.stats()
+        finally:
+            await pool.close()
+
+    stats = asyncio.run(scenario())
+    assert (stats["timeouts"], stats["created"], stats["in_use"]) == (1, 1, 0)
+
+
+def test_pool_replaces_broken_connection(tmp_path):
+    async def scenario():
+        pool = ConnectionPool(tmp_path / "t.db", max_size=1, health_check_after=0)
+        try:
+            async with pool.connection() as conn:
+                pass
+            await conn.close()  # dies while idle in the pool
+            async with pool.connection() as replacement:
+                cur = await replacement.execute("SELECT 1")
+                assert (await cur.fetchone())[0] == 1
+            return replacement is not conn, pool.stats()
+        finally:
+            await pool.close()
+
+    replaced, stats = asyncio.run(scenario())
+    assert replaced
+    assert (stats["created"], stats["discarded"], stats["size"]) == (2, 1, 1)
+
+
+def _pre_search_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT, display_name TEXT)")
+    conn.execute("CREATE TABLE words (id INTEGER PRIMARY KEY, category_id INTEGER, word_lb TEXT,"
+                 " audio_filename TEXT, translation_en TEXT, translation_fr TEXT, translation_de TEXT)")
+    conn.execute("INSERT INTO words (category_id, word_lb, translation_en) VALUES (1, 'Léiw', 'lion')")
+    conn.commit()
+    conn.close()
+
+
+def _search(path, query):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT rowid FROM words_fts WHERE words_fts MATCH ?", (query,)).fetchall()
+    finally:
+        conn.close()
+
+
+def test_init_db_indexes_words_imported_before_search_existed(tmp_path, monkeypatch):
+    path = tmp_path / "old.db"
+    _pre_search_db(path)
+
+    monkeypatch.setattr(database, "DB_PATH", path)
+    asyncio.run(database.init_db())
+    assert _search(path, "leiw") == [(1,)]
+
+
+def test_search_index_survives_precompute_before_init_db(tmp_path, monkeypatch):
+    # precompute is the first to create the index here; init_db must not find it empty.
+    path = tmp_path / "old.db"
+    _pre_search_db(path)
+    precompute(path, tmp_path, profiles=["accurate"])
+    assert _search(path, "leiw") == [(1,)]
+
+    monkeypatch.setattr(database, "DB_PATH", path)
+    asyncio.run(database.init_db())
+    assert _search(path, "leiw") == [(1,)]
+    assert _search(path, "lion") == [(1,)]
+
+
+def test_migrate_features_dry_run_leaves_schema_and_rows_alone(tmp_path, capsys):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE words (id INTEGER PRIMARY KEY, word_lb TEXT, praat_features_json TEXT)")
+    conn.execute("""INSERT INTO words VALUES (1, 'Léiw', '{"pitch": {"contour": [1.0, 2.0]}}')""")
+    conn.commit()
+    conn.close()
+
+    migrate(path, dry_run=True)
+
+    conn = sqlite3.connect(path)
+    try:
+        columns = [r[1] for r in conn.execute("PRAGMA table_info(words)")]
+        stored = conn.execute("SELECT praat_features_json FROM words").fetchone()[0]
+    finally:
+        conn.close()
+    assert columns == ["id", "word_lb", "praat_features_json"]
+    assert stored is not None
+    out = capsys.readouterr().out
+    assert "would run: ALTER TABLE words ADD COLUMN praat_features_blob" in out
+    assert "Would convert 1 rows" in out
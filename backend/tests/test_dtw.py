@@ -0,0 +1,72 @@
+import numpy as np
+
+from app.services.dtw import MAX_DISTANCE, dtw_distance, dtw_multivariate
+
+
+def _reference_dtw(seq_a, seq_b) -> float:
+    # The original pure-Python implementation from feature_comparator.
+    n, m = len(seq_a), len(seq_b)
+    dtw = np.full((n + 1, m + 1), np.inf)
+    dtw[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost = abs(seq_a[i - 1] - seq_b[j - 1])
+            dtw[i, j] = cost + min(dtw[i - 1, j], dtw[i, j - 1], dtw[i - 1, j - 1])
+    return float(dtw[n, m] / max(n, m))
+
+
+def test_matches_reference_implementation():
+    rng = np.random.default_rng(0)
+    for n, m in [(1, 1), (1, 7), (7, 1), (30, 30), (45, 80), (120, 37)]:
+        a = (120 + 30 * rng.standard_normal(n)).tolist()
+        b = (130 + 30 * rng.standard_normal(m)).tolist()
+        assert np.isclose(dtw_distance(a, b), _reference_dtw(a, b), rtol=1e-9)
+
+
+def test_empty_sequence_is_maximally_different():
+    assert dtw_distance([], [1.0, 2.0]) == MAX_DISTANCE
+    assert dtw_distance([1.0], []) == MAX_DISTANCE
+
+
+def test_band_is_upper_bound_and_converges():
+    rng = np.random.default_rng(1)
+    a = np.cumsum(rng.standard_normal(90))
+    b = np.cumsum(rng.standard_normal(140))
+    full = dtw_distance(a, b)
+    narrow = dtw_distance(a, b, band=0)
+    wide = dtw_distance(a, b, band=140)
+
+    # Constraining the path can only make it more expensive.
+    assert narrow >= full
+    assert np.isfinite(narrow)
+    assert np.isclose(wide, full)
+
+
+def test_identical_sequences_have_zero_distance():
+    seq = [100.0, 110.0, 120.0, 115.0]
+    assert dtw_distance(seq, seq) == 0.0
+    assert dtw_distance(seq, seq, band=0) == 0.0
+
+
+def test_multivariate_path_is_monotone_and_complete():
+    rng = np.random.default_rng(2)
+    a = rng.standard_normal((25, 3))
+    b = rng.standard_normal((40, 3))
+    dist, path_a, path_b = dtw_multivariate(a, b)
+
+    assert (path_a[0], path_b[0]) == (0, 0)
+    assert (path_a[-1], path_b[-1]) == (24, 39)
+    steps = np.stack([np.diff(path_a), np.diff(path_b)])
+    assert steps.min() >= 0 and steps.max() <= 1 and steps.sum(axis=0).min() >= 1
+
+    # The path cost re-summed from frame distances equals the DP result.
+    frame_cost = np.linalg.norm(a[path_a] - b[path_b], axis=1).sum() / 40
+    assert np.isclose(dist, frame_cost)
+
+
+def test_multivariate_single_dimension_matches_univariate():
+    rng = np.random.default_rng(3)
+    a = rng.standard_normal(30)
+    b = rng.standard_normal(45)
+    dist, _, _ = dtw_multivariate(a[:, None], b[:, None])
+    assert np.isclose(dist, dtw_distance(a, b))
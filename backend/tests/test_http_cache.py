@@ -0,0 +1,97 @@
+import gzip
+import json
+import sqlite3
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.database import SCHEMA_SQL
+from app.http_cache import (
+    EncodedBody, accepts_gzip, catalog_etag, content_etag, etag_matches, json_response,
+)
+from app.models import WordOut
+from app.routes import audio, words
+from app.services.catalog import Catalog
+
+
+class _Request:
+    def __init__(self, if_none_match: str | None = None, accept_encoding: str | None = None):
+        self.headers = {}
+        if if_none_match:
+            self.headers["if-none-match"] = if_none_match
+        if accept_encoding:
+            self.headers["accept-encoding"] = accept_encoding
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    assert etag_matches(_Request('W/"v1"'), catalog_etag("v1"))
+    assert etag_matches(_Request('"v1"'), catalog_etag("v1"))
+    assert etag_matches(_Request('"a", W/"v1" , "b"'), catalog_etag("v1"))
+    assert etag_matches(_Request("*"), content_etag("abc"))
+    assert not etag_matches(_Request('W/"v2"'), catalog_etag("v1"))
+    assert not etag_matches(_Request(None), catalog_etag("v1"))
+
+
+def test_encoded_body_is_served_gzipped_only_when_accepted():
+    words = tuple(
+        WordOut(id=i, word_lb=f"Wuert {i}", translation=f"word {i}", audio_url=f"/api/audio/{i}")
+        for i in range(20)
+    )
+    encoded = EncodedBody.encode(TypeAdapter(tuple[WordOut, ...]), words)
+    assert json.loads(encoded.body)[3]["word_lb"] == "Wuert 3"
+    assert gzip.decompress(encoded.gzipped) == encoded.body
+
+    assert accepts_gzip(_Request(accept_encoding="br, gzip;q=0.8"))
+    assert not accepts_gzip(_Request(accept_encoding="gzip;q=0, deflate"))
+    assert not accepts_gzip(_Request())
+
+    zipped = json_response(_Request(accept_encoding="gzip"), encoded, 'W/"v"', "no-cache")
+    assert zipped.body == encoded.gzipped
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["vary"] == "Accept-Encoding"
+    plain = json_response(_Request(), encoded, 'W/"v"', "no-cache")
+    assert plain.body == encoded.body
+    assert "content-encoding" not in plain.headers
+
+    tiny = EncodedBody.encode(TypeAdapter(list[int]), [1, 2, 3])
+    assert tiny.gzipped is None
+    assert "vary" not in json_response(_Request(accept_encoding="gzip"), tiny, 'W/"v"', "no-cache").headers
+
+
+def test_routes_answer_if_none_match_with_304(tmp_path, monkeypatch):
+    conn = sqlite3.connect(tmp_path / "t.db")
+    conn.executescript(SCHEMA_SQL)
+    conn.execute("INSERT INTO categories (name, display_name) VALUES ('animals', 'Animals')")
+    conn.execute("INSERT INTO words (category_id, word_lb, audio_filename) VALUES (1, 'Léiw', 'leiw.wav')")
+    conn.commit()
+    conn.close()
+    (tmp_path / "leiw.wav").write_bytes(b"RIFF-not-really-a-wav")
+
+    monkeypatch.setattr(audio.settings, "AUDIO_DIR", tmp_path)
+    test_catalog = Catalog(tmp_path / "t.db", check_interval=60)
+    monkeypatch.setattr(words, "catalog", test_catalog)
+    monkeypatch.setattr(audio, "catalog", test_catalog)
+    app = FastAPI()
+    app.include_router(words.router, prefix="/api")
+    app.include_router(audio.router, prefix="/api")
+
+    with TestClient(app) as client:
+        try:
+            for path in ("/api/categories/animals/words", "/api/words/1", "/api/audio/1"):
+                first = client.get(path)
+                assert first.status_code == 200
+                etag = first.headers["etag"]
+                assert first.headers["cache-control"]
+
+                again = client.get(path, headers={"If-None-Match": etag})
+                assert again.status_code == 304
+                assert again.content == b""
+                assert again.headers["etag"] == etag
+
+            # Replacing the audio file changes its ETag.
+            old = client.get("/api/audio/1").headers["etag"]
+            (tmp_path / "leiw.wav").write_bytes(b"RIFF-a-different-take")
+            assert client.get("/api/audio/1", headers={"If-None-Match": old}).status_code == 200
+        finally:
+            client.portal.call(test_catalog.close)
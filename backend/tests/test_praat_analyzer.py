@@ -0,0 +1,173 @@
+import numpy as np
+import parselmouth
+import pytest
+import soundfile as sf
+from parselmouth.praat import call
+
+from app.config import settings
+from app.services import praat_analyzer
+from app.services.feature_comparator import _compare_formants
+from app.services.praat_analyzer import (
+    AnalysisContext,
+    _extract_formants,
+    compute_mfcc,
+    PITCH_CEILING,
+    PITCH_FLOOR,
+    decode_features,
+    encode_features,
+    estimate_pitch_range,
+    extract_features_from_samples,
+    get_profile,
+)
+
+SR = 22050
+
+
+def _loop_formants(snd: parselmouth.Sound) -> dict:
+    # Frame-by-frame extraction as originally written, used as the oracle.
+    formant_obj = call(snd, "To Formant (burg)", 0.0, 5, 5500, 0.025, 50)
+    out: dict[str, list[float]] = {"f1": [], "f2": [], "f3": []}
+    for i in range(1, call(formant_obj, "Get number of frames") + 1):
+        t = call(formant_obj, "Get time from frame number", i)
+        if t < 0 or t > snd.duration:
+            continue
+        for fi, key in enumerate(("f1", "f2", "f3"), start=1):
+            val = call(formant_obj, "Get value at time", fi, t, "Hertz", "Linear")
+            if not np.isnan(val):
+                out[key].append(float(val))
+    return out
+
+
+def _sound(samples: np.ndarray) -> parselmouth.Sound:
+    return parselmouth.Sound(samples, sampling_frequency=SR)
+
+
+def test_bulk_formants_match_per_frame_loop():
+    t = np.arange(SR) / SR
+    voiced = sum(np.sin(2 * np.pi * 120 * k * t) / k for k in range(1, 30))
+    # A 20 Hz sine leaves F2/F3 undefined in many frames.
+    signal = np.concatenate([0.3 * voiced, np.sin(2 * np.pi * 20 * t)])
+
+    snd = _sound(signal)
+    bulk = _extract_formants(AnalysisContext(snd))
+    loop = _loop_formants(snd)
+
+    for key in ("f1", "f2", "f3"):
+        assert len(bulk[f"{key}_values"]) == len(loop[key])
+        assert np.allclose(bulk[f"{key}_values"], loop[key])
+        assert np.isclose(bulk[f"{key}_mean"], np.mean(loop[key]))
+    assert len(loop["f3"]) < len(loop["f1"])  # undefined frames were exercised
+
+
+def test_joint_formant_alignment_runs_on_tracks_with_undefined_frames(monkeypatch):
+    t = np.arange(SR) / SR
+    voiced = sum(np.sin(2 * np.pi * 120 * k * t) / k for k in range(1, 30))
+    user_snd = _sound(np.concatenate([0.3 * voiced, np.sin(2 * np.pi * 20 * t)]))
+    ref_snd = _sound(np.concatenate([0.3 * voiced[: SR // 2], np.sin(2 * np.pi * 20 * t)]))
+    user = _extract_formants(AnalysisContext(user_snd))
+    ref = _extract_formants(AnalysisContext(ref_snd))
+
+    # Per-formant tracks differ in length; the frame-aligned ones never do.
+    assert len(user["f3_values"]) < len(user["f1_values"])
+    assert len({len(user[f"{k}_joint"]) for k in ("f1", "f2", "f3")}) == 1
+    assert 0 < len(user["f1_joint"]) <= len(user["f3_values"])
+
+    monkeypatch.setattr(settings, "FORMANT_ALIGNMENT", "joint")
+    _, detail = _compare_formants(user, ref)
+    assert detail["alignment"] == "joint"
+    assert "alignment_fallback" not in detail
+
+    # Features from before the aligned tracks existed fall back, visibly.
+    legacy = {k: v for k, v in ref.items() if not k.endswith("_joint")}
+    _, detail = _compare_formants(user, legacy)
+    assert detail["alignment"] == "per_track" and detail["alignment_fallback"]
+
+
+def test_feature_blob_round_trip():
+    t = np.arange(SR // 2) / SR
+    samples = (0.3 * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+    features = extract_features_from_samples(samples, SR)
+
+    decoded = decode_features(encode_features(features))
+
+    assert decoded.keys() == features.keys()
+    for group, values in features.items():
+        assert decoded[group].keys() == values.keys()
+        for key, value in values.items():
+            if isinstance(value, list):
+                np.testing.assert_allclose(decoded[group][key], value, rtol=1e-6)
+            else:
+                assert decoded[group][key] == value
+
+
+def test_feature_blob_rejects_foreign_data():
+    blob = encode_features({"duration": {"total_seconds": 0.5}})
+    with pytest.raises(ValueError):
+        decode_features(b'{"pitch": {}}')
+    with pytest.raises(ValueError):
+        decode_features(blob[:3] + bytes([99]) + blob[4:])
+
+
+def test_feature_blob_rejects_older_schema(monkeypatch):
+    # Written before the f*_joint tracks: decoding must fail so it is re-extracted.
+    monkeypatch.setattr(praat_analyzer, "FEATURE_SCHEMA_VERSION", 1)
+    blob = encode_features({"duration": {"total_seconds": 0.5}})
+    monkeypatch.undo()
+    with pytest.raises(ValueError, match="schema 1"):
+        decode_features(blob)
+
+
+def test_fast_profile_gives_coarser_contours_with_same_statistics():
+    t = np.arange(2 * SR) / SR
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SR
+    samples = (0.3 * sum(np.sin(k * phase) / k for k in range(1, 20))).astype(np.float32)
+
+    accurate = extract_features_from_samples(samples, SR, "accurate")
+    fast = extract_features_from_samples(samples, SR, "fast")
+
+    limit = get_profile("fast").max_contour_points
+    for group, key in (("pitch", "values"), ("formants", "f1_values"), ("intensity", "values")):
+        assert len(fast[group][key]) <= limit < len(accurate[group][key])
+    assert fast["pitch"]["mean"] == pytest.approx(accurate["pitch"]["mean"], rel=0.02)
+    assert fast["intensity"]["mean"] == pytest.approx(accurate["intensity"]["mean"], abs=1.0)
+    with pytest.raises(ValueError):
+        get_profile("bogus")
+
+
+def test_pitch_range_adapts_to_speaker():
+    t = np.arange(SR) / SR
+    voiced = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 20))
+    floor, ceiling = estimate_pitch_range(_sound(0.3 * voiced))
+    assert floor == pytest.approx(150 * 0.72, rel=0.02)
+    assert ceiling == pytest.approx(150 * 1.9, rel=0.02)
+
+    noise = np.random.default_rng(0).standard_normal(SR) * 0.01
+    assert estimate_pitch_range(_sound(noise)) == (PITCH_FLOOR, PITCH_CEILING)
+
+    features = extract_features_from_samples((0.3 * voiced).astype(np.float32), SR)
+    assert (features["pitch"]["floor"], features["pitch"]["ceiling"]) == pytest.approx((floor, ceiling), rel=0.02)
+    assert features["pitch"]["mean"] == pytest.approx(150, rel=0.01)
+
+
+def _mfcc_corpus() -> list[tuple[np.ndarray, int]]:
+    rng = np.random.default_rng(0)
+    t = np.arange(SR) / SR
+    corpus = [
+        ((0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), SR),
+        ((0.1 * rng.standard_normal(SR)).astype(np.float32), SR),
+        ((0.1 * rng.standard_normal(1500)).astype(np.float32), 16000),  # shorter than n_fft
+    ]
+    for path in sorted(settings.AUDIO_DIR.glob("*.wav"))[:20]:
+        samples, sr = sf.read(path, dtype="float32", always_2d=True)
+        corpus.append((samples.mean(axis=1), sr))
+    return corpus
+
+
+def test_mfcc_matches_librosa():
+    librosa = pytest.importorskip("librosa")
+    for samples, sr in _mfcc_corpus():
+        expected = librosa.feature.mfcc(y=samples, sr=sr, n_mfcc=13)
+        actual = compute_mfcc(samples, sr, n_mfcc=13)
+        assert actual.shape == expected.shape
+        np.testing.assert_allclose(actual, expected, atol=1e-3)
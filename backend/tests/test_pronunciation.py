@@ -0,0 +1,233 @@
+import asyncio
+import sqlite3
+import wave
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import SCHEMA_SQL, ConnectionPool
+from app.routes import pronunciation
+from app.services.reference_features import reference_cache
+from scripts.precompute_features import precompute
+
+_OUTCOME = {
+    "score_result": {
+        "overall_score": 50.0,
+        "breakdown": {"pitch": 1.0, "formants": 1.0, "intensity": 1.0, "duration": 1.0,
+                      "voice_quality": 1.0},
+    },
+    "feedback": {"overall_text": "ok", "improvements": [], "suggestions": []},
+}
+
+
+def _word_db(tmp_path) -> None:
+    conn = sqlite3.connect(tmp_path / "t.db")
+    conn.executescript(SCHEMA_SQL)
+    conn.execute("INSERT INTO categories (name, display_name) VALUES ('animals', 'Animals')")
+    conn.execute("INSERT INTO words (category_id, word_lb, audio_filename) VALUES (1, 'Léiw', 'leiw.wav')")
+    conn.commit()
+    conn.close()
+
+
+def _write_tone(path) -> None:
+    t = np.arange(8000) / 16000
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes((8000 * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes())
+
+
+def _check(pool, **form):
+    app = FastAPI()
+    app.include_router(pronunciation.router, prefix="/api")
+    with TestClient(app) as client:
+        client.portal.call(pool.open)
+        try:
+            return client.post(
+                "/api/pronunciation/check",
+                data={"word_id": "1", **form},
+                files={"audio": ("r.webm", repr(form).encode(), "audio/webm")},
+            )
+        finally:
+            client.portal.call(pool.close)
+
+
+def test_reference_extraction_does_not_hold_a_pooled_connection(tmp_path, monkeypatch):
+    _word_db(tmp_path)
+    (tmp_path / "leiw.wav").write_bytes(b"RIFF")
+
+    # One connection only: an extraction run while the lookup's connection
+    # is still checked out could never borrow its own.
+    pool = ConnectionPool(tmp_path / "t.db", max_size=1, timeout=0.5)
+    extractions = []
+
+    async def fake_complete(word_id, rev, path, features, profile="accurate"):
+        async with pool.connection() as db:
+            await db.execute("SELECT 1")
+        extractions.append(word_id)
+        return {"fake": True}
+
+    async def fake_analyze(word_id, fn, *args):
+        return _OUTCOME
+
+    monkeypatch.setattr(pronunciation.settings, "AUDIO_DIR", tmp_path)
+    monkeypatch.setattr(pronunciation, "db_pool", pool)
+    monkeypatch.setattr(pronunciation, "_complete_reference_features", fake_complete)
+    monkeypatch.setattr(pronunciation, "_analyze", fake_analyze)
+    response = _check(pool, profile="accurate")
+
+    assert response.status_code == 200, response.text
+    assert response.json()["score"] == 50.0
+    assert extractions == [1]
+
+
+def test_profile_features_from_a_single_profile_precompute_are_used(tmp_path, monkeypatch):
+    _word_db(tmp_path)
+    _write_tone(tmp_path / "leiw.wav")
+    # Only the fast profile: words.audio_hash stays NULL.
+    precompute(tmp_path / "t.db", tmp_path, profiles=["fast"])
+
+    extractions = []
+
+    async def fake_complete(word_id, rev, path, features, profile="accurate"):
+        extractions.append(word_id)
+        return {"fake": True}
+
+    async def fake_analyze(word_id, fn, *args):
+        return _OUTCOME
+
+    monkeypatch.setattr(pronunciation.settings, "AUDIO_DIR", tmp_path)
+    monkeypatch.setattr(pronunciation, "db_pool", ConnectionPool(tmp_path / "t.db", max_size=1))
+    monkeypatch.setattr(pronunciation, "_complete_reference_features", fake_complete)
+    monkeypatch.setattr(pronunciation, "_analyze", fake_analyze)
+    try:
+        response = _check(pronunciation.db_pool, profile="fast")
+    finally:
+        reference_cache.clear()
+
+    assert response.status_code == 200, response.text
+    assert extractions == []
+
+
+
+def test_precomputing_another_profile_keeps_the_default_revision(tmp_path):
+    _word_db(tmp_path)
+    _write_tone(tmp_path / "leiw.wav")
+    precompute(tmp_path / "t.db", tmp_path, profiles=["accurate"])
+    precompute(tmp_path / "t.db", tmp_path, profiles=["fast"])
+    precompute(tmp_path / "t.db", tmp_path, profiles=["fast"], force=True)
+
+    conn = sqlite3.connect(tmp_path / "t.db")
+    try:
+        revs = conn.execute(
+            "SELECT w.features_rev, wf.features_rev FROM words w JOIN word_features wf ON wf.word_id = w.id"
+        ).fetchone()
+    finally:
+        conn.close()
+    assert revs == (1, 2)
+
+
+
+def test_profile_write_back_only_replaces_the_revision_it_read(tmp_path, monkeypatch):
+    _word_db(tmp_path)
+    pool = ConnectionPool(tmp_path / "t.db", max_size=1)
+    monkeypatch.setattr(pronunciation, "db_pool", pool)
+    features = {"duration": {"total_seconds": 0.5}}
+
+    async def scenario():
+        revs = []
+        for rev in (0, 0, 1):  # the second write read rev 0 but the row moved on
+            await pronunciation._write_back_features(1, rev, features, features, "fast", "h")
+            async with pool.connection() as db:
+                revs.append(await pronunciation._features_rev(db, 1, "fast"))
+        async with pool.connection() as db:
+            default_rev = await pronunciation._features_rev(db, 1)
+        await pool.close()
+        return revs, default_rev
+
+    try:
+        assert asyncio.run(scenario()) == ([1, 1, 2], 0)
+    finally:
+        reference_cache.clear()
+
+
+class _FakeStream:
+    """AudioStream stand-in: each byte is a sample, a chunk ending in b"." ends an utterance."""
+
+    full = False
+
+    def __init__(self, tail: int):
+        self.n_samples = 0
+        self.tail = tail
+        self._events = []
+
+    async def start(self):
+        pass
+
+    async def feed(self, chunk):
+        self.n_samples += len(chunk)
+        if chunk.endswith(b"."):
+            self._events.append({"type": "vad", "event": "speech_end", "at_ms": 0})
+
+    def drain_events(self):
+        events, self._events = self._events, []
+        return events
+
+    def samples(self):
+        return np.zeros(self.n_samples, dtype=np.float32)
+
+    async def finish(self):
+        self.n_samples += self.tail
+        return self.samples()
+
+    async def abort(self):
+        pass
+
+
+def _stream(tmp_path, monkeypatch, chunks, tail):
+    _word_db(tmp_path)
+    analysed = []
+
+    async def fake_lookup(db, word_id, rev=None, profile="accurate"):
+        return {"fake": True}
+
+    async def fake_analyze(word_id, fn, samples, *args):
+        analysed.append(len(samples))
+        await asyncio.sleep(0.3)
+        return _OUTCOME
+
+    pool = ConnectionPool(tmp_path / "t.db", max_size=1)
+    monkeypatch.setattr(pronunciation, "db_pool", pool)
+    monkeypatch.setattr(pronunciation, "AudioStream", lambda: _FakeStream(tail))
+    monkeypatch.setattr(pronunciation, "_lookup_reference_features", fake_lookup)
+    monkeypatch.setattr(pronunciation, "_analyze", fake_analyze)
+    app = FastAPI()
+    app.include_router(pronunciation.router, prefix="/api")
+    with TestClient(app) as client:
+        try:
+            with client.websocket_connect("/api/pronunciation/stream?word_id=1") as ws:
+                for chunk in chunks:
+                    ws.send_bytes(chunk)
+                    assert ws.receive_json()["event"] == "speech_end"
+                ws.send_text('{"type": "stop"}')
+                result = ws.receive_json()
+        finally:
+            client.portal.call(pool.close)
+    assert result["type"] == "result", result
+    return analysed
+
+
+def test_stream_returns_speculative_result_of_the_final_samples(tmp_path, monkeypatch):
+    assert _stream(tmp_path, monkeypatch, [b"abc."], tail=0) == [4]
+
+
+def test_stream_reanalyses_when_audio_was_decoded_after_speech_end(tmp_path, monkeypatch):
+    # Trailing audio flushed at stop: the speculative job saw a truncated take.
+    assert _stream(tmp_path, monkeypatch, [b"abc."], tail=2) == [4, 6]
+
+
+def test_stream_runs_one_speculative_job_at_a_time(tmp_path, monkeypatch):
+    # The second utterance ends while the first job is still running.
+    assert _stream(tmp_path, monkeypatch, [b"abc.", b"de."], tail=0) == [4, 7]
@@ -0,0 +1,117 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.feature_comparator import calculate_weighted_score
+from app.services.reference_features import (
+    ReferenceFeatureCache,
+    SingleFlight,
+    feature_nbytes,
+    prepare_reference_features,
+)
+
+
+def _features(n: int, offset: float = 0.0) -> dict:
+    t = np.linspace(0, 1, n)
+    return {
+        "pitch": {"mean": 150.0 + offset, "std": 5.0, "min": 140.0, "max": 160.0,
+                  "values": (150 + 10 * np.sin(6 * t) + offset).tolist()},
+        "formants": {
+            "f1_mean": 500.0, "f2_mean": 1500.0, "f3_mean": 2500.0,
+            "f1_values": (500 + 30 * t).tolist(),
+            "f2_values": (1500 - 50 * t + offset).tolist(),
+            "f3_values": (2500 + 20 * t).tolist(),
+        },
+        "intensity": {"mean": 65.0, "std": 3.0, "min": 60.0, "max": 70.0,
+                      "values": (65 + 3 * np.cos(4 * t)).tolist()},
+        "duration": {"total_seconds": 0.6, "voiced_fraction": 0.8},
+        "voice_quality": {"jitter": 0.01, "shimmer": 0.05},
+        "mfcc": {"mean": list(np.arange(13.0)), "std": list(np.ones(13)), "n_mfcc": 13},
+    }
+
+
+def test_prepared_features_score_like_json_lists():
+    ref = _features(80)
+    user = _features(60, offset=12.0)
+    prepared = prepare_reference_features(ref)
+
+    assert isinstance(prepared["formants"]["f2_values"], np.ndarray)
+    assert not prepared["pitch"]["values"].flags.writeable
+    assert isinstance(ref["pitch"]["values"], list)  # input left untouched
+    assert calculate_weighted_score(user, prepared) == calculate_weighted_score(user, ref)
+
+
+def test_cache_hit_miss_and_revision():
+    cache = ReferenceFeatureCache(max_bytes=10**6)
+    features = prepare_reference_features(_features(50))
+
+    assert cache.get(1, rev=0) is None
+    cache.put(1, 0, features)
+    assert cache.get(1, rev=0) is features
+    # The row was rewritten elsewhere: the stale entry is dropped.
+    assert cache.get(1, rev=1) is None
+    assert len(cache) == 0
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_cache_keeps_profiles_apart():
+    cache = ReferenceFeatureCache(max_bytes=10**6)
+    accurate = prepare_reference_features(_features(80))
+    fast = prepare_reference_features(_features(40))
+
+    cache.put(1, 0, accurate)
+    assert cache.get(1, rev=0, profile="fast") is None
+    cache.put(1, 0, fast, profile="fast")
+    assert cache.get(1, rev=0) is accurate
+    assert cache.get(1, rev=0, profile="fast") is fast
+
+    cache.invalidate(1)
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used_within_budget():
+    features = [prepare_reference_features(_features(200)) for _ in range(3)]
+    size = feature_nbytes(features[0])
+    cache = ReferenceFeatureCache(max_bytes=2 * size)
+
+    cache.put(1, 0, features[0])
+    cache.put(2, 0, features[1])
+    cache.get(1, rev=0)            # 2 is now least recently used
+    cache.put(3, 0, features[2])
+
+    assert cache.get(2, rev=0) is None
+    assert cache.get(1, rev=0) is features[0]
+    assert cache.get(3, rev=0) is features[2]
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate(1)
+    assert cache.get(1, rev=0) is None
+
+
+def test_single_flight_shares_one_computation():
+    calls = []
+
+    async def compute(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        if key == "bad":
+            raise ValueError("boom")
+        return {"word": key}
+
+    async def scenario():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.run("w1", lambda: compute("w1")) for _ in range(5)))
+        assert len(flights) == 0
+        with pytest.raises(ValueError):
+            await asyncio.gather(*(flights.run("bad", lambda: compute("bad")) for _ in range(3)))
+        # Finished keys are forgotten, so the next call computes again.
+        await flights.run("w1", lambda: compute("w1"))
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(r is results[0] for r in results)
+    assert calls == ["w1", "bad", "w1"]
@@ -0,0 +1,37 @@
+from app.services.result_cache import ResultCache, result_key
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_result_key_depends_on_every_input():
+    base = result_key(b"audio", 1, 0)
+    assert result_key(b"audio", 1, 0) == base
+    assert result_key(b"audio!", 1, 0) != base
+    assert result_key(b"audio", 2, 0) != base
+    assert result_key(b"audio", 1, 1) != base
+    assert result_key(b"audio", 1, 0, "fast") != base
+
+
+def test_result_cache_ttl_and_size_eviction():
+    clock = _Clock()
+    cache = ResultCache(max_entries=2, ttl_seconds=10, clock=clock)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1      # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock.now = 11
+    assert cache.get("a") is None   # expired
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (2, 2, 1, 1)
+    assert stats["hit_rate"] == 0.5
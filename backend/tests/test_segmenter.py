@@ -0,0 +1,64 @@
+import numpy as np
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
+
+from app.services.segmenter import EnergyEnvelope
+
+SR = 22050
+
+
+def _signal(seed: int) -> np.ndarray:
+    """Bursts of tone separated by gaps of varying length over a noise floor."""
+    rng = np.random.default_rng(seed)
+    parts = [0.002 * rng.standard_normal(int(SR * rng.uniform(0.05, 0.4)))]
+    for _ in range(4):
+        n = int(SR * rng.uniform(0.05, 0.5))
+        t = np.arange(n) / SR
+        parts.append(rng.uniform(0.05, 0.5) * np.sin(2 * np.pi * rng.uniform(100, 400) * t))
+        parts.append(0.002 * rng.standard_normal(int(SR * rng.uniform(0.03, 0.4))))
+    return np.concatenate(parts)
+
+
+def _segment(samples: np.ndarray) -> AudioSegment:
+    pcm = (samples * 32767).astype("<i2")
+    return AudioSegment(pcm.tobytes(), sample_width=2, frame_rate=SR, channels=1)
+
+
+def _assert_close(ours, theirs, tol_ms=1):
+    assert len(ours) == len(theirs)
+    for (a0, a1), (b0, b1) in zip(ours, theirs):
+        assert abs(a0 - b0) <= tol_ms and abs(a1 - b1) <= tol_ms
+
+
+def test_matches_pydub_detect_nonsilent():
+    for seed in range(5):
+        samples = _signal(seed)
+        pcm_samples = (samples * 32767).astype("<i2") / 32768.0
+        envelope = EnergyEnvelope(pcm_samples, SR)
+        segment = _segment(samples)
+        for thresh, min_len in [(-40, 200), (-35, 80), (-30, 50)]:
+            _assert_close(
+                envelope.nonsilent_ranges(thresh, min_len),
+                detect_nonsilent(segment, min_silence_len=min_len, silence_thresh=thresh),
+            )
+
+
+def test_sub_span_query_matches_sliced_segment():
+    samples = _signal(7)
+    pcm_samples = (samples * 32767).astype("<i2") / 32768.0
+    envelope = EnergyEnvelope(pcm_samples, SR)
+    segment = _segment(samples)
+    start, end = 150, envelope.duration_ms - 120
+
+    ours = envelope.nonsilent_ranges(-35, 80, start, end)
+    theirs = detect_nonsilent(segment[start:end], min_silence_len=80, silence_thresh=-35)
+    _assert_close(ours, [[start + a, start + b] for a, b in theirs])
+
+
+def test_silence_and_short_signals():
+    silent = EnergyEnvelope(np.zeros(SR), SR)
+    assert silent.nonsilent_ranges(-40, 200) == []
+    assert silent.dbfs == float("-inf")
+
+    short = EnergyEnvelope(0.5 * np.ones(SR // 20), SR)  # 50 ms, shorter than the window
+    assert short.nonsilent_ranges(-40, 200) == [[0, 50]]
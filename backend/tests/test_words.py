@@ -0,0 +1,188 @@
+import sqlite3
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import SCHEMA_SQL, ConnectionPool
+from app.routes import audio, words
+from app.services import audio_files
+from app.services.catalog import Catalog
+
+
+def _client(tmp_path, monkeypatch, n_words: int) -> tuple[TestClient, Catalog]:
+    conn = sqlite3.connect(tmp_path / "t.db")
+    conn.executescript(SCHEMA_SQL)
+    conn.execute("INSERT INTO categories (name, display_name) VALUES ('animals', 'Animals')")
+    conn.executemany(
+        "INSERT INTO words (category_id, word_lb, translation_en) VALUES (1, ?, ?)",
+        [(f"Wuert {i}", f"word {i}") for i in range(n_words)],
+    )
+    conn.commit()
+    conn.close()
+    test_catalog = Catalog(tmp_path / "t.db", check_interval=60)
+    monkeypatch.setattr(words, "catalog", test_catalog)
+    app = FastAPI()
+    app.include_router(words.router, prefix="/api")
+    return TestClient(app), test_catalog
+
+
+def test_list_words_follows_next_links_with_projection(tmp_path, monkeypatch):
+    client, test_catalog = _client(tmp_path, monkeypatch, n_words=7)
+    with client:
+        try:
+            response = client.get("/api/categories/animals/words")
+            full = response.json()
+            assert len(full) == 7 and "link" not in response.headers
+
+            seen, url = [], "/api/categories/animals/words?limit=3&fields=word_lb"
+            while url:
+                response = client.get(url)
+                assert response.status_code == 200
+                seen.extend(response.json())
+                link = response.headers.get("link")
+                url = link[1:link.index(">")] if link else None
+            assert seen == [{"id": w["id"], "word_lb": w["word_lb"]} for w in full]
+
+            assert client.get("/api/categories/animals/words?fields=id,spelling").status_code == 400
+            assert client.get("/api/categories/animals/words?limit=0").status_code == 422
+            assert client.get("/api/categories/plants/words?limit=3").status_code == 404
+        finally:
+            client.portal.call(test_catalog.close)
+
+
+def test_search_is_diacritic_insensitive_prefix_and_ranked(tmp_path, monkeypatch):
+    conn = sqlite3.connect(tmp_path / "t.db")
+    conn.executescript(SCHEMA_SQL)
+    conn.execute("INSERT INTO categories (name, display_name) VALUES ('animals', 'Animals')")
+    conn.executemany(
+        "INSERT INTO words (category_id, word_lb, translation_en, translation_fr, translation_de)"
+        " VALUES (1, ?, ?, ?, ?)",
+        [
+            ("Léiw", "lion", "lion", "Löwe"),
+            ("Hond", "dog", "chien", "Hund"),
+            ("Kaz", "cat", "chat", "Katze"),
+            ("Léiwin", "lioness", "lionne", "Löwin"),
+        ],
+    )
+    conn.execute("UPDATE words SET translation_en = 'hound' WHERE word_lb = 'Hond'")
+    conn.commit()
+    conn.close()
+
+    test_catalog = Catalog(tmp_path / "t.db", check_interval=60)
+    test_pool = ConnectionPool(tmp_path / "t.db", max_size=1)
+    monkeypatch.setattr(words, "catalog", test_catalog)
+    monkeypatch.setattr(words, "db_pool", test_pool)
+    app = FastAPI()
+    app.include_router(words.router, prefix="/api")
+
+    def search(q):
+        response = client.get("/api/words/search", params={"q": q})
+        assert response.status_code == 200
+        return [w["word_lb"] for w in response.json()]
+
+    with TestClient(app) as client:
+        client.portal.call(test_pool.open)
+        try:
+            assert search("Leiw") == ["Léiw", "Léiwin"]
+            assert search("lowe") == ["Léiw"]
+            assert search("hound") == ["Hond"]   # the update trigger re-indexed it
+            assert search("dog") == []
+            assert search("chat") == ["Kaz"]
+            assert search('"OR) *') == []        # FTS syntax is never passed through
+            assert client.get("/api/words/1").json()["word_lb"] == "Léiw"
+        finally:
+            client.portal.call(test_pool.close)
+            client.portal.call(test_catalog.close)
+
+
+def test_batch_lookup_returns_words_in_order_with_audio_metadata(tmp_path, monkeypatch):
+    client, test_catalog = _client(tmp_path, monkeypatch, n_words=3)
+    conn = sqlite3.connect(tmp_path / "t.db")
+    conn.execute("UPDATE words SET audio_filename = 'w1.wav' WHERE id = 1")
+    conn.execute("UPDATE words SET audio_filename = 'gone.wav' WHERE id = 2")
+    conn.commit()
+    conn.close()
+    (tmp_path / "w1.wav").write_bytes(b"RIFF-take")
+    monkeypatch.setattr(words.settings, "AUDIO_DIR", tmp_path)
+    monkeypatch.setattr(audio, "catalog", test_catalog)
+    app_audio = FastAPI()
+    app_audio.include_router(audio.router, prefix="/api")
+
+    with client:
+        try:
+            batch = client.get("/api/words?ids=3,1,99,1,2").json()
+            assert [w["id"] for w in batch] == [3, 1, 2]
+            assert batch[0]["audio"] is None and batch[2]["audio"] is None
+            assert batch[1]["audio"]["size"] == len(b"RIFF-take")
+            assert batch[1]["translation_en"] == "word 0"
+
+            with TestClient(app_audio) as audio_client:
+                assert audio_client.get("/api/audio/1").headers["etag"] == batch[1]["audio"]["etag"]
+
+            posted = client.post("/api/words/batch", json={"ids": [3, 1, 99, 1, 2]})
+            assert posted.json() == batch
+            assert client.get("/api/words?ids=1,x").status_code == 422
+            assert client.get("/api/words?ids=" + ",".join(["1"] * 101)).status_code == 400
+            assert client.post("/api/words/batch", json={"ids": []}).status_code == 422
+        finally:
+            client.portal.call(test_catalog.close)
+
+
+def test_batch_lookup_bounds_concurrent_file_hashing(tmp_path, monkeypatch):
+    client, test_catalog = _client(tmp_path, monkeypatch, n_words=12)
+    conn = sqlite3.connect(tmp_path / "t.db")
+    conn.execute("UPDATE words SET audio_filename = 'w' || id || '.wav'")
+    conn.commit()
+    conn.close()
+    for i in range(1, 13):
+        (tmp_path / f"w{i}.wav").write_bytes(f"RIFF-{i}".encode())
+    monkeypatch.setattr(words.settings, "AUDIO_DIR", tmp_path)
+
+    running, peak = 0, 0
+    lock = threading.Lock()
+    real_sha256 = audio_files.file_sha256
+
+    def slow_sha256(path):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return real_sha256(path)
+
+    monkeypatch.setattr(audio_files, "file_sha256", slow_sha256)
+    with client:
+        try:
+            batch = client.post("/api/words/batch", json={"ids": list(range(1, 13))}).json()
+        finally:
+            client.portal.call(test_catalog.close)
+
+    assert all(item["audio"] for item in batch) and len(batch) == 12
+    assert peak <= audio_files.AUDIO_HASH_CONCURRENCY
+
+
+def test_batch_lookup_reports_stored_hashes_without_reading_files(tmp_path, monkeypatch):
+    client, test_catalog = _client(tmp_path, monkeypatch, n_words=3)
+    conn = sqlite3.connect(tmp_path / "t.db")
+    conn.execute("UPDATE words SET audio_filename = 'w' || id || '.wav', audio_hash = printf('%032d', id) || printf('%032d', 0)")
+    conn.commit()
+    conn.close()
+    for i in range(1, 4):
+        (tmp_path / f"w{i}.wav").write_bytes(f"RIFF-{i}".encode())
+    monkeypatch.setattr(words.settings, "AUDIO_DIR", tmp_path)
+
+    def no_hashing(path):
+        raise AssertionError(f"hashed {path}")
+
+    monkeypatch.setattr(audio_files, "file_sha256", no_hashing)
+    with client:
+        try:
+            batch = client.post("/api/words/batch", json={"ids": [1, 2, 3]}).json()
+        finally:
+            client.portal.call(test_catalog.close)
+
+    assert [item["audio"]["etag"] for item in batch] == [f'"{i:032d}"' for i in range(1, 4)]
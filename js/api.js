@@ -19,6 +19,19 @@ async function fetchWords(categoryName, lang = "en") {
   return res.json(); // [{id, word_lb, translation, gender, audio_url}, ...]
 }
 
+async function fetchWordsByIds(ids) {
+  // Up to 100 ids fit in the query string; larger sets use the POST variant.
+  const res = ids.length <= 100
+    ? await fetch(`${API_BASE_URL}/api/words?ids=${ids.join(",")}`)
+    : await fetch(`${API_BASE_URL}/api/words/batch`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ ids }),
+      });
+  if (!res.ok) throw new Error(`Failed to fetch words: ${res.status}`);
+  return res.json(); // [{id, word_lb, translation_en, ..., audio: {etag, size} | null}, ...]
+}
+
 function getAudioUrl(wordId) {
   return `${API_BASE_URL}/api/audio/${wordId}`;
 }
@@ -44,3 +57,57 @@ async function checkPronunciation(wordId, audioBlob) {
   }
   return res.json(); // {score, feedback, breakdown, improvements, suggestions}
 }
+
+/**
+ * Stream a recording to the backend while it is being made.
+ *
+ * Returns {send(blob), finish() → Promise<result>, abort()}. Chunks sent
+ * before the socket opens are queued. finish() resolves with the same
+ * object as checkPronunciation and rejects on any error, so callers can fall
+ * back to the POST endpoint with the full blob.
+ */
+function openPronunciationStream(wordId, { onVad } = {}) {
+  const base = API_BASE_URL || location.origin;
+  const url = `${base.replace(/^http/, "ws")}/api/pronunciation/stream?word_id=${encodeURIComponent(wordId)}`;
+  const ws = new WebSocket(url);
+  const queue = [];
+  let settle = null;
+
+  const result = new Promise((resolve, reject) => {
+    settle = { resolve, reject };
+  });
+  result.catch(() => {}); // rejection is handled by whoever calls finish()
+
+  ws.onopen = () => {
+    while (queue.length) ws.send(queue.shift());
+  };
+  ws.onmessage = (e) => {
+    const msg = JSON.parse(e.data);
+    if (msg.type === "vad") {
+      if (onVad) onVad(msg);
+    } else if (msg.type === "result") {
+      const { type, ...payload } = msg;
+      settle.resolve(payload);
+    } else if (msg.type === "error") {
+      settle.reject(new Error(`Pronunciation stream failed: ${msg.status} — ${msg.detail}`));
+    }
+  };
+  ws.onerror = () => settle.reject(new Error("Pronunciation stream connection error"));
+  ws.onclose = () => settle.reject(new Error("Pronunciation stream closed"));
+
+  function send(data) {
+    if (ws.readyState === WebSocket.OPEN) ws.send(data);
+    else if (ws.readyState === WebSocket.CONNECTING) queue.push(data);
+  }
+
+  return {
+    send,
+    finish() {
+      send(JSON.stringify({ type: "stop" }));
+      return result;
+    },
+    abort() {
+      if (ws.readyState <= WebSocket.OPEN) ws.close();
+    },
+  };
+}
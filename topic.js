@@ -67,6 +67,9 @@ let recordedChunks   = [];
 let recordedBlob     = null;
 let recordedUrl      = null;
 
+let pronunciationStream = null; // live WebSocket upload of the current take
+let streamedResult      = null; // Promise of its score, or null
+
 let audioStream      = null;
 let audioContext      = null;
 let analyser          = null;
@@ -74,6 +77,13 @@ let meterRAF          = null;
 
 let currentAudio      = null; // reference audio element
 
+// Reference audio of the next few cards is fetched ahead so "Listen" plays
+// from the HTTP cache. AUDIO_META comes from one batch lookup: word id →
+// {etag, size}, or null when the server only has a placeholder (not cached).
+const PREFETCH_AHEAD = 3;
+let AUDIO_META = new Map();
+const prefetchedAudio = new Set();
+
 // ── Helpers ───────────────────────────────────────────────
 function setFeedback(html) { fbBody.innerHTML = html; }
 
@@ -82,13 +92,34 @@ function cleanupRecording() {
   recordedUrl = null;
   recordedBlob = null;
   recordedChunks = [];
+  if (pronunciationStream) pronunciationStream.abort();
+  pronunciationStream = null;
+  streamedResult = null;
   meterFill.style.width = "0%";
 }
 
+async function loadAudioMeta() {
+  try {
+    const items = await fetchWordsByIds(WORDS.slice(0, 1000).map(w => w.id));
+    AUDIO_META = new Map(items.map(w => [w.id, w.audio]));
+  } catch (err) {
+    console.warn("[Prefetch] Audio metadata unavailable:", err);
+  }
+}
+
+function prefetchAudio(from) {
+  for (const word of WORDS.slice(from, from + PREFETCH_AHEAD)) {
+    if (prefetchedAudio.has(word.id) || !AUDIO_META.get(word.id)) continue;
+    prefetchedAudio.add(word.id);
+    fetch(getAudioUrl(word.id)).catch(() => prefetchedAudio.delete(word.id));
+  }
+}
+
 // ── UI Update ─────────────────────────────────────────────
 function updateUI() {
   if (!WORDS.length) return;
   const word = WORDS[i];
+  prefetchAudio(i);
 
   promptWord.textContent = word.word_lb;
 
@@ -208,16 +239,30 @@ async function startRecording() {
   const stream = await ensureMic();
   await setupMeter(stream);
 
-  recordedChunks = [];
-  recordedBlob = null;
+  cleanupRecording();
+
+  // Stream the take while recording so the score is ready right after stop.
+  // Any failure here just means Evaluate falls back to the regular upload.
+  try {
+    pronunciationStream = openPronunciationStream(WORDS[i].id, {
+      onVad: (e) => console.log("[Stream] VAD:", e.event, e.at_ms, "ms"),
+    });
+  } catch (err) {
+    console.warn("[Stream] Could not open pronunciation stream:", err);
+    pronunciationStream = null;
+  }
 
   mediaRecorder = new MediaRecorder(stream);
   mediaRecorder.ondataavailable = (e) => {
-    if (e.data && e.data.size > 0) recordedChunks.push(e.data);
+    if (e.data && e.data.size > 0) {
+      recordedChunks.push(e.data);
+      if (pronunciationStream) pronunciationStream.send(e.data);
+    }
   };
 
   mediaRecorder.onstop = () => {
     stopMeter();
+    if (pronunciationStream) streamedResult = pronunciationStream.finish();
     recordedBlob = new Blob(recordedChunks, { type: "audio/webm" });
     recordedUrl = URL.createObjectURL(recordedBlob);
 
@@ -228,7 +273,7 @@ async function startRecording() {
     micHint.textContent = "Recording saved. Play it back, retry, or evaluate.";
   };
 
-  mediaRecorder.start();
+  mediaRecorder.start(250); // timeslice: deliver chunks every 250 ms
   recordBtn.classList.add("recording");
   micHint.textContent = "Recording… tap again to stop";
 }
@@ -285,7 +330,14 @@ evaluateBtn.addEventListener("click", async (e) => {
   evaluateBtn.textContent = "⏳ Analyzing…";
 
   try {
-    const result = await checkPronunciation(word.id, recordedBlob);
+    let result = null;
+    if (streamedResult) {
+      result = await streamedResult.catch((err) => {
+        console.warn("[Evaluate] Streamed result unavailable, uploading instead:", err);
+        return null;
+      });
+    }
+    if (!result) result = await checkPronunciation(word.id, recordedBlob);
     console.log("[Evaluate] Result:", result);
     renderScore(result);
   } catch (err) {
@@ -317,8 +369,11 @@ function renderScore(result) {
   setFeedback(html);
 
   // Breakdown bars
+  // (hidden when the upload was rejected before analysis: all zeros)
   const bd = result.breakdown;
-  if (bd) {
+  if (result.rejection) {
+    breakdownEl.style.display = "none";
+  } else if (bd) {
     breakdownEl.style.display = "block";
     setBar("Pitch", bd.pitch);
     setBar("Formants", bd.formants);
@@ -361,6 +416,7 @@ async function init() {
       return;
     }
     updateUI();
+    loadAudioMeta().then(() => prefetchAudio(i));
   } catch (err) {
     console.error("Failed to load words:", err);
     setFeedback("⚠ Could not load words. Is the backend running?");